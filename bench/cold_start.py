@@ -0,0 +1,230 @@
+"""
+Cold-start report for the status Lambdas.
+
+Each handler/route pair runs in a fresh interpreter, so every number is a
+true cold start: module import time, then the first invocation of the
+route. AWS calls go through real boto3 clients with botocore Stubber
+responses, so client creation cost is included but no network is used.
+Latency probes are stubbed unless --live is passed.
+
+    python bench/cold_start.py
+    python bench/cold_start.py --write-baseline bench/cold_start_baseline.json
+    python bench/cold_start.py --baseline bench/cold_start_baseline.json --threshold 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1] / "lambda"
+
+ROUTES = {
+    "status_api_handler": [
+        "/status/latency",
+        "/status/health-checkers",
+        "/status/metrics",
+    ],
+    "status_handler": ["/status"],
+}
+
+CHILD_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "ALARM_NAME": "cold-start-alarm",
+    "ROUTE53_HEALTH_CHECK_ID": "cold-start-check",
+    "CF_DISTRIBUTION_ID": "ECOLDSTART",
+    "STATUS_API_FUNCTION_NAME": "cold-start-fn",
+}
+
+
+def _stub_responses(route):
+    """Canned botocore (service, operation, response) triples for one cold invocation of a route."""
+    now = datetime.now(timezone.utc)
+    if route == "/status/health-checkers":
+        return [(
+            "route53",
+            "get_health_check_status",
+            {
+                "HealthCheckObservations": [
+                    {
+                        "Region": "us-east-1",
+                        "IPAddress": "192.0.2.10",
+                        "StatusReport": {
+                            "Status": "Success: HTTP Status Code 200, OK",
+                            "CheckedTime": now,
+                        },
+                    }
+                ]
+            },
+        )]
+    if route == "/status/metrics":
+        return [("cloudwatch", "get_metric_data", {"MetricDataResults": [], "Messages": []})]
+    if route == "/status":
+        return [(
+            "cloudwatch",
+            "describe_alarms",
+            {"MetricAlarms": [{"AlarmName": "cold-start-alarm", "StateValue": "OK", "StateReason": "ok"}]},
+        )]
+    return []
+
+
+def _install_stubs(module, route):
+    """Attach a Stubber to each client as the handler creates it."""
+    from botocore.stub import Stubber
+
+    def stubbed(client):
+        stubber = Stubber(client)
+        for service, operation, response in _stub_responses(route):
+            if service == client.meta.service_model.service_name:
+                stubber.add_response(operation, response)
+        stubber.activate()
+        client._cold_start_stubber = stubber
+        return client
+
+    if hasattr(module, "_client"):
+        real_client = module._client
+
+        def client(service, region=None):
+            created = real_client(service, region)
+            if not hasattr(created, "_cold_start_stubber"):
+                stubbed(created)
+            return created
+
+        module._client = client
+    elif hasattr(module, "_cloudwatch"):
+        real_cloudwatch = module._cloudwatch
+
+        def cloudwatch():
+            created = real_cloudwatch()
+            if not hasattr(created, "_cold_start_stubber"):
+                stubbed(created)
+            return created
+
+        module._cloudwatch = cloudwatch
+
+
+def _stub_probes(module):
+    """Replace network probes with canned samples."""
+    sample = {
+        "dnsMs": 1.0, "tcpConnectMs": 2.0, "tlsHandshakeMs": 3.0, "ttfbMs": 4.0,
+        "statusCode": 200, "statusReason": "OK", "peerIp": "192.0.2.1", "ok": True,
+    }
+    module._measure_site = lambda **kwargs: dict(sample)
+    module._probe_edges = lambda **kwargs: {"addresses": []}
+    module._measure_warm_path = lambda **kwargs: {"ok": True}
+
+
+def _child(module_name, route, live):
+    """Measure one cold import + first invocation and print JSON."""
+    sys.path.insert(0, str(LAMBDA_DIR))
+
+    start = time.perf_counter()
+    module = __import__(module_name)
+    import_ms = (time.perf_counter() - start) * 1000.0
+
+    if not live:
+        _install_stubs(module, route)
+        if hasattr(module, "_measure_site"):
+            _stub_probes(module)
+
+    event = {"rawPath": route, "queryStringParameters": {"samples": "1"}}
+    start = time.perf_counter()
+    response = module.lambda_handler(event, None)
+    first_ms = (time.perf_counter() - start) * 1000.0
+
+    print(json.dumps({
+        "importMs": import_ms,
+        "firstInvocationMs": first_ms,
+        "statusCode": response["statusCode"],
+    }))
+
+
+def _measure(module_name, route, live, repeat):
+    """Median of `repeat` fresh-interpreter runs for one route."""
+    runs = []
+    for _ in range(repeat):
+        env = dict(os.environ, **CHILD_ENV)
+        args = [sys.executable, __file__, "--child", module_name, route]
+        if live:
+            args.append("--live")
+        out = subprocess.run(args, env=env, check=True, capture_output=True, text=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    return {
+        "importMs": statistics.median(r["importMs"] for r in runs),
+        "firstInvocationMs": statistics.median(r["firstInvocationMs"] for r in runs),
+        "statusCode": runs[-1]["statusCode"],
+    }
+
+
+def build_report(live=False, repeat=3):
+    """Cold-start numbers for every handler and route."""
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "live": live,
+        "repeat": repeat,
+        "handlers": {},
+    }
+    for module_name, routes in ROUTES.items():
+        report["handlers"][module_name] = {
+            route: _measure(module_name, route, live, repeat) for route in routes
+        }
+    return report
+
+
+def compare(report, baseline, threshold):
+    """Regression messages for any timing more than `threshold` (relative) above baseline."""
+    regressions = []
+    for module_name, routes in report["handlers"].items():
+        for route, current in routes.items():
+            previous = baseline.get("handlers", {}).get(module_name, {}).get(route)
+            if not previous:
+                continue
+            for key in ("importMs", "firstInvocationMs"):
+                limit = previous[key] * (1.0 + threshold)
+                if current[key] > limit:
+                    regressions.append(
+                        f"{module_name} {route} {key}: {current[key]:.1f}ms > {limit:.1f}ms "
+                        f"(baseline {previous[key]:.1f}ms)"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--child", nargs=2, metavar=("MODULE", "ROUTE"), help=argparse.SUPPRESS)
+    parser.add_argument("--live", action="store_true", help="use real AWS and network instead of stubs")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh-interpreter runs per route (median reported)")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed relative slowdown vs baseline")
+    parser.add_argument("--write-baseline", help="write this run's report to the given path")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child[0], args.child[1], args.live)
+        return 0
+
+    report = build_report(live=args.live, repeat=args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.write_baseline:
+        Path(args.write_baseline).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
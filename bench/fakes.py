@@ -0,0 +1,194 @@
+"""
+Offline stand-ins for the status Lambdas' dependencies.
+
+- Fake Route 53 and CloudWatch clients that answer with realistic canned
+  payloads (every region, full metric series) without any network.
+- A local self-signed HTTPS origin the latency probes can target.
+"""
+
+import http.server
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROUTE53_REGIONS = [
+    "ap-northeast-1",
+    "ap-southeast-1",
+    "ap-southeast-2",
+    "eu-west-1",
+    "sa-east-1",
+    "us-east-1",
+    "us-west-1",
+    "us-west-2",
+]
+
+
+class FakeRoute53:
+    """Answers get_health_check_status with one healthy observation per checker region."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_health_check_status(self, HealthCheckId):
+        self.calls += 1
+        checked = datetime.now(timezone.utc)
+        return {
+            "HealthCheckObservations": [
+                {
+                    "Region": region,
+                    "IPAddress": f"192.0.2.{i + 10}",
+                    "StatusReport": {
+                        "Status": "Success: HTTP Status Code 200, OK",
+                        "CheckedTime": checked,
+                    },
+                }
+                for i, region in enumerate(ROUTE53_REGIONS)
+            ]
+        }
+
+
+class FakeCloudWatch:
+    """
+    Answers get_metric_data with a full series per query, one point per
+    period across the requested window, newest first like ScanBy
+    TimestampDescending. describe_alarms returns a single OK alarm.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime, **kwargs):
+        self.calls += 1
+        results = []
+        for n, query in enumerate(MetricDataQueries):
+            period = query.get("MetricStat", {}).get("Period", 60)
+            count = max(1, int((EndTime - StartTime).total_seconds() // period))
+            stamps = [EndTime - timedelta(seconds=period * i) for i in range(count)]
+            values = [float((i * 7 + n) % 13) for i in range(count)]
+            results.append({
+                "Id": query["Id"],
+                "Label": query["Id"],
+                "Timestamps": stamps,
+                "Values": values,
+                "StatusCode": "Complete",
+            })
+        return {"MetricDataResults": results, "Messages": []}
+
+    def describe_alarms(self, AlarmNames):
+        self.calls += 1
+        return {
+            "MetricAlarms": [
+                {
+                    "AlarmName": AlarmNames[0],
+                    "StateValue": "OK",
+                    "StateReason": "Threshold Crossed: 3 datapoints were not less than the threshold (1.0).",
+                    "StateUpdatedTimestamp": datetime.now(timezone.utc),
+                }
+            ]
+        }
+
+
+def install_fake_aws(module):
+    """
+    Point a loaded handler module at fake AWS clients. Returns the fakes by
+    service name so callers can inspect call counts.
+    """
+    fakes = {"route53": FakeRoute53(), "cloudwatch": FakeCloudWatch()}
+    if hasattr(module, "_client"):
+        module._client = lambda service, region=None: fakes[service]
+    if hasattr(module, "_cloudwatch"):
+        module._cloudwatch = lambda: fakes["cloudwatch"]
+    if hasattr(module, "_route53"):
+        module._route53 = lambda: fakes["route53"]
+    return fakes
+
+
+class _OriginHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers like a CloudFront edge: X-Cache and X-Amz-Cf-Pop headers, a
+    Content-Length body, or a chunked one (reported as a miss) on /chunked.
+    """
+
+    protocol_version = "HTTP/1.1"
+    body = b"<html>" + b"status origin " * 512 + b"</html>"
+
+    def do_GET(self):
+        chunked = self.path == "/chunked"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("X-Cache", "Miss from cloudfront" if chunked else "Hit from cloudfront")
+        self.send_header("X-Amz-Cf-Pop", "LOCAL50-C1")
+        if not chunked:
+            self.send_header("Content-Length", str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+            return
+
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(self.body), 1000):
+            chunk = self.body[start:start + 1000]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class TLSOrigin:
+    """
+    Self-signed HTTPS server on 127.0.0.1 for offline probing.
+
+    The certificate is minted with the openssl CLI for "localhost";
+    `client_context` trusts it, so probes keep full verification on.
+    """
+
+    def __init__(self, cert_dir=None):
+        if shutil.which("openssl") is None:
+            raise RuntimeError("openssl is required to mint the origin certificate")
+
+        self._tmp = None
+        if cert_dir is None:
+            self._tmp = tempfile.TemporaryDirectory()
+            cert_dir = self._tmp.name
+        cert, key = Path(cert_dir) / "cert.pem", Path(cert_dir) / "key.pem"
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+                "-keyout", str(key), "-out", str(cert),
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+        server_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_ctx.load_cert_chain(cert, key)
+        self.server.socket = server_ctx.wrap_socket(self.server.socket, server_side=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+        self.host = "localhost"
+        self.port = self.server.server_address[1]
+        self.client_context = ssl.create_default_context(cafile=str(cert))
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    def target(self, module):
+        """Aim a loaded status_api_handler module's probes at this origin."""
+        module.HOSTNAME = self.host
+        module.PORT = self.port
+        module.REQUEST_PATH = "/"
+        module._ssl_context = self.client_context
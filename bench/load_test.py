@@ -0,0 +1,197 @@
+"""
+Load generator for the status Lambdas behind the local HTTP front end.
+
+For each concurrency level, that many workers each keep one HTTP/1.1
+keep-alive connection open and cycle through the routes until the level's
+request count or duration is used up. Each level reports throughput,
+latency percentiles overall and per route, status codes and X-Cache
+results. Without --url an in-process bench/local_server.py is started with
+fake AWS clients and a local TLS origin, so no network or credentials are
+needed.
+
+Production is throttled to 0.5 rps per stage (apigw_status.tf); this is
+for seeing how cache, fan-out and serialization changes behave under load
+before they ship.
+
+    python bench/load_test.py --concurrency 1,4,16 --duration 5
+    python bench/load_test.py --url http://127.0.0.1:8080 --routes /status/all --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from local_server import LocalServer  # noqa: E402
+
+DEFAULT_ROUTES = [
+    "/status/latency",
+    "/status/health-checkers",
+    "/status/metrics",
+    "/status/all",
+    "/status",
+]
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _latency_summary(values):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return {
+        "p50": _percentile(ordered, 50),
+        "p90": _percentile(ordered, 90),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1],
+        "mean": sum(ordered) / len(ordered),
+    }
+
+
+async def _get(reader, writer, host, path):
+    """One GET over an open connection; returns (status, headers, body bytes)."""
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: br, gzip\r\n"
+        "User-Agent: status-load-test/1.0\r\n\r\n".encode("latin-1")
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length") or 0))
+    return status, headers, body
+
+
+async def _worker(index, host, port, routes, budget, stop_at, samples):
+    reader = writer = None
+    turn = index
+    try:
+        while budget["left"] > 0 and time.monotonic() < stop_at:
+            budget["left"] -= 1
+            path = routes[turn % len(routes)]
+            turn += 1
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            try:
+                status, headers, _ = await _get(reader, writer, host, path)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                samples.append((path, (time.perf_counter() - start) * 1000.0, None, None))
+                writer.close()
+                reader = writer = None
+                continue
+            samples.append((path, (time.perf_counter() - start) * 1000.0, status, headers.get("x-cache")))
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_level(host, port, routes, concurrency, duration=10.0, requests=None):
+    """Drive one concurrency level and summarize it."""
+    samples = []
+    budget = {"left": requests if requests is not None else float("inf")}
+    start = time.perf_counter()
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(*[
+        _worker(i, host, port, routes, budget, stop_at, samples) for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    ok = [ms for _, ms, status, _ in samples if status is not None]
+    statuses, caches, per_route = {}, {}, {}
+    for path, ms, status, cache in samples:
+        key = str(status) if status is not None else "error"
+        statuses[key] = statuses.get(key, 0) + 1
+        if cache:
+            caches[cache] = caches.get(cache, 0) + 1
+        if status is not None:
+            per_route.setdefault(path, []).append(ms)
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": statuses.get("error", 0),
+        "durationSeconds": elapsed,
+        "throughputRps": len(ok) / elapsed if elapsed > 0 else 0.0,
+        "latencyMs": _latency_summary(ok),
+        "statusCodes": statuses,
+        "xCache": caches,
+        "routes": {path: _latency_summary(values) for path, values in per_route.items()},
+    }
+
+
+async def run(url=None, concurrency=(1, 4, 16), routes=None, duration=10.0, requests=None, containers=2):
+    """Run every concurrency level against `url`, or an in-process local server."""
+    routes = routes or DEFAULT_ROUTES
+    server = None
+    if url is None:
+        server = await LocalServer(containers=containers).start()
+        host, port = server.host, server.port
+    else:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "target": url or f"in-process ({containers} containers, fake AWS)",
+        "routes": routes,
+        "levels": [],
+    }
+    try:
+        for level in concurrency:
+            report["levels"].append(await run_level(host, port, routes, level, duration, requests))
+    finally:
+        if server is not None:
+            await server.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="server to load (default: start a local one with fake AWS)")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--routes", default=",".join(DEFAULT_ROUTES), help="comma-separated paths to cycle through")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--requests", type=int, help="stop each level after this many requests")
+    parser.add_argument("--containers", type=int, default=2, help="warm containers for the local server")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(
+        url=args.url,
+        concurrency=[int(level) for level in args.concurrency.split(",") if level],
+        routes=[route for route in args.routes.split(",") if route],
+        duration=args.duration,
+        requests=args.requests,
+        containers=args.containers,
+    ))
+    print(json.dumps(report, indent=2))
+    return 1 if any(level["errors"] for level in report["levels"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Local HTTP front end for the status Lambdas.
+
+Real HTTP/1.1 requests are translated into API Gateway HTTP API (payload
+format 2.0) events for status_handler and status_api_handler, and the
+Lambda proxy results are written back as HTTP responses, base64 bodies
+included. GET /status goes to the uptime Lambda and /status/* to the status
+API, as in apigw_status.tf.
+
+Each of --containers warm "containers" is a separately loaded copy of the
+handler modules serving one request at a time, like Lambda, so warm caches
+and connection pools behave as they would across concurrent containers.
+By default AWS calls go to the fakes in bench/fakes.py and latency probes
+to a local self-signed TLS origin; --live uses real AWS and the network.
+
+    python bench/local_server.py --port 8080
+    curl -s localhost:8080/status/health-checkers
+"""
+
+import argparse
+import asyncio
+import base64
+import http
+import importlib.util
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import TLSOrigin, install_fake_aws  # noqa: E402
+from run_benchmarks import bench_env  # noqa: E402
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1] / "lambda"
+HANDLERS = ("status_handler", "status_api_handler")
+# Both Lambdas run with a 10s timeout in lambda_status.tf
+FUNCTION_TIMEOUT_MS = 10000
+
+
+def handler_for(path):
+    """Which Lambda API Gateway routes a path to."""
+    return "status_handler" if path.rstrip("/").endswith("/status") else "status_api_handler"
+
+
+def build_event(method, target, headers, source_ip, body=b""):
+    """
+    API Gateway HTTP API (v2) event for one request. Header names are lower
+    case, and repeated headers and query parameters are joined with commas,
+    as API Gateway does.
+    """
+    parts = urlsplit(target)
+    query = {}
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        query[name] = f"{query[name]},{value}" if name in query else value
+
+    now = datetime.now(timezone.utc)
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": parts.path,
+        "rawQueryString": parts.query,
+        "headers": headers,
+        "queryStringParameters": query or None,
+        "requestContext": {
+            "http": {
+                "method": method,
+                "path": parts.path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": source_ip,
+                "userAgent": headers.get("user-agent", ""),
+            },
+            "requestId": uuid.uuid4().hex,
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": now.strftime("%d/%b/%Y:%H:%M:%S +0000"),
+            "timeEpoch": int(now.timestamp() * 1000),
+        },
+        "body": base64.b64encode(body).decode("ascii") if body else None,
+        "isBase64Encoded": bool(body),
+    }
+
+
+def encode_response(result, keep_alive):
+    """Lambda proxy result -> raw HTTP/1.1 response bytes."""
+    status = int(result.get("statusCode", 200))
+    body = result.get("body") or ""
+    payload = base64.b64decode(body) if result.get("isBase64Encoded") else body.encode("utf-8")
+
+    headers = dict(result.get("headers") or {})
+    headers["Content-Length"] = str(len(payload))
+    headers["Connection"] = "keep-alive" if keep_alive else "close"
+    try:
+        reason = http.HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+
+    head = f"HTTP/1.1 {status} {reason}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+    return head.encode("latin-1") + payload
+
+
+class _LocalContext:
+    """Lambda context with the function's timeout counting down from the invocation start."""
+
+    def __init__(self, function_name):
+        self.function_name = function_name
+        self._deadline = time.monotonic() + FUNCTION_TIMEOUT_MS / 1000.0
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+class Container:
+    """One warm container: its own copy of each handler module."""
+
+    def __init__(self, index, live=False, origin=None):
+        self.modules = {}
+        for name in HANDLERS:
+            spec = importlib.util.spec_from_file_location(f"local_{name}_{index}", LAMBDA_DIR / f"{name}.py")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if not live:
+                install_fake_aws(module)
+                if origin is not None and name == "status_api_handler":
+                    origin.target(module)
+            self.modules[name] = module
+
+    def invoke(self, name, event):
+        try:
+            return self.modules[name].lambda_handler(event, _LocalContext(name))
+        except Exception as exc:  # noqa: BLE001
+            # What API Gateway answers when the integration fails
+            print(f"{name} raised: {exc!r}", file=sys.stderr)
+            return {"statusCode": 500, "headers": {"Content-Type": "application/json"},
+                    "body": '{"message":"Internal Server Error"}'}
+
+
+class LocalServer:
+    """asyncio HTTP server dispatching requests to a pool of warm containers."""
+
+    def __init__(self, containers=2, live=False, host="127.0.0.1", port=0):
+        self.containers = containers
+        self.live = live
+        self.host = host
+        self.port = port
+        self._origin = None
+        self._env = None
+        self._server = None
+        self._idle = None
+
+    async def start(self):
+        if not self.live:
+            # Handlers read their settings at import; the caller's environment is restored on close
+            self._env = bench_env()
+            self._env.__enter__()
+            self._origin = TLSOrigin().__enter__()
+        self._idle = asyncio.Queue()
+        for index in range(self.containers):
+            self._idle.put_nowait(Container(index, self.live, self._origin))
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._origin is not None:
+            self._origin.__exit__(None, None, None)
+            self._origin = None
+        if self._env is not None:
+            self._env.__exit__(None, None, None)
+            self._env = None
+
+    async def invoke(self, method, target, headers, source_ip, body=b""):
+        """Run one request on the next idle container and return the proxy result."""
+        event = build_event(method, target, headers, source_ip, body)
+        container = await self._idle.get()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, container.invoke, handler_for(event["rawPath"]), event)
+        finally:
+            self._idle.put_nowait(container)
+
+    async def _serve_connection(self, reader, writer):
+        source_ip = (writer.get_extra_info("peername") or ("127.0.0.1",))[0]
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(encode_response({"statusCode": 400, "body": ""}, keep_alive=False))
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    name, value = name.strip().lower(), value.strip()
+                    headers[name] = f"{headers[name]},{value}" if name in headers else value
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                result = await self.invoke(method, target, headers, source_ip, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(encode_response(result, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _serve(args):
+    server = await LocalServer(args.containers, args.live, args.host, args.port).start()
+    print(f"Serving the status Lambdas on http://{server.host}:{server.port} ({args.containers} containers)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--containers", type=int, default=2, help="warm containers serving requests concurrently")
+    parser.add_argument("--live", action="store_true", help="use real AWS and network instead of fakes")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
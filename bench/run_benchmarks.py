@@ -0,0 +1,229 @@
+"""
+Offline benchmark suite for the status Lambdas.
+
+Every route is invoked in-process against fake Route 53/CloudWatch clients
+and a local self-signed HTTPS origin, so no network or AWS credentials are
+needed. For each route the suite reports:
+
+- uncached handler latency (response cache cleared before every call)
+- cached handler latency (warm-container cache hit)
+- allocations for one uncached call (tracemalloc peak and net bytes)
+
+and, via bench/cold_start.py, module import time per handler.
+
+    python bench/run_benchmarks.py
+    python bench/run_benchmarks.py --write-baseline bench/baseline.json
+    python bench/run_benchmarks.py --baseline bench/baseline.json --threshold 0.3
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import cold_start  # noqa: E402
+from fakes import TLSOrigin, install_fake_aws  # noqa: E402
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1] / "lambda"
+
+BENCH_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "ALARM_NAME": "bench-alarm",
+    "ROUTE53_HEALTH_CHECK_ID": "bench-check",
+    "CF_DISTRIBUTION_ID": "EBENCH",
+    "WAF_WEB_ACL_METRIC_NAME": "benchAcl",
+    "STATUS_API_FUNCTION_NAME": "bench-fn",
+    "WAF_ENABLED": "true",
+    "WAF_BLOCK_COUNTRIES": "RU,CN",
+    # Keep EMF log lines out of the JSON report on stdout
+    "STATUS_METRICS_NAMESPACE": "",
+}
+
+# (handler module, route path, query string parameters)
+CASES = [
+    ("status_api_handler", "/status/latency", {"samples": "3"}),
+    ("status_api_handler", "/status/health-checkers", {}),
+    ("status_api_handler", "/status/metrics", {}),
+    ("status_api_handler", "/status/metrics/history", {"windowMinutes": "1440", "points": "120"}),
+    ("status_api_handler", "/status/all", {"samples": "1"}),
+    ("status_handler", "/status", {}),
+]
+
+# Report keys compared against a baseline
+GATED_KEYS = ("uncachedMedianMs", "cachedMedianMs", "peakAllocBytes", "importMs")
+
+
+class _BenchContext:
+    """Minimal Lambda context with the function's 10s budget."""
+
+    function_name = "bench-fn"
+
+    def get_remaining_time_in_millis(self):
+        return 10000
+
+
+def _load(module_name):
+    """Fresh copy of a handler module with fakes installed."""
+    spec = importlib.util.spec_from_file_location(f"bench_{module_name}", LAMBDA_DIR / f"{module_name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    install_fake_aws(module)
+    return module
+
+
+def _invoke(module, route, query, headers=None):
+    event = {"rawPath": route, "queryStringParameters": query, "headers": headers or {}}
+    response = module.lambda_handler(event, _BenchContext())
+    if response["statusCode"] not in (200, 304):
+        raise RuntimeError(f"{route} returned {response['statusCode']}")
+    return response
+
+
+def _clear_cache(module):
+    cache = getattr(module, "_response_cache", None)
+    if cache is not None:
+        cache.clear()
+
+
+def _time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    timings.sort()
+    return {
+        "medianMs": statistics.median(timings),
+        "p90Ms": timings[min(len(timings) - 1, int(len(timings) * 0.9))],
+        "maxMs": timings[-1],
+    }
+
+
+def bench_route(module, route, query, iterations):
+    """Latency and allocation numbers for one route."""
+    # Warm lazily created state (pool, clients, SSL context) outside the timings
+    _clear_cache(module)
+    _invoke(module, route, query)
+
+    def uncached():
+        _clear_cache(module)
+        _invoke(module, route, query)
+
+    uncached_stats = _time_calls(uncached, iterations)
+    cached_stats = _time_calls(lambda: _invoke(module, route, query), iterations)
+
+    _clear_cache(module)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    response = _invoke(module, route, query)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "uncachedMedianMs": uncached_stats["medianMs"],
+        "uncachedP90Ms": uncached_stats["p90Ms"],
+        "uncachedMaxMs": uncached_stats["maxMs"],
+        "cachedMedianMs": cached_stats["medianMs"],
+        "cachedP90Ms": cached_stats["p90Ms"],
+        "peakAllocBytes": peak - before,
+        "netAllocBytes": after - before,
+        "responseBytes": len(response["body"]),
+    }
+
+
+@contextmanager
+def bench_env():
+    """Apply BENCH_ENV for the duration of a run, then restore the caller's environment."""
+    saved = {key: os.environ.get(key) for key in BENCH_ENV}
+    os.environ.update(BENCH_ENV)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def build_report(iterations=20, cold_start_repeat=3):
+    """Run every case and return the full report."""
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "iterations": iterations,
+        "routes": {},
+    }
+
+    with bench_env(), TLSOrigin() as origin:
+        modules = {}
+        for module_name, route, query in CASES:
+            if module_name not in modules:
+                modules[module_name] = _load(module_name)
+                if module_name == "status_api_handler":
+                    origin.target(modules[module_name])
+            report["routes"][f"{module_name} {route}"] = bench_route(
+                modules[module_name], route, query, iterations
+            )
+
+    if cold_start_repeat:
+        cold = cold_start.build_report(repeat=cold_start_repeat)
+        for module_name, routes in cold["handlers"].items():
+            for route, numbers in routes.items():
+                entry = report["routes"].setdefault(f"{module_name} {route}", {})
+                entry["importMs"] = numbers["importMs"]
+                entry["firstInvocationMs"] = numbers["firstInvocationMs"]
+
+    return report
+
+
+def compare(report, baseline, threshold):
+    """Drift messages for gated numbers more than `threshold` (relative) above baseline."""
+    drifts = []
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        for key in GATED_KEYS:
+            if key not in current or key not in previous:
+                continue
+            limit = previous[key] * (1.0 + threshold)
+            if current[key] > limit:
+                drifts.append(f"{name} {key}: {current[key]:.1f} > {limit:.1f} (baseline {previous[key]:.1f})")
+    return drifts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per route and mode")
+    parser.add_argument("--cold-start-repeat", type=int, default=3, help="fresh interpreters per route for import time (0 skips)")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed relative drift vs baseline")
+    parser.add_argument("--write-baseline", help="write this run's report to the given path")
+    args = parser.parse_args(argv)
+
+    report = build_report(iterations=args.iterations, cold_start_repeat=args.cold_start_repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.write_baseline:
+        Path(args.write_baseline).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        drifts = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+        for line in drifts:
+            print(f"DRIFT: {line}", file=sys.stderr)
+        return 1 if drifts else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
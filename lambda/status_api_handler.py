@@ -1,22 +1,47 @@
+import base64
+import contextvars
+import gzip
+import hashlib
 import json
+import math
 import os
+import random
 import re
 import socket
 import ssl
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-
-import boto3
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 # The site we are measuring for latency
 HOSTNAME = "chris-nelson.dev"
 PORT = 443
 REQUEST_PATH = "/"
+# Extra probe targets come from PROBE_TARGETS, a JSON list of
+# {"name", "host", "port", "path", "expectStatus", "timeoutSeconds"} objects;
+# only "host" is required. When unset, the site above is the only target.
+# Per-socket timeout for a single probe (seconds)
+PROBE_TIMEOUT_SECONDS = 5.0
+# Samples taken per /status/latency request; callers may ask for up to MAX_PROBE_SAMPLES via ?samples=
+DEFAULT_PROBE_SAMPLES = 3
+MAX_PROBE_SAMPLES = 10
+# Probe phases reported individually, in the order they happen; transferMs
+# runs from the first response byte to the end of the body
+PROBE_PHASES = ("dnsMs", "tcpConnectMs", "tlsHandshakeMs", "ttfbMs", "transferMs")
+# Requests sent over one keep-alive connection by the warm-path probe
+KEEPALIVE_REQUESTS = 3
+# Largest response body the probe will drain to keep a connection reusable
+MAX_PROBE_BODY_BYTES = 2 * 1024 * 1024
 
 # Route 53 health check id is passed via environment variable
 ROUTE53_HEALTH_CHECK_ID = os.environ.get("ROUTE53_HEALTH_CHECK_ID", "")
+# Further checks as a comma-separated list of ids or name=id pairs, fetched
+# concurrently with the one above
+ROUTE53_HEALTH_CHECK_IDS = os.environ.get("ROUTE53_HEALTH_CHECK_IDS", "")
 CF_DISTRIBUTION_ID = os.environ.get("CF_DISTRIBUTION_ID", "")
 WAF_WEB_ACL_METRIC_NAME = os.environ.get("WAF_WEB_ACL_METRIC_NAME", "")
 WAF_REGION = os.environ.get("WAF_REGION", "Global")
@@ -25,10 +50,298 @@ API_VERSION = os.environ.get("STATUS_API_VERSION", "v1")
 # Metrics lookback window (minutes). CloudFront/WAF can be sparse, so use 60m.
 METRIC_WINDOW_MINUTES = 60
 CLOUDWATCH_REGION = "us-east-1"
+# /status/metrics/history bounds: window up to 24h at 1-minute resolution,
+# downsampled server-side to ?points= per series
+MAX_HISTORY_WINDOW_MINUTES = 24 * 60
+DEFAULT_HISTORY_WINDOW_MINUTES = 180
+HISTORY_PERIOD_SECONDS = 60
+DEFAULT_HISTORY_POINTS = 120
+MAX_HISTORY_POINTS = 1000
+
+# SLO objectives (percent good). Availability covers CloudFront 5xx, Route 53
+# checker observations and status API errors; latency is the share of status
+# API invocations finishing within SLO_LATENCY_THRESHOLD_MS.
+SLO_AVAILABILITY_TARGET = 99.9
+SLO_LATENCY_TARGET = 99.0
+SLO_LATENCY_THRESHOLD_MS = 1000
+# Burn-rate windows: (name, length seconds, cache seconds). A window is only
+# refetched once its cache runs out, so the 3-day window is not re-read
+# every time the 5-minute one is.
+SLO_WINDOWS: Tuple[Tuple[str, int, float], ...] = (
+    ("5m", 300, 60.0),
+    ("1h", 3600, 300.0),
+    ("6h", 21600, 900.0),
+    ("3d", 259200, 3600.0),
+)
+# Burn-rate windows end this long before now, on a minute boundary, so the
+# newest datapoint of every window is a complete period despite CloudWatch
+# ingestion lag (one period of the shortest window)
+SLO_INGESTION_LAG_SECONDS = 300
+# Multi-window burn-rate alerts: (severity, long window, short window, burn
+# rate both must exceed)
+SLO_ALERTS: Tuple[Tuple[str, str, str, float], ...] = (
+    ("page", "1h", "5m", 14.4),
+    ("ticket", "3d", "6h", 1.0),
+)
+
+# Warm-container response cache policy per route:
+# (fresh TTL seconds, extra serve-stale seconds on upstream failure, max entries).
+# Route 53 checks every 30s and metric periods are 300s, so polling faster
+# than that only repeats the same answer.
+CACHE_POLICIES: Dict[str, Tuple[float, float, int]] = {
+    "latency": (15.0, 120.0, 16),
+    "health-checkers": (30.0, 300.0, 16),
+    "metrics": (60.0, 600.0, 16),
+    "metrics/history": (120.0, 600.0, 16),
+    "latency/history": (60.0, 600.0, 16),
+    "all": (15.0, 120.0, 32),
+    "slo": (60.0, 600.0, 4),
+}
+
+# Routes answering ?since=<versionToken> with deltas, and how many versions
+# (and query variants) of each a warm container remembers
+DELTA_ROUTES = ("health-checkers", "metrics")
+DELTA_HISTORY_VERSIONS = 16
+DELTA_HISTORY_KEYS = 32
+# Keys left out of version tokens and deltas at any depth: they move on every
+# poll without the data changing. Deltas carry the newest checkedTime once.
+DELTA_VOLATILE_KEYS = ("generatedAt", "checkedTime")
+
+# Precomputed status snapshot written by the scheduled refresh, e.g.
+# "s3:bucket/status/snapshot.json" or "dir:/tmp/status"; empty serves every route live
+STATUS_SNAPSHOT = os.environ.get("STATUS_SNAPSHOT", "")
+# Snapshot object layout; readers ignore snapshots in any other format
+SNAPSHOT_FORMAT = 1
+# Refresh schedule rate; snapshot bodies are fresh for this long
+SNAPSHOT_INTERVAL_SECONDS = 60
+# How often a warm container checks for a newer snapshot
+SNAPSHOT_RELOAD_SECONDS = 10
+# Sections older than this are rebuilt live instead (missed refreshes)
+SNAPSHOT_MAX_AGE_SECONDS = 300
+# Read routes served from the snapshot -> snapshot section
+SNAPSHOT_ROUTES = {"latency": "latency", "health-checkers": "health", "metrics": "metrics"}
+# CloudWatch alarm summarized in the snapshot's "alarm" section for /status
+ALARM_NAME = os.environ.get("ALARM_NAME", "")
+
+# Probe-result store, e.g. "dynamodb:table-name" or "sqlite:/tmp/probes.db"; empty disables it
+PROBE_STORE = os.environ.get("PROBE_STORE", "")
+# Rollup resolutions: name -> (bucket seconds, retention seconds)
+ROLLUP_RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "1m": (60, 2 * 86400),
+    "1h": (3600, 35 * 86400),
+    "1d": (86400, 400 * 86400),
+}
+# Latency histogram buckets grow by 5% from 0.1ms, so rollup percentiles are within ~2.5%
+HISTOGRAM_MIN_MS = 0.1
+HISTOGRAM_GROWTH = 1.05
+# Warm-container latency sketches: fixed log buckets up to this latency,
+# rolled over every window; percentiles cover the current and previous window
+SKETCH_MAX_MS = 60000.0
+SKETCH_WINDOW_SECONDS = 3600
+# Longest /status/latency/history window: 400 days of daily rollups
+MAX_LATENCY_HISTORY_MINUTES = 400 * 24 * 60
+
+# Responses smaller than this are sent uncompressed; gzip/brotli overhead isn't worth it
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# botocore client tuning: fail fast inside the 10s function timeout, retry
+# throttling with standard backoff, and size the pool for the fan-out workers.
+# The same variables tune status_handler's client.
+AWS_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("AWS_CONNECT_TIMEOUT_SECONDS", "2"))
+AWS_READ_TIMEOUT_SECONDS = float(os.environ.get("AWS_READ_TIMEOUT_SECONDS", "5"))
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+
+# Fan-out pool for independent I/O calls, reused across warm invocations.
+FAN_OUT_WORKERS = 16
+# Separate pool for whole sections (/status/all, scheduled refresh). Sections
+# fan out again on the shared pool, so running them there could leave their
+# own inner calls queued behind them until the deadline.
+SECTION_WORKERS = 4
+# Time kept back from the Lambda deadline for serialization and the response.
+DEADLINE_SAFETY_MS = 1000
+# Budget used when no Lambda context is available (local runs); matches the 10s function timeout.
+DEFAULT_REMAINING_MS = 10000
+
+# Circuit breakers per upstream (CloudWatch, Route 53): open after this many
+# consecutive failures, or at once on throttling, then fail fast for a
+# jittered cooldown that doubles on every failed retry up to the maximum.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_COOLDOWN_SECONDS = 5.0
+BREAKER_MAX_COOLDOWN_SECONDS = 120.0
+# botocore error codes that mean "slow down" rather than "broken"
+THROTTLING_ERROR_CODES = frozenset({
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "PriorRequestNotComplete",
+})
+
+# CloudWatch namespace for the per-stage timings logged in Embedded Metric
+# Format after every invocation; empty disables the log line.
+METRICS_NAMESPACE = os.environ.get("STATUS_METRICS_NAMESPACE", "ChrisNelsonDev/StatusApi")
+# Stage names used for each probe phase in Server-Timing and EMF
+PHASE_STAGES = {
+    "dnsMs": "dns",
+    "tcpConnectMs": "connect",
+    "tlsHandshakeMs": "tls",
+    "ttfbMs": "ttfb",
+    "transferMs": "transfer",
+}
+
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_executor = None
+_section_executor = None
+
+
+def _client(service: str, region: Optional[str] = None):
+    """
+    Create an AWS client on first use and keep it for warm invocations.
+
+    boto3 is imported here rather than at module load, so routes that never
+    call AWS (such as /status/latency) skip its import cost on a cold start.
+    """
+    key = (service, region)
+    if key not in _clients:
+        import boto3
+        from botocore.config import Config
+
+        config = Config(
+            connect_timeout=AWS_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=AWS_READ_TIMEOUT_SECONDS,
+            retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "standard"},
+            max_pool_connections=FAN_OUT_WORKERS,
+            tcp_keepalive=True,
+        )
+        _clients[key] = boto3.client(service, region_name=region, config=config)
+    return _clients[key]
+
+
+def _route53():
+    """Route 53 client (global service)."""
+    return _client("route53")
+
+
+def _cloudwatch():
+    """CloudFront and WAF metrics are global and must be queried from us-east-1."""
+    return _client("cloudwatch", CLOUDWATCH_REGION)
+
+
+def _fan_out_executor():
+    """Fan-out pool, started on first use."""
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _executor = ThreadPoolExecutor(max_workers=FAN_OUT_WORKERS, thread_name_prefix="status-fanout")
+    return _executor
+
+
+def _section_fan_out_executor():
+    """Pool for sections that fan out again themselves, started on first use."""
+    global _section_executor
+    if _section_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _section_executor = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="status-section")
+    return _section_executor
+
 
-route53 = boto3.client("route53")
-# CloudFront and WAF metrics are global and must be queried from us-east-1
-cloudwatch = boto3.client("cloudwatch", region_name=CLOUDWATCH_REGION)
+# Per-invocation stage timings: stage -> [total ms, calls]. Cleared at the
+# start of each invocation; fan-out threads add to it under the lock.
+_stage_lock = threading.Lock()
+_stage_timings: Dict[str, List[float]] = {}
+# Token of the invocation the totals belong to. Fan-out tasks carry the
+# token they were submitted under, so a task that outlives its deadline
+# can't add to the next invocation's totals.
+_stage_token: contextvars.ContextVar = contextvars.ContextVar("stage_token", default=None)
+_current_stage_token: Optional[object] = None
+
+
+def _record_stage(stage: str, elapsed_ms: float) -> None:
+    """Add one timed call of a stage to the current invocation's totals."""
+    with _stage_lock:
+        if _stage_token.get() is not _current_stage_token:
+            return
+        entry = _stage_timings.setdefault(stage, [0.0, 0])
+        entry[0] += elapsed_ms
+        entry[1] += 1
+
+
+@contextmanager
+def _timed(stage: str):
+    """Time the enclosed block as one call of `stage`, even if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_stage(stage, (time.perf_counter() - start) * 1000.0)
+
+
+def _reset_stage_timings() -> None:
+    """Start a new invocation's totals; writes under older tokens are dropped."""
+    global _current_stage_token
+    token = object()
+    _stage_token.set(token)
+    with _stage_lock:
+        _current_stage_token = token
+        _stage_timings.clear()
+
+
+def _stage_snapshot() -> Dict[str, Tuple[float, int]]:
+    """Copy of the current totals as {stage: (total ms, calls)}."""
+    with _stage_lock:
+        return {stage: (entry[0], int(entry[1])) for stage, entry in _stage_timings.items()}
+
+
+def _server_timing(stages: Dict[str, Tuple[float, int]], total_ms: float) -> str:
+    """
+    Server-Timing header value. Stages run concurrently (fan-out, parallel
+    probes) so their durations can overlap and add up to more than total.
+    """
+    parts = []
+    for stage, (elapsed_ms, calls) in stages.items():
+        part = f"{stage};dur={elapsed_ms:.1f}"
+        if calls > 1:
+            part += f';desc="{calls} calls"'
+        parts.append(part)
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def _emf_record(
+    route: Optional[str],
+    stages: Dict[str, Tuple[float, int]],
+    total_ms: float,
+    status_code: int,
+    cache_status: str,
+) -> Dict[str, Any]:
+    """
+    One Embedded Metric Format log record: CloudWatch turns each <stage>Ms
+    value into a metric under the Route dimension, no PutMetricData needed.
+    """
+    record: Dict[str, Any] = {
+        "Route": route or "unmatched",
+        "StatusCode": status_code,
+        "Cache": cache_status,
+    }
+    metrics = []
+    for stage, (elapsed_ms, calls) in stages.items():
+        record[f"{stage}Ms"] = round(elapsed_ms, 3)
+        record[f"{stage}Calls"] = calls
+        metrics.append({"Name": f"{stage}Ms", "Unit": "Milliseconds"})
+    record["totalMs"] = round(total_ms, 3)
+    metrics.append({"Name": "totalMs", "Unit": "Milliseconds"})
+    record["_aws"] = {
+        "Timestamp": int(time.time() * 1000),
+        "CloudWatchMetrics": [
+            {"Namespace": METRICS_NAMESPACE, "Dimensions": [["Route"]], "Metrics": metrics},
+        ],
+    }
+    return record
 
 
 def _iso_now() -> str:
@@ -36,80 +349,1058 @@ def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _measure_site() -> Tuple[float, float, int, str, str]:
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _probe_ssl_context() -> ssl.SSLContext:
     """
-    Open a real TLS connection to chris-nelson.dev and measure:
+    SSL context shared by every probe and kept across warm invocations, so
+    CA certificates are loaded once and client TLS sessions can be resumed.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _http_request(host: str, path: str, keep_alive: bool = False) -> bytes:
+    """Encode the probe's GET request."""
+    return (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "User-Agent: status-lambda/1.0\r\n"
+        "\r\n"
+    ).encode("ascii")
+
+
+def _parse_status_line(chunk: bytes) -> Tuple[int, str]:
+    """Return (status code, reason phrase) from the first line of an HTTP response."""
+    first_line = chunk.split(b"\r\n", 1)[0].decode("iso-8859-1", errors="replace")
+    parts = first_line.split(" ", 2)
+    if len(parts) >= 2 and parts[0].startswith("HTTP/"):
+        try:
+            status_code = int(parts[1])
+        except ValueError:
+            status_code = 0
+        reason = parts[2] if len(parts) >= 3 else ""
+        return status_code, reason
+    return 0, "Invalid HTTP response"
 
-    - TLS handshake time (ms)
-    - Time to first byte (TTFB, ms, after handshake)
-    - HTTP status code
-    - HTTP reason phrase
-    - Resolved peer IP
 
-    If anything fails, we return synthetic values that clearly indicate
-    an unhealthy state, but still conform to expected types.
+def _measure_site(
+    host: str = HOSTNAME,
+    port: int = PORT,
+    path: str = REQUEST_PATH,
+    timeout: float = PROBE_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
     """
+    Open a real TLS connection to the target and time each phase separately:
+
+    - DNS resolution (ms)
+    - TCP connect (ms)
+    - TLS handshake (ms)
+    - Time to first byte (TTFB, ms, from request sent to first response byte)
+    - Content transfer (ms, from first byte to the end of the body)
+
+    The full response is read: headers are parsed and the body is drained
+    by Content-Length or chunked encoding up to MAX_PROBE_BODY_BYTES. Also
+    returns the HTTP status code, reason phrase, resolved peer IP,
+    CloudFront's cache result (X-Cache) and edge POP (X-Amz-Cf-Pop), the
+    body size and the transfer throughput.
+    If anything fails, phases that were not reached are None and the sample
+    is marked with statusCode 503 and ok=False.
+    """
+    sample: Dict[str, Any] = {phase: None for phase in PROBE_PHASES}
+    sample.update({
+        "statusCode": 503,
+        "statusReason": "",
+        "peerIp": "",
+        "cache": None,
+        "edgePop": None,
+        "responseBytes": None,
+        "bytesPerSecond": None,
+        "bodyComplete": False,
+        "ok": False,
+    })
+    ssl_sock = None
+
     try:
-        addr_info = socket.getaddrinfo(HOSTNAME, PORT, type=socket.SOCK_STREAM)
+        dns_start = time.monotonic()
+        addr_info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        sample["dnsMs"] = (time.monotonic() - dns_start) * 1000.0
         if not addr_info:
             raise RuntimeError("No address info for host")
 
         family, socktype, proto, _, sockaddr = addr_info[0]
 
         raw_sock = socket.socket(family, socktype, proto)
-        raw_sock.settimeout(5.0)
+        raw_sock.settimeout(timeout)
 
-        handshake_start = time.monotonic()
-        raw_sock.connect(sockaddr)
+        connect_start = time.monotonic()
+        try:
+            raw_sock.connect(sockaddr)
+        except Exception:
+            raw_sock.close()
+            raise
+        sample["tcpConnectMs"] = (time.monotonic() - connect_start) * 1000.0
 
-        context = ssl.create_default_context()
-        ssl_sock = context.wrap_socket(raw_sock, server_hostname=HOSTNAME)
-        handshake_done = time.monotonic()
+        tls_start = time.monotonic()
+        ssl_sock = _probe_ssl_context().wrap_socket(raw_sock, server_hostname=host)
+        sample["tlsHandshakeMs"] = (time.monotonic() - tls_start) * 1000.0
 
-        tls_ms = (handshake_done - handshake_start) * 1000.0
-
-        request = (
-            f"GET {REQUEST_PATH} HTTP/1.1\r\n"
-            f"Host: {HOSTNAME}\r\n"
-            "Connection: close\r\n"
-            "User-Agent: status-lambda/1.0\r\n"
-            "\r\n"
-        )
-
-        ssl_sock.settimeout(5.0)
+        stream = ssl_sock.makefile("rb")
         ttfb_start = time.monotonic()
-        ssl_sock.sendall(request.encode("ascii"))
+        ssl_sock.sendall(_http_request(host, path))
 
-        first_chunk = ssl_sock.recv(4096)
+        if not stream.peek(1):
+            raise RuntimeError("No data received from server")
         ttfb_done = time.monotonic()
+        sample["ttfbMs"] = (ttfb_done - ttfb_start) * 1000.0
+
+        response = _read_http_response(stream)
+        transfer_seconds = time.monotonic() - ttfb_done
+        sample["transferMs"] = transfer_seconds * 1000.0
+
+        headers = response["headers"]
+        sample["statusCode"] = response["statusCode"]
+        sample["statusReason"] = response["statusReason"]
+        sample["peerIp"] = ssl_sock.getpeername()[0]
+        # "Hit from cloudfront", "RefreshHit from cloudfront", "Miss from cloudfront", ...
+        sample["cache"] = headers.get("x-cache", "").split(" ", 1)[0] or None
+        sample["edgePop"] = headers.get("x-amz-cf-pop")
+        sample["responseBytes"] = response["bodyBytes"]
+        sample["bytesPerSecond"] = response["bodyBytes"] / transfer_seconds if transfer_seconds > 0 else None
+        sample["bodyComplete"] = response["complete"]
+        sample["ok"] = True
+
+    except Exception as exc:  # noqa: BLE001
+        # Synthetic values that clearly show a measurement failure
+        sample["statusCode"] = 503
+        sample["statusReason"] = f"Measurement error: {exc}"
+    finally:
+        if ssl_sock is not None:
+            ssl_sock.close()
+
+    for phase, stage in PHASE_STAGES.items():
+        if sample[phase] is not None:
+            _record_stage(stage, sample[phase])
+
+    return sample
+
+
+def _read_http_response(stream, max_body: int = MAX_PROBE_BODY_BYTES) -> Dict[str, Any]:
+    """
+    Read one full HTTP/1.1 response from a buffered binary stream.
+
+    Headers are parsed and the body is drained by Content-Length or chunked
+    transfer encoding, up to max_body bytes. "complete" is False when the
+    body was cut off, in which case the connection cannot be reused.
+    """
+    status_line = stream.readline()
+    if not status_line:
+        raise RuntimeError("No data received from server")
+    status_code, reason = _parse_status_line(status_line)
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = stream.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("iso-8859-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    body_bytes = 0
+    complete = True
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = stream.readline()
+            if not size_line:
+                # Connection closed before the terminating zero-size chunk
+                complete = False
+                break
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailers, if any, end with an empty line
+                while stream.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            if body_bytes + size > max_body:
+                complete = False
+                break
+            chunk_bytes = len(stream.read(size))
+            body_bytes += chunk_bytes
+            if chunk_bytes < size:
+                complete = False
+                break
+            stream.readline()
+    elif "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > max_body:
+            complete = False
+            length = max_body
+        body_bytes = len(stream.read(length))
+        if body_bytes < length:
+            complete = False
+    else:
+        # No framing: the body runs until the server closes the connection
+        body_bytes = len(stream.read(max_body))
+        complete = False
+
+    return {
+        "statusCode": status_code,
+        "statusReason": reason.strip(),
+        "headers": headers,
+        "bodyBytes": body_bytes,
+        "complete": complete,
+    }
+
+
+def _measure_warm_path(
+    host: str = HOSTNAME,
+    port: int = PORT,
+    path: str = REQUEST_PATH,
+    timeout: float = PROBE_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Compare cold and warm connection cost the way a browser experiences it.
+
+    1. Cold: full TLS handshake on a new connection, then KEEPALIVE_REQUESTS
+       requests over that same keep-alive connection.
+    2. Resumed: a second connection that offers the TLS session from the
+       first, timing the abbreviated handshake.
+    """
+    result: Dict[str, Any] = {
+        "coldHandshakeMs": None,
+        "coldTtfbMs": None,
+        "reusedConnectionTtfbMs": None,
+        "resumedHandshakeMs": None,
+        "sessionReused": False,
+        "requestsOnConnection": 0,
+        "ok": False,
+    }
+    context = _probe_ssl_context()
+
+    def connect(session=None):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        start = time.monotonic()
+        try:
+            tls = context.wrap_socket(sock, server_hostname=host, session=session)
+        except Exception:
+            sock.close()
+            raise
+        return tls, (time.monotonic() - start) * 1000.0
+
+    try:
+        cold, result["coldHandshakeMs"] = connect()
+        try:
+            stream = cold.makefile("rb")
+            ttfbs: List[float] = []
+            for i in range(KEEPALIVE_REQUESTS):
+                last = i == KEEPALIVE_REQUESTS - 1
+                start = time.monotonic()
+                cold.sendall(_http_request(host, path, keep_alive=not last))
+                stream.peek(1)
+                ttfbs.append((time.monotonic() - start) * 1000.0)
+                response = _read_http_response(stream)
+                result["requestsOnConnection"] = i + 1
+                if not response["complete"] or response["headers"].get("connection", "").lower() == "close":
+                    break
+            session = cold.session
+        finally:
+            cold.close()
+
+        result["coldTtfbMs"] = ttfbs[0]
+        result["reusedConnectionTtfbMs"] = _summarize_samples(ttfbs[1:])
+
+        resumed, result["resumedHandshakeMs"] = connect(session=session)
+        result["sessionReused"] = resumed.session_reused
+        resumed.close()
+        result["ok"] = True
+
+    except Exception as exc:  # noqa: BLE001
+        result["error"] = f"Warm-path measurement error: {exc}"
+
+    return result
+
+
+async def _probe_address(
+    host: str,
+    port: int,
+    path: str,
+    family: int,
+    sockaddr: Tuple[Any, ...],
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Probe one resolved address: TCP connect, TLS handshake (SNI and
+    certificate checked against `host`) and TTFB, each timed separately.
+    """
+    import asyncio
+
+    ip = sockaddr[0]
+    result: Dict[str, Any] = {
+        "ip": ip,
+        "family": "IPv6" if family == socket.AF_INET6 else "IPv4",
+        "tcpConnectMs": None,
+        "tlsHandshakeMs": None,
+        "ttfbMs": None,
+        "statusCode": 503,
+        "statusReason": "",
+        "ok": False,
+    }
+    writer = None
 
+    try:
+        connect_start = time.monotonic()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port, family=family), timeout
+        )
+        result["tcpConnectMs"] = (time.monotonic() - connect_start) * 1000.0
+
+        tls_start = time.monotonic()
+        await asyncio.wait_for(
+            writer.start_tls(_probe_ssl_context(), server_hostname=host), timeout
+        )
+        result["tlsHandshakeMs"] = (time.monotonic() - tls_start) * 1000.0
+
+        ttfb_start = time.monotonic()
+        writer.write(_http_request(host, path))
+        await writer.drain()
+        first_chunk = await asyncio.wait_for(reader.read(4096), timeout)
         if not first_chunk:
             raise RuntimeError("No data received from server")
 
-        ttfb_ms = (ttfb_done - ttfb_start) * 1000.0
+        result["ttfbMs"] = (time.monotonic() - ttfb_start) * 1000.0
+        result["statusCode"], result["statusReason"] = _parse_status_line(first_chunk)
+        result["ok"] = True
+
+    except Exception as exc:  # noqa: BLE001
+        result["statusReason"] = f"Measurement error: {exc or type(exc).__name__}"
+    finally:
+        if writer is not None:
+            writer.close()
+            # Close the transport now rather than leaving it to GC; a peer
+            # that never answers the TLS close can't hold the probe open.
+            with suppress(Exception):
+                await asyncio.wait_for(writer.wait_closed(), timeout)
+
+    return result
+
+
+async def _probe_all_addresses(host: str, port: int, path: str, timeout: float) -> Dict[str, Any]:
+    """
+    Resolve every A and AAAA address for the host and probe them all at once.
+
+    Because the probes overlap, wall time stays close to a single probe.
+    Fastest and slowest are ranked by connect + handshake + TTFB.
+    """
+    import asyncio
+
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
 
-        first_line = first_chunk.split(b"\r\n", 1)[0].decode(
-            "iso-8859-1", errors="replace"
+    try:
+        addr_info = await asyncio.wait_for(
+            loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
         )
-        parts = first_line.split(" ", 3)
-        if len(parts) >= 2 and parts[0].startswith("HTTP/"):
-            try:
-                status_code = int(parts[1])
-            except ValueError:
-                status_code = 0
-            reason = parts[2] if len(parts) >= 3 else ""
+    except Exception as exc:  # noqa: BLE001
+        return {"addresses": [], "error": f"DNS resolution failed: {exc}"}
+
+    seen = set()
+    targets = []
+    for family, _, _, _, sockaddr in addr_info:
+        if sockaddr[0] not in seen:
+            seen.add(sockaddr[0])
+            targets.append((family, sockaddr))
+
+    addresses = await asyncio.gather(
+        *(_probe_address(host, port, path, family, sockaddr, timeout) for family, sockaddr in targets)
+    )
+
+    ranked = sorted(
+        (a for a in addresses if a["ok"]),
+        key=lambda a: a["tcpConnectMs"] + a["tlsHandshakeMs"] + a["ttfbMs"],
+    )
+    return {
+        "addresses": list(addresses),
+        "probed": len(addresses),
+        "failed": len(addresses) - len(ranked),
+        "fastest": ranked[0]["ip"] if ranked else None,
+        "slowest": ranked[-1]["ip"] if ranked else None,
+        "wallMs": (time.monotonic() - started) * 1000.0,
+    }
+
+
+def _probe_edges(
+    host: str = HOSTNAME,
+    port: int = PORT,
+    path: str = REQUEST_PATH,
+    timeout: float = PROBE_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Synchronous entry point for probing every resolved edge address.
+    asyncio is imported on demand to keep it out of the cold-start path.
+    """
+    import asyncio
+
+    return asyncio.run(_probe_all_addresses(host, port, path, timeout))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _summarize_samples(values: List[float]) -> Optional[Dict[str, float]]:
+    """
+    Summarize one phase across samples: min, median, p90, max and jitter.
+    Jitter is the mean absolute difference between consecutive samples.
+    """
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    deltas = [abs(b - a) for a, b in zip(values, values[1:])]
+    return {
+        "min": ordered[0],
+        "median": _percentile(ordered, 50),
+        "p90": _percentile(ordered, 90),
+        "max": ordered[-1],
+        "jitter": sum(deltas) / len(deltas) if deltas else 0.0,
+    }
+
+
+def _bounded_int(query: Dict[str, str], name: str, default: int, low: int, high: int) -> int:
+    """Parse an integer query parameter clamped to [low, high]."""
+    try:
+        value = int(query.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(low, min(high, value))
+
+
+def _requested_samples(query: Dict[str, str]) -> int:
+    """Parse ?samples= into a count clamped to [1, MAX_PROBE_SAMPLES]."""
+    return _bounded_int(query, "samples", DEFAULT_PROBE_SAMPLES, 1, MAX_PROBE_SAMPLES)
+
+
+def _deadline_from_context(context) -> float:
+    """
+    Absolute time.monotonic() deadline for this invocation's fan-out work,
+    derived from the Lambda remaining time minus a safety margin.
+    """
+    remaining_ms = DEFAULT_REMAINING_MS
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if callable(get_remaining):
+        remaining_ms = get_remaining()
+    budget_ms = max(0, remaining_ms - DEADLINE_SAFETY_MS)
+    return time.monotonic() + budget_ms / 1000.0
+
+
+def _fan_out(tasks: Dict[str, Callable[[], Any]], deadline: float, executor=None) -> Dict[str, Any]:
+    """
+    Run independent calls concurrently on the shared pool and collect results.
+
+    Tasks that miss the deadline come back as a {"timedOut": True} section
+    instead of failing the invocation, and tasks that raise come back as an
+    {"error": ...} section. Wall time tracks the slowest task, not the sum.
+    Tasks that call _fan_out themselves must pass the section pool as
+    `executor`.
+    """
+    if not tasks:
+        return {}
+
+    from concurrent.futures import wait
+
+    executor = executor or _fan_out_executor()
+    # Each task runs in a copy of the caller's context, so it keeps the
+    # caller's stage-timing token.
+    futures = {name: executor.submit(contextvars.copy_context().run, fn) for name, fn in tasks.items()}
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+    results: Dict[str, Any] = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            results[name] = {
+                "timedOut": True,
+                "error": f"{name} did not finish before the invocation deadline",
+            }
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as exc:  # noqa: BLE001
+            results[name] = {"error": f"{name} failed: {exc}"}
+    return results
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+def _is_throttling(exc: Exception) -> bool:
+    """True for botocore ClientErrors whose error code asks the caller to back off."""
+    response = getattr(exc, "response", None)
+    code = response.get("Error", {}).get("Code") if isinstance(response, dict) else None
+    return code in THROTTLING_ERROR_CODES
+
+
+class CircuitBreaker:
+    """
+    Failure tracker for one upstream, kept across warm invocations.
+
+    closed: calls go through; consecutive failures are counted.
+    open: calls fail fast with CircuitOpenError until the cooldown ends.
+    half-open: one trial call goes through; success closes the circuit,
+    failure reopens it with a doubled cooldown. Cooldowns use equal jitter
+    so concurrent containers don't all retry at the same moment.
+    """
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opens = 0
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self._clock() >= self.open_until:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opens = 0
+            self.last_error = None
+            self._trial_in_flight = False
+
+    def record_failure(self, exc: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{'throttled: ' if _is_throttling(exc) else ''}{exc}"
+            self._trial_in_flight = False
+            if self.state == "half-open" or self.failures >= BREAKER_FAILURE_THRESHOLD or _is_throttling(exc):
+                self.opens += 1
+                cooldown = min(BREAKER_MAX_COOLDOWN_SECONDS, BREAKER_BASE_COOLDOWN_SECONDS * 2 ** (self.opens - 1))
+                self.open_until = self._clock() + cooldown / 2 + random.uniform(0, cooldown / 2)
+                self.state = "open"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State reported in responses; a healthy upstream is just {"state": "closed"}."""
+        with self._lock:
+            state: Dict[str, Any] = {"state": self.state}
+            if self.failures:
+                state["consecutiveFailures"] = self.failures
+                state["lastError"] = self.last_error
+            if self.state == "open":
+                state["retryInSeconds"] = round(max(0.0, self.open_until - self._clock()), 1)
+            return state
+
+
+# Fan-out threads can ask for the same upstream's breaker at once; the lock
+# makes sure they all share one instance.
+_breakers_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker(upstream)
+        return _breakers[upstream]
+
+
+def _guarded(upstream: str, call: Callable[[], Any]) -> Any:
+    """
+    Run one upstream call through its circuit breaker. While the circuit is
+    open this raises CircuitOpenError without calling out, so the failure is
+    negatively cached for the cooldown and the route cache can serve its
+    last good body instead.
+    """
+    breaker = _breaker(upstream)
+    if not breaker.allow():
+        retry_in = breaker.snapshot().get("retryInSeconds", 0.0)
+        raise CircuitOpenError(f"{upstream} circuit is open after repeated failures; retrying in {retry_in:.0f}s")
+    try:
+        result = call()
+    except Exception as exc:
+        breaker.record_failure(exc)
+        raise
+    breaker.record_success()
+    return result
+
+
+def _dependency_states(*upstreams: str) -> Dict[str, Dict[str, Any]]:
+    return {upstream: _breaker(upstream).snapshot() for upstream in upstreams}
+
+
+def _histogram_index(value_ms: float) -> int:
+    """Log-scale histogram bucket for a latency value."""
+    if value_ms <= HISTOGRAM_MIN_MS:
+        return 0
+    return int(math.log(value_ms / HISTOGRAM_MIN_MS) / math.log(HISTOGRAM_GROWTH))
+
+
+def _histogram_value(index: int) -> float:
+    """Representative (geometric midpoint) latency for a histogram bucket."""
+    return HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** (index + 0.5)
+
+
+def _rollup_delta(samples: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Flatten probe samples into additive rollup counters:
+
+    - n_<phase>, sum_<phase>: count and total of each phase
+    - h_<phase>_<bucket>: histogram bucket counts
+    - probes, failures: sample counts
+
+    Every counter only ever adds, so rollups merge by summing, and the
+    DynamoDB backend can apply a delta atomically with ADD.
+    """
+    delta: Dict[str, float] = {"probes": float(len(samples))}
+    for sample in samples:
+        if not sample.get("ok"):
+            delta["failures"] = delta.get("failures", 0.0) + 1
+            continue
+        for phase in PROBE_PHASES:
+            value = sample.get(phase)
+            if value is None:
+                continue
+            bucket = f"h_{phase}_{_histogram_index(value)}"
+            delta[f"n_{phase}"] = delta.get(f"n_{phase}", 0.0) + 1
+            delta[f"sum_{phase}"] = delta.get(f"sum_{phase}", 0.0) + value
+            delta[bucket] = delta.get(bucket, 0.0) + 1
+    return delta
+
+
+def _merge_rollups(rollups: List[Dict[str, float]]) -> Dict[str, float]:
+    """Sum rollup counters."""
+    merged: Dict[str, float] = {}
+    for rollup in rollups:
+        for key, value in rollup.items():
+            merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
+def _rollup_summary(rollup: Dict[str, float], phase: str) -> Optional[Dict[str, float]]:
+    """Count, mean and histogram percentiles for one phase of a rollup."""
+    count = rollup.get(f"n_{phase}", 0.0)
+    if not count:
+        return None
+
+    prefix = f"h_{phase}_"
+    buckets = sorted(
+        (int(key[len(prefix):]), n) for key, n in rollup.items() if key.startswith(prefix)
+    )
+
+    def quantile(q: float) -> float:
+        target = q * count
+        seen = 0.0
+        for index, n in buckets:
+            seen += n
+            if seen >= target:
+                return _histogram_value(index)
+        return _histogram_value(buckets[-1][0])
+
+    return {
+        "count": int(count),
+        "mean": rollup.get(f"sum_{phase}", 0.0) / count,
+        "p50": quantile(0.50),
+        "p90": quantile(0.90),
+        "p99": quantile(0.99),
+    }
+
+
+class LatencySketch:
+    """
+    Streaming quantile sketch: a fixed array of log-scale bucket counts
+    (the rollup histogram's buckets, so quantiles are within ~2.5%) plus
+    exact count, sum, min and max. Updates are O(1), memory is constant,
+    sketches merge by adding counts, and to_dict/from_dict round-trip
+    through JSON so sketches from several containers can be combined.
+    """
+
+    size = _histogram_index(SKETCH_MAX_MS) + 1
+
+    def __init__(self):
+        self.counts = [0] * self.size
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value_ms: float) -> None:
+        self.counts[min(_histogram_index(value_ms), self.size - 1)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                # A bucket midpoint can fall outside the values actually seen
+                return min(max(_histogram_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Optional[Dict[str, float]]:
+        if not self.count:
+            return None
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form; only non-empty buckets are listed."""
+        return {
+            "minMs": HISTOGRAM_MIN_MS,
+            "growth": HISTOGRAM_GROWTH,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(index): n for index, n in enumerate(self.counts) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        if data.get("minMs") != HISTOGRAM_MIN_MS or data.get("growth") != HISTOGRAM_GROWTH:
+            raise ValueError("sketch uses a different bucket layout")
+        sketch = cls()
+        for index, n in data.get("buckets", {}).items():
+            sketch.counts[min(int(index), cls.size - 1)] += int(n)
+        sketch.count = int(data.get("count", 0))
+        sketch.total = float(data.get("sum", 0.0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
+
+
+_sketch_lock = threading.Lock()
+# target name -> {"window": window number, "current": {phase: sketch}, "previous": {phase: sketch}}
+_latency_sketches: Dict[str, Dict[str, Any]] = {}
+
+
+def _record_sketch_samples(target: str, samples: List[Dict[str, Any]], now: Optional[float] = None) -> None:
+    """Add successful probe samples to this container's per-phase sketches."""
+    window = int((time.time() if now is None else now) // SKETCH_WINDOW_SECONDS)
+    with _sketch_lock:
+        state = _latency_sketches.setdefault(target, {"window": window, "current": {}, "previous": {}})
+        if state["window"] != window:
+            state["previous"] = state["current"] if state["window"] == window - 1 else {}
+            state["current"] = {}
+            state["window"] = window
+        for sample in samples:
+            if not sample.get("ok"):
+                continue
+            for phase in PROBE_PHASES:
+                if sample.get(phase) is not None:
+                    state["current"].setdefault(phase, LatencySketch()).add(sample[phase])
+
+
+def _recent_sketches(target: str) -> Dict[str, LatencySketch]:
+    """Current and previous window merged, per phase."""
+    with _sketch_lock:
+        state = _latency_sketches.get(target)
+        if state is None:
+            return {}
+        merged: Dict[str, LatencySketch] = {}
+        for window in (state["previous"], state["current"]):
+            for phase, sketch in window.items():
+                merged.setdefault(phase, LatencySketch()).merge(sketch)
+        return merged
+
+
+def _recent_latency(target: str, include_sketches: bool = False) -> Dict[str, Any]:
+    """p50/p90/p99 per phase over this container's recent probes of a target."""
+    sketches = _recent_sketches(target)
+    recent: Dict[str, Any] = {
+        "windowSeconds": SKETCH_WINDOW_SECONDS,
+        "phases": {phase: sketches[phase].summary() if phase in sketches else None for phase in PROBE_PHASES},
+    }
+    if include_sketches:
+        recent["sketches"] = {phase: sketch.to_dict() for phase, sketch in sketches.items()}
+    return recent
+
+
+class SQLiteProbeStore:
+    """
+    Rollup store backed by SQLite, for tests and local runs.
+    Use ":memory:" or a file path.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            " series TEXT NOT NULL, bucket INTEGER NOT NULL,"
+            " expires_at INTEGER NOT NULL, counters TEXT NOT NULL,"
+            " PRIMARY KEY (series, bucket))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS rollups_expiry ON rollups (expires_at)")
+
+    def add(self, series: str, bucket: int, delta: Dict[str, float], expires_at: int) -> None:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT counters FROM rollups WHERE series = ? AND bucket = ?", (series, bucket)
+            ).fetchone()
+            counters = _merge_rollups([json.loads(row[0]) if row else {}, delta])
+            self._db.execute(
+                "INSERT OR REPLACE INTO rollups (series, bucket, expires_at, counters) VALUES (?, ?, ?, ?)",
+                (series, bucket, expires_at, json.dumps(counters)),
+            )
+
+    def query(self, series: str, start: int, end: int) -> List[Tuple[int, Dict[str, float]]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT bucket, counters FROM rollups"
+                " WHERE series = ? AND bucket >= ? AND bucket <= ? AND expires_at > ?"
+                " ORDER BY bucket",
+                (series, start, end, int(time.time())),
+            ).fetchall()
+        return [(bucket, json.loads(counters)) for bucket, counters in rows]
+
+    def compact(self, now: int) -> int:
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM rollups WHERE expires_at <= ?", (now,)).rowcount
+
+
+class DynamoDBProbeStore:
+    """
+    Rollup store backed by a DynamoDB table with a string "series" hash key
+    and a numeric "bucket" range key. Deltas are applied with ADD so
+    concurrent containers never lose updates, and the "expiresAt" TTL
+    attribute lets DynamoDB compact expired rollups on its own.
+    """
+
+    def __init__(self, table_name: str, client=None):
+        self._table = table_name
+        self._client = client or _client("dynamodb")
+
+    def add(self, series: str, bucket: int, delta: Dict[str, float], expires_at: int) -> None:
+        names = {"#exp": "expiresAt"}
+        values: Dict[str, Any] = {":exp": {"N": str(expires_at)}}
+        adds = []
+        for i, (key, value) in enumerate(sorted(delta.items())):
+            names[f"#c{i}"] = key
+            values[f":c{i}"] = {"N": repr(value)}
+            adds.append(f"#c{i} :c{i}")
+        self._client.update_item(
+            TableName=self._table,
+            Key={"series": {"S": series}, "bucket": {"N": str(bucket)}},
+            UpdateExpression=f"SET #exp = :exp ADD {', '.join(adds)}",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+    def query(self, series: str, start: int, end: int) -> List[Tuple[int, Dict[str, float]]]:
+        now = int(time.time())
+        request: Dict[str, Any] = {
+            "TableName": self._table,
+            "KeyConditionExpression": "series = :s AND bucket BETWEEN :a AND :b",
+            "ExpressionAttributeValues": {
+                ":s": {"S": series},
+                ":a": {"N": str(start)},
+                ":b": {"N": str(end)},
+            },
+        }
+        rows: List[Tuple[int, Dict[str, float]]] = []
+        while True:
+            resp = self._client.query(**request)
+            for item in resp.get("Items", []):
+                # TTL deletion lags, so filter expired rollups here
+                if int(item.get("expiresAt", {}).get("N", "0")) <= now:
+                    continue
+                counters = {
+                    key: float(attr["N"])
+                    for key, attr in item.items()
+                    if key not in ("series", "bucket", "expiresAt") and "N" in attr
+                }
+                rows.append((int(item["bucket"]["N"]), counters))
+            if not resp.get("LastEvaluatedKey"):
+                return rows
+            request["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def compact(self, now: int) -> int:
+        # DynamoDB TTL on expiresAt removes expired rollups server-side
+        return 0
+
+
+_probe_store_instance: Optional[Any] = None
+
+
+def _probe_store():
+    """
+    Return the configured probe-result store, created once per container,
+    or None when PROBE_STORE is unset.
+    """
+    global _probe_store_instance
+    if _probe_store_instance is None and PROBE_STORE:
+        kind, _, target = PROBE_STORE.partition(":")
+        if kind == "dynamodb":
+            _probe_store_instance = DynamoDBProbeStore(target)
+        elif kind == "sqlite":
+            _probe_store_instance = SQLiteProbeStore(target)
         else:
-            status_code = 0
-            reason = "Invalid HTTP response"
+            raise ValueError(f"Unsupported PROBE_STORE backend: {kind}")
+    return _probe_store_instance
+
+
+def _rollup_series(target: str, resolution: str) -> str:
+    """Series key for one target at one rollup resolution."""
+    return f"{target}#{resolution}"
+
+
+def _record_probe_samples(store, target: str, samples: List[Dict[str, Any]], now: Optional[float] = None) -> None:
+    """
+    Fold one request's samples into the 1m, 1h and 1d rollups and drop
+    anything past retention.
+    """
+    if not samples:
+        return
+
+    now = time.time() if now is None else now
+    delta = _rollup_delta(samples)
+    for resolution, (bucket_seconds, retention) in ROLLUP_RESOLUTIONS.items():
+        bucket = int(now // bucket_seconds) * bucket_seconds
+        store.add(_rollup_series(target, resolution), bucket, delta, bucket + bucket_seconds + retention)
+    store.compact(int(now))
+
+
+def _store_probe_outcomes(targets: List[Dict[str, Any]], outcome: Dict[str, Any], deadline: float) -> bool:
+    """
+    Record each target's samples in the rollup store, targets in parallel
+    under the invocation deadline and behind the "rollups" circuit breaker.
+    Returns whether every target's samples were stored.
+    """
+    store = _probe_store()
+    if store is None:
+        return False
+
+    tasks: Dict[str, Callable[[], Any]] = {
+        target["name"]: (
+            lambda t=target, samples=outcome[f"target:{i}"]: _guarded(
+                "rollups", lambda: _record_probe_samples(store, t["name"], samples)
+            )
+        )
+        for i, target in enumerate(targets)
+        if isinstance(outcome[f"target:{i}"], list)
+    }
+    with _timed("rollups"):
+        results = _fan_out(tasks, deadline)
+    return bool(tasks) and all(result is None for result in results.values())
+
+
+def _rollup_resolution_for(window_minutes: int) -> str:
+    """Coarsest rollup that still gives useful detail for a window."""
+    if window_minutes <= 6 * 60:
+        return "1m"
+    if window_minutes <= 14 * 24 * 60:
+        return "1h"
+    return "1d"
+
+
+def _query_probe_history(
+    store,
+    target: str,
+    window_minutes: int,
+    phase: str,
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Answer trend questions from rollups alone: per-bucket summaries for a
+    phase plus one summary merged across the whole window.
+    """
+    now = time.time() if now is None else now
+    resolution = _rollup_resolution_for(window_minutes)
+    bucket_seconds = ROLLUP_RESOLUTIONS[resolution][0]
+    start = int((now - window_minutes * 60) // bucket_seconds) * bucket_seconds
+
+    rows = store.query(_rollup_series(target, resolution), start, int(now))
+    buckets = [(bucket, _rollup_summary(counters, phase)) for bucket, counters in rows]
+    buckets = [(bucket, summary) for bucket, summary in buckets if summary]
+    merged = _merge_rollups([counters for _, counters in rows])
+
+    return {
+        "resolution": resolution,
+        "phase": phase,
+        "windowMinutes": window_minutes,
+        "summary": _rollup_summary(merged, phase),
+        "probes": int(merged.get("probes", 0)),
+        "failures": int(merged.get("failures", 0)),
+        "timestamps": [bucket for bucket, _ in buckets],
+        "p50": [summary["p50"] for _, summary in buckets],
+        "p90": [summary["p90"] for _, summary in buckets],
+    }
+
+
+def _build_latency_history_response(query: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Latency trend for ?target= and ?phase= over ?windowMinutes=, read from stored rollups."""
+    query = query or {}
+    window = _bounded_int(query, "windowMinutes", 24 * 60, 1, MAX_LATENCY_HISTORY_MINUTES)
+    phase = query.get("phase", "ttfbMs")
+    base = {"version": API_VERSION, "generatedAt": _iso_now()}
 
-        peer_ip = ssl_sock.getpeername()[0]
-        ssl_sock.close()
+    try:
+        target = query.get("target") or _probe_targets()[0]["name"]
+    except (TypeError, ValueError) as exc:
+        return {**base, **_permanent_error(f"Invalid PROBE_TARGETS: {exc}")}
+    base["target"] = target
 
-        return tls_ms, ttfb_ms, status_code, reason, peer_ip
+    if phase not in PROBE_PHASES:
+        return {**base, **_permanent_error(f"Unknown phase {phase!r}; expected one of {', '.join(PROBE_PHASES)}")}
 
+    try:
+        store = _probe_store()
+        if store is None:
+            return {**base, **_permanent_error("PROBE_STORE environment variable is not set")}
+        history = _query_probe_history(store, target, window, phase)
     except Exception as exc:  # noqa: BLE001
-        # Fallback synthetic values that clearly show a measurement failure
-        return 0.0, 0.0, 503, f"Measurement error: {exc}", ""
+        return {**base, "error": f"Error reading probe history: {exc}"}
+
+    return {**base, **history}
 
 
 def _region_name_from_code(region_code: str) -> str:
@@ -183,6 +1474,18 @@ def _metric_query(
     }
 
 
+def _expression_query(query_id: str, expression: str, label: str, period: int = 300) -> Dict[str, Any]:
+    """
+    Build a metric math MetricDataQuery. The expression refers to other
+    queries of the same section by their (un-namespaced) ids.
+    """
+    return {"Id": query_id, "Expression": expression, "Label": label, "Period": period}
+
+
+# Extended statistics reported as tail-latency percentiles
+LATENCY_PERCENTILES = ("p50", "p90", "p99")
+
+
 def _latest_value(result: Dict[str, Any]) -> Optional[float]:
     """
     Extract the most recent value from a MetricDataResults entry.
@@ -204,72 +1507,182 @@ def _fetch_metric_data(queries: List[Dict[str, Any]], minutes: int = METRIC_WIND
     Fetch a bundle of metric queries from CloudWatch with a short time window.
     Returns a tuple of (result_map, error_message, raw_results)
     """
-    if not queries:
-        return {}, None, []
+    return _fetch_metric_batch({"all": queries}, minutes=minutes).get("all", ({}, None, []))
 
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(minutes=minutes)
 
-    try:
-        resp = cloudwatch.get_metric_data(
-            MetricDataQueries=queries,
-            StartTime=start_time,
-            EndTime=end_time,
-            ScanBy="TimestampDescending",
-            MaxDatapoints=500,
-        )
-    except Exception as exc:  # noqa: BLE001
-        return {}, f"Error calling CloudWatch GetMetricData: {exc}", []
+def _section_query_id(section: str, query_id: str) -> str:
+    """Namespace a query id by section so batched ids never collide."""
+    return f"{section}_{query_id}"
 
-    results = resp.get("MetricDataResults", []) or []
-    values = {r.get("Id"): _latest_value(r) for r in results}
-    return values, None, results
 
+# Query ids inside metric math expressions (function names are upper case)
+_EXPRESSION_ID_RE = re.compile(r"\b[a-z][A-Za-z0-9_]*\b")
 
-def _build_cloudfront_metrics() -> Dict[str, Any]:
-    """Return CloudFront cache/error/latency metrics for the distribution."""
-    if not CF_DISTRIBUTION_ID:
-        return {"error": "CF_DISTRIBUTION_ID environment variable is not set"}
 
+def _namespace_expression(section: str, expression: str, query_ids: set) -> str:
+    """Rewrite the query ids an expression refers to into their batched ids."""
+    return _EXPRESSION_ID_RE.sub(
+        lambda m: _section_query_id(section, m.group()) if m.group() in query_ids else m.group(),
+        expression,
+    )
+
+
+def _fetch_metric_batch(
+    sections: Dict[str, List[Dict[str, Any]]],
+    minutes: int = METRIC_WINDOW_MINUTES,
+    max_datapoints: int = 500,
+    end_time: Optional[datetime] = None,
+) -> Dict[str, Tuple[Dict[str, Optional[float]], Optional[str], List[Dict[str, Any]]]]:
+    """
+    Plan every section's metric queries into a single GetMetricData batch
+    covering `minutes` up to `end_time` (default now).
+
+    Query ids are namespaced per section, NextToken pages are followed and
+    merged, and the results are split back out so each section receives the
+    same (result_map, error_message, raw_results) tuple as _fetch_metric_data.
+    A per-query failure status only marks the section that owns the query.
+    """
+    batch: List[Dict[str, Any]] = []
+    owners: Dict[str, Tuple[str, str]] = {}
+    for section, queries in sections.items():
+        query_ids = {query["Id"] for query in queries}
+        for query in queries:
+            batch_id = _section_query_id(section, query["Id"])
+            owners[batch_id] = (section, query["Id"])
+            batched = dict(query, Id=batch_id)
+            if "Expression" in query:
+                batched["Expression"] = _namespace_expression(section, query["Expression"], query_ids)
+            batch.append(batched)
+
+    if not batch:
+        return {section: ({}, None, []) for section in sections}
+
+    end_time = end_time or datetime.now(timezone.utc)
+    start_time = end_time - timedelta(minutes=minutes)
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    request: Dict[str, Any] = {
+        "MetricDataQueries": batch,
+        "StartTime": start_time,
+        "EndTime": end_time,
+        "ScanBy": "TimestampDescending",
+        "MaxDatapoints": max_datapoints,
+    }
+
+    try:
+        while True:
+            with _timed("cloudwatch"):
+                resp = _guarded("cloudwatch", lambda: _cloudwatch().get_metric_data(**request))
+            for result in resp.get("MetricDataResults", []) or []:
+                entry = merged.setdefault(
+                    result.get("Id"),
+                    {"Id": result.get("Id"), "Label": result.get("Label"), "Timestamps": [], "Values": []},
+                )
+                entry["Timestamps"].extend(result.get("Timestamps", []) or [])
+                entry["Values"].extend(result.get("Values", []) or [])
+                entry["StatusCode"] = result.get("StatusCode", "Complete")
+                if result.get("Messages"):
+                    entry["Messages"] = result["Messages"]
+
+            next_token = resp.get("NextToken")
+            if not next_token:
+                break
+            request["NextToken"] = next_token
+    except Exception as exc:  # noqa: BLE001
+        err = f"Error calling CloudWatch GetMetricData: {exc}"
+        return {section: ({}, err, []) for section in sections}
+
+    split: Dict[str, Tuple[Dict[str, Optional[float]], Optional[str], List[Dict[str, Any]]]] = {}
+    for section in sections:
+        values: Dict[str, Optional[float]] = {}
+        raw_results: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for batch_id, (owner, query_id) in owners.items():
+            if owner != section:
+                continue
+            entry = merged.get(batch_id)
+            if entry is None:
+                values[query_id] = None
+                continue
+            result = dict(entry, Id=query_id)
+            raw_results.append(result)
+            values[query_id] = _latest_value(result)
+            if result.get("StatusCode") in ("InternalError", "Forbidden"):
+                detail = "; ".join(m.get("Value", "") for m in result.get("Messages", []) or [])
+                errors.append(f"{query_id}: {result['StatusCode']}" + (f" ({detail})" if detail else ""))
+
+        err = f"CloudWatch GetMetricData query failed: {', '.join(errors)}" if errors else None
+        split[section] = (values, err, raw_results)
+
+    return split
+
+
+def _cloudfront_metric_queries(period: int = 300) -> List[Dict[str, Any]]:
+    """MetricDataQueries for the CloudFront section."""
     dims = [
         {"Name": "DistributionId", "Value": CF_DISTRIBUTION_ID},
         {"Name": "Region", "Value": "Global"},
     ]
 
-    queries = [
-        _metric_query("cf4xx", "AWS/CloudFront", "4xxErrorRate", dims, "Average"),
-        _metric_query("cf5xx", "AWS/CloudFront", "5xxErrorRate", dims, "Average"),
+    return [
+        _metric_query("cf4xx", "AWS/CloudFront", "4xxErrorRate", dims, "Average", period),
+        _metric_query("cf5xx", "AWS/CloudFront", "5xxErrorRate", dims, "Average", period),
+        # OriginLatency needs CloudFront's additional metrics subscription
+        *[
+            _metric_query(f"cforigin{pct}", "AWS/CloudFront", "OriginLatency", dims, pct, period)
+            for pct in LATENCY_PERCENTILES
+        ],
+        _expression_query("cfsuccess", "100 - (cf4xx + cf5xx)", "Success rate", period),
     ]
 
-    values, err, _ = _fetch_metric_data(queries)
+
+def _build_cloudfront_metrics(fetched=None) -> Dict[str, Any]:
+    """
+    Return CloudFront cache/error/latency metrics for the distribution.
+
+    `fetched` is this section's slice of a batched fetch; when omitted the
+    section queries CloudWatch on its own.
+    """
+    if not CF_DISTRIBUTION_ID:
+        return _permanent_error("CF_DISTRIBUTION_ID environment variable is not set")
+
+    if fetched is None:
+        fetched = _fetch_metric_data(_cloudfront_metric_queries())
+
+    values, err, _ = fetched
     if err:
         return {"error": err}
 
-    # CloudFront only exposes error rates; derive a success (2xx) rate from 4xx/5xx if present.
-    cf4 = values.get("cf4xx")
-    cf5 = values.get("cf5xx")
-    success_rate = None
-    if cf4 is not None and cf5 is not None:
-        success_rate = max(0.0, 100.0 - (cf4 + cf5))
-
+    # CloudFront only exposes error rates; the success rate is metric math over 4xx/5xx.
     return {
         "distributionId": CF_DISTRIBUTION_ID,
         "windowMinutes": METRIC_WINDOW_MINUTES,
         "error4xxRate": values.get("cf4xx"),
         "error5xxRate": values.get("cf5xx"),
-        "success2xxRate": success_rate,
+        "success2xxRate": values.get("cfsuccess"),
+        "originLatencyMs": {pct: values.get(f"cforigin{pct}") for pct in LATENCY_PERCENTILES},
     }
 
 
+def _waf_metric_queries(period: int = 300) -> List[Dict[str, Any]]:
+    """
+    MetricDataQueries for the WAF section.
 
-
-
-def _build_waf_metrics(waf_status: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Return WAF allowed/blocked counts if WAF metrics are configured.
-    
     Note: WAF metrics only have WebACL and Rule dimensions (no Region dimension).
     """
+    dims = [
+        {"Name": "Rule", "Value": "ALL"},
+        {"Name": "WebACL", "Value": WAF_WEB_ACL_METRIC_NAME},
+    ]
+
+    return [
+        _metric_query("wafallow", "AWS/WAFV2", "AllowedRequests", dims, "Sum", period),
+        _metric_query("wafblock", "AWS/WAFV2", "BlockedRequests", dims, "Sum", period),
+    ]
+
+
+def _build_waf_metrics(waf_status: Dict[str, Any], fetched=None) -> Dict[str, Any]:
+    """Return WAF allowed/blocked counts if WAF metrics are configured."""
     if not WAF_WEB_ACL_METRIC_NAME:
         return {
             "windowMinutes": METRIC_WINDOW_MINUTES,
@@ -277,20 +1690,12 @@ def _build_waf_metrics(waf_status: Dict[str, Any]) -> Dict[str, Any]:
             "message": "WAF metrics not configured (WAF_WEB_ACL_METRIC_NAME not set)",
         }
 
-    # Query with only WebACL and Rule dimensions (no Region)
-    dims = [
-        {"Name": "Rule", "Value": "ALL"},
-        {"Name": "WebACL", "Value": WAF_WEB_ACL_METRIC_NAME},
-    ]
-    
-    queries = [
-        _metric_query("wafallow", "AWS/WAFV2", "AllowedRequests", dims, "Sum", 300),
-        _metric_query("wafblock", "AWS/WAFV2", "BlockedRequests", dims, "Sum", 300),
-    ]
-    
-    # Use 60 minute window to capture sparse data
-    values, err, raw_results = _fetch_metric_data(queries, minutes=60)
-    
+    if fetched is None:
+        # Use 60 minute window to capture sparse data
+        fetched = _fetch_metric_data(_waf_metric_queries(), minutes=60)
+
+    values, err, _ = fetched
+
     if err:
         return {
             "error": err,
@@ -309,22 +1714,39 @@ def _build_waf_metrics(waf_status: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _build_lambda_metrics(function_name: Optional[str]) -> Dict[str, Any]:
-    """Return recent metrics for the status API Lambda itself."""
-    fn = function_name or os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "")
-    if not fn:
-        return {"error": "Function name unavailable for Lambda metrics"}
+def _lambda_metrics_function_name(function_name: Optional[str]) -> str:
+    """Resolve which function the Lambda metrics section reports on."""
+    return function_name or os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "")
+
 
+def _lambda_metric_queries(fn: str, period: int = 300) -> List[Dict[str, Any]]:
+    """MetricDataQueries for the Lambda section."""
     dims = [{"Name": "FunctionName", "Value": fn}]
 
-    queries = [
-        _metric_query("lambdainv", "AWS/Lambda", "Invocations", dims, "Sum"),
-        _metric_query("lambdaerr", "AWS/Lambda", "Errors", dims, "Sum"),
-        _metric_query("lambdams", "AWS/Lambda", "Duration", dims, "Average"),
-        _metric_query("lambdatro", "AWS/Lambda", "Throttles", dims, "Sum"),
+    return [
+        _metric_query("lambdainv", "AWS/Lambda", "Invocations", dims, "Sum", period),
+        _metric_query("lambdaerr", "AWS/Lambda", "Errors", dims, "Sum", period),
+        _metric_query("lambdams", "AWS/Lambda", "Duration", dims, "Average", period),
+        _metric_query("lambdatro", "AWS/Lambda", "Throttles", dims, "Sum", period),
+        *[
+            _metric_query(f"lambdams{pct}", "AWS/Lambda", "Duration", dims, pct, period)
+            for pct in LATENCY_PERCENTILES
+        ],
+        # Periods without invocations divide by zero and drop out of the series
+        _expression_query("lambdaok", "100 * (lambdainv - lambdaerr) / lambdainv", "Success rate", period),
     ]
 
-    values, err, _ = _fetch_metric_data(queries)
+
+def _build_lambda_metrics(function_name: Optional[str], fetched=None) -> Dict[str, Any]:
+    """Return recent metrics for the status API Lambda itself."""
+    fn = _lambda_metrics_function_name(function_name)
+    if not fn:
+        return _permanent_error("Function name unavailable for Lambda metrics")
+
+    if fetched is None:
+        fetched = _fetch_metric_data(_lambda_metric_queries(fn))
+
+    values, err, _ = fetched
     if err:
         return {"error": err, "functionName": fn}
 
@@ -334,124 +1756,1285 @@ def _build_lambda_metrics(function_name: Optional[str]) -> Dict[str, Any]:
         "invocations": values.get("lambdainv"),
         "errors": values.get("lambdaerr"),
         "avgDurationMs": values.get("lambdams"),
+        "durationMs": {pct: values.get(f"lambdams{pct}") for pct in LATENCY_PERCENTILES},
+        "successRate": values.get("lambdaok"),
         "throttles": values.get("lambdatro"),
     }
 
 
-def _build_metrics_response(context) -> Dict[str, Any]:
+def _plan_metric_sections(function_name: str, period: int = 300) -> Dict[str, List[Dict[str, Any]]]:
+    """Queries for every configured metrics section, keyed by section name."""
+    plan: Dict[str, List[Dict[str, Any]]] = {}
+    if CF_DISTRIBUTION_ID:
+        plan["cloudfront"] = _cloudfront_metric_queries(period)
+    if WAF_WEB_ACL_METRIC_NAME:
+        plan["waf"] = _waf_metric_queries(period)
+    if function_name:
+        plan["lambda"] = _lambda_metric_queries(function_name, period)
+    return plan
+
+
+def _run_metric_plan(
+    plan: Dict[str, List[Dict[str, Any]]],
+    context,
+    minutes: int = METRIC_WINDOW_MINUTES,
+    max_datapoints: int = 500,
+    end_time: Optional[datetime] = None,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Fetch a metric plan as one batch under the invocation deadline.
+    Returns (per-section results, failure section if the batch timed out or raised).
+    """
+    if not plan:
+        return {}, None
+
+    outcome = _fan_out(
+        {
+            "metrics": lambda: _fetch_metric_batch(
+                plan, minutes=minutes, max_datapoints=max_datapoints, end_time=end_time
+            )
+        },
+        _deadline_from_context(context),
+    )["metrics"]
+    if "timedOut" in outcome or "error" in outcome:
+        return {}, outcome
+    return outcome, None
+
+
+def _build_metrics_response(
+    context,
+    waf_status: Optional[Dict[str, Any]] = None,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
     Bundle CloudFront, WAF, and Lambda metrics to give a quick
     performance/security/reliability snapshot.
+
+    All configured sections are fetched in one GetMetricData round trip.
+    `only` limits the body (and the queries) to the named sections, and a
+    precomputed `waf_status` can be shared with other builders.
     """
-    waf_status = get_waf_status()
+    if waf_status is None:
+        waf_status = get_waf_status()
+    function_name = _lambda_metrics_function_name(
+        STATUS_API_FUNCTION_NAME or getattr(context, "function_name", None)
+    )
+
+    plan = _plan_metric_sections(function_name)
+    if only is not None:
+        plan = {name: queries for name, queries in plan.items() if name in only}
+    fetched, failed = _run_metric_plan(plan, context)
+
+    def section(name: str, build: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+        # A batch that timed out or raised is reported by every planned section.
+        if failed is not None and name in plan:
+            return dict(failed)
+        return build(fetched.get(name))
+
+    builders: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+        "cloudfront": _build_cloudfront_metrics,
+        "waf": lambda f: _build_waf_metrics(waf_status, f),
+        "lambda": lambda f: _build_lambda_metrics(function_name, f),
+    }
+
+    body: Dict[str, Any] = {"version": API_VERSION, "generatedAt": _iso_now()}
+    for name, build in builders.items():
+        if only is None or name in only:
+            body[name] = section(name, build)
+    body["windowMinutes"] = METRIC_WINDOW_MINUTES
+    body["dependencies"] = _dependency_states("cloudwatch")
+    return body
+
+
+# History field names for each section's query ids
+HISTORY_FIELDS: Dict[str, Dict[str, str]] = {
+    "cloudfront": {
+        "cf4xx": "error4xxRate",
+        "cf5xx": "error5xxRate",
+        "cfsuccess": "success2xxRate",
+        "cforiginp50": "originLatencyP50Ms",
+        "cforiginp90": "originLatencyP90Ms",
+        "cforiginp99": "originLatencyP99Ms",
+    },
+    "waf": {"wafallow": "allowedRequests", "wafblock": "blockedRequests"},
+    "lambda": {
+        "lambdainv": "invocations",
+        "lambdaerr": "errors",
+        "lambdams": "avgDurationMs",
+        "lambdamsp50": "durationP50Ms",
+        "lambdamsp90": "durationP90Ms",
+        "lambdamsp99": "durationP99Ms",
+        "lambdaok": "successRate",
+        "lambdatro": "throttles",
+    },
+}
+
+
+def _downsample_lttb(points: List[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+    """
+    Largest-Triangle-Three-Buckets downsampling of time-ordered (x, y) pairs.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with its neighbours, so peaks and
+    dips survive the reduction.
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, len(points))
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            bx, by = points[j]
+            area = abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def _history_series(result: Dict[str, Any], points: int) -> Dict[str, Any]:
+    """Turn one MetricDataResults entry into downsampled columnar arrays."""
+    paired = sorted(
+        (ts.timestamp(), float(v))
+        for ts, v in zip(result.get("Timestamps", []) or [], result.get("Values", []) or [])
+    )
+    sampled = _downsample_lttb(paired, points)
+    return {
+        "timestamps": [int(ts) for ts, _ in sampled],
+        "values": [v for _, v in sampled],
+        "rawPoints": len(paired),
+    }
+
+
+def _build_metrics_history_response(query: Optional[Dict[str, str]] = None, context=None) -> Dict[str, Any]:
+    """
+    Full time series for every CloudFront, WAF and Lambda metric.
+
+    One batched GetMetricData call covers ?windowMinutes= (up to 24h) at
+    1-minute resolution; each series is downsampled with LTTB to ?points=
+    and returned as parallel epoch-second timestamp and value arrays.
+    """
+    query = query or {}
+    window = _bounded_int(query, "windowMinutes", DEFAULT_HISTORY_WINDOW_MINUTES, 5, MAX_HISTORY_WINDOW_MINUTES)
+    points = _bounded_int(query, "points", DEFAULT_HISTORY_POINTS, 3, MAX_HISTORY_POINTS)
+    function_name = _lambda_metrics_function_name(
+        STATUS_API_FUNCTION_NAME or getattr(context, "function_name", None)
+    )
+
+    plan = _plan_metric_sections(function_name, HISTORY_PERIOD_SECONDS)
+    raw_points = sum(len(queries) for queries in plan.values()) * (window * 60 // HISTORY_PERIOD_SECONDS)
+    fetched, failed = _run_metric_plan(plan, context, minutes=window, max_datapoints=max(500, raw_points))
+
+    unconfigured = {
+        "cloudfront": "CF_DISTRIBUTION_ID environment variable is not set",
+        "waf": "WAF metrics not configured (WAF_WEB_ACL_METRIC_NAME not set)",
+        "lambda": "Function name unavailable for Lambda metrics",
+    }
+    series: Dict[str, Any] = {}
+    for section, fields in HISTORY_FIELDS.items():
+        if section not in plan:
+            series[section] = _permanent_error(unconfigured[section])
+            continue
+        if failed is not None:
+            series[section] = dict(failed)
+            continue
+        _, err, raw_results = fetched[section]
+        if err:
+            series[section] = {"error": err}
+            continue
+        by_id = {r.get("Id"): r for r in raw_results}
+        series[section] = {
+            field: _history_series(by_id.get(query_id, {}), points)
+            for query_id, field in fields.items()
+        }
 
     return {
         "version": API_VERSION,
         "generatedAt": _iso_now(),
-        "cloudfront": _build_cloudfront_metrics(),
-        "waf": _build_waf_metrics(waf_status),
-        "lambda": _build_lambda_metrics(STATUS_API_FUNCTION_NAME or getattr(context, "function_name", None)),
-        "windowMinutes": METRIC_WINDOW_MINUTES,
+        "windowMinutes": window,
+        "periodSeconds": HISTORY_PERIOD_SECONDS,
+        "points": points,
+        "series": series,
+        "dependencies": _dependency_states("cloudwatch"),
+    }
+
+
+def _slo_objectives(function_name: str) -> List[Tuple[str, float, str]]:
+    """(name, objective percent, description) for each SLO the configured metrics support."""
+    slos: List[Tuple[str, float, str]] = []
+    if CF_DISTRIBUTION_ID:
+        slos.append(("siteAvailability", SLO_AVAILABILITY_TARGET, "CloudFront requests not answered with a 5xx"))
+    if ROUTE53_HEALTH_CHECK_ID:
+        slos.append(("siteUptime", SLO_AVAILABILITY_TARGET, "Route 53 checker observations reporting healthy"))
+    if function_name:
+        slos.append(("apiAvailability", SLO_AVAILABILITY_TARGET, "Status API invocations without errors"))
+        slos.append((
+            "apiLatency",
+            SLO_LATENCY_TARGET,
+            f"Status API invocations finishing within {SLO_LATENCY_THRESHOLD_MS}ms",
+        ))
+    return slos
+
+
+def _slo_window_queries(
+    window: str, seconds: int, slos: List[Tuple[str, float, str]], function_name: str
+) -> List[Dict[str, Any]]:
+    """
+    MetricDataQueries for one burn-rate window. Every metric uses the window
+    as its period, so the newest datapoint covers the whole window; metric
+    math turns it into a bad-event percentage (<slo>bad_<window>) and a burn
+    rate against the error budget (<slo>burn_<window>).
+    """
+    cf_dims = [
+        {"Name": "DistributionId", "Value": CF_DISTRIBUTION_ID},
+        {"Name": "Region", "Value": "Global"},
+    ]
+    fn_dims = [{"Name": "FunctionName", "Value": function_name}]
+    metrics = {
+        "siteAvailability": (
+            [_metric_query(f"cf5xx_{window}", "AWS/CloudFront", "5xxErrorRate", cf_dims, "Average", seconds)],
+            f"cf5xx_{window}",
+        ),
+        "siteUptime": (
+            [_metric_query(
+                f"hc_{window}", "AWS/Route53", "HealthCheckStatus",
+                [{"Name": "HealthCheckId", "Value": ROUTE53_HEALTH_CHECK_ID}], "Average", seconds,
+            )],
+            f"100 * (1 - hc_{window})",
+        ),
+        "apiAvailability": (
+            [
+                _metric_query(f"inv_{window}", "AWS/Lambda", "Invocations", fn_dims, "Sum", seconds),
+                _metric_query(f"err_{window}", "AWS/Lambda", "Errors", fn_dims, "Sum", seconds),
+            ],
+            f"100 * err_{window} / inv_{window}",
+        ),
+        "apiLatency": (
+            [_metric_query(
+                f"fast_{window}", "AWS/Lambda", "Duration", fn_dims, f"PR(:{SLO_LATENCY_THRESHOLD_MS})", seconds,
+            )],
+            f"100 - fast_{window}",
+        ),
+    }
+
+    queries: List[Dict[str, Any]] = []
+    for name, objective, _ in slos:
+        inputs, bad = metrics[name]
+        budget = round(100.0 - objective, 6)
+        queries.extend(inputs)
+        queries.append(_expression_query(f"{name}bad_{window}", bad, f"{name} bad % ({window})", seconds))
+        queries.append(_expression_query(
+            f"{name}burn_{window}", f"{name}bad_{window} / {budget:g}", f"{name} burn rate ({window})", seconds
+        ))
+    return queries
+
+
+# Per-window SLO results: window name -> (monotonic expiry, {slo: (bad %, burn rate)}, fetchedAt)
+_slo_lock = threading.Lock()
+_slo_windows: Dict[str, Tuple[float, Dict[str, Tuple[Optional[float], Optional[float]]], str]] = {}
+
+
+def _fetch_slo_windows(slos: List[Tuple[str, float, str]], function_name: str, context) -> Optional[Dict[str, Any]]:
+    """
+    Refresh every window whose cache has run out with one GetMetricData
+    request spanning the longest of them. Returns the failure if the batch
+    failed; windows then keep their previous (expired) results.
+    """
+    now = time.monotonic()
+    with _slo_lock:
+        due = [(name, seconds, ttl) for name, seconds, ttl in SLO_WINDOWS
+               if name not in _slo_windows or _slo_windows[name][0] <= now]
+    if not due:
+        return None
+
+    queries = {name: _slo_window_queries(name, seconds, slos, function_name) for name, seconds, _ in due}
+    longest = max(seconds for _, seconds, _ in due)
+    datapoints = sum(len(queries[name]) * (longest // seconds) for name, seconds, _ in due)
+    # Every window length is a whole number of minutes and divides the span,
+    # so each window's newest bucket ends exactly at end_time
+    end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    end_time -= timedelta(seconds=SLO_INGESTION_LAG_SECONDS)
+    fetched, failed = _run_metric_plan(
+        {"slo": [q for window in queries.values() for q in window]},
+        context,
+        minutes=longest // 60,
+        max_datapoints=max(500, datapoints),
+        end_time=end_time,
+    )
+    if failed is None and fetched["slo"][1]:
+        failed = {"error": fetched["slo"][1]}
+    if failed is not None:
+        return failed
+
+    values = fetched["slo"][0]
+    fetched_at = _iso_now()
+    with _slo_lock:
+        for name, _, ttl in due:
+            _slo_windows[name] = (
+                now + ttl,
+                {slo: (values.get(f"{slo}bad_{name}"), values.get(f"{slo}burn_{name}")) for slo, _, _ in slos},
+                fetched_at,
+            )
+    return None
+
+
+def _build_slo_response(context=None) -> Dict[str, Any]:
+    """
+    Error-budget burn rates for each SLO over the 5m, 1h, 6h and 3d windows.
+
+    Each SLO reports its burn rate per window (1.0 spends the budget exactly
+    as fast as the objective allows) and which multi-window alerts fire: an
+    alert fires only when both its long and short window burn faster than
+    its threshold, so it is quick to trigger and quick to reset.
+    """
+    function_name = _lambda_metrics_function_name(
+        STATUS_API_FUNCTION_NAME or getattr(context, "function_name", None)
+    )
+    slos = _slo_objectives(function_name)
+    body: Dict[str, Any] = {"version": API_VERSION, "generatedAt": _iso_now()}
+    if not slos:
+        return dict(body, **_permanent_error(
+            "No SLOs configured (CF_DISTRIBUTION_ID, ROUTE53_HEALTH_CHECK_ID and function name unset)"
+        ))
+
+    failed = _fetch_slo_windows(slos, function_name, context)
+    with _slo_lock:
+        windows = dict(_slo_windows)
+    if failed is not None:
+        if not windows:
+            return dict(body, **failed)
+        body["error"] = failed.get("error") or "CloudWatch GetMetricData timed out"
+
+    objectives: Dict[str, Any] = {}
+    for name, objective, description in slos:
+        burn = {window: windows[window][1][name][1] if window in windows else None for window, _, _ in SLO_WINDOWS}
+        alerts = []
+        for severity, long_window, short_window, threshold in SLO_ALERTS:
+            rates = (burn.get(long_window), burn.get(short_window))
+            alerts.append({
+                "severity": severity,
+                "windows": [long_window, short_window],
+                "threshold": threshold,
+                "firing": all(rate is not None and rate > threshold for rate in rates),
+            })
+        firing = [alert["severity"] for alert in alerts if alert["firing"]]
+        long_burn = burn.get(SLO_WINDOWS[-1][0])
+        objectives[name] = {
+            "objective": objective,
+            "description": description,
+            "errorBudgetPercent": round(100.0 - objective, 6),
+            "badPercent": {
+                window: windows[window][1][name][0] if window in windows else None for window, _, _ in SLO_WINDOWS
+            },
+            "burnRate": burn,
+            # Share of the longest window's budget still unspent
+            "budgetRemaining": None if long_burn is None else max(0.0, 1.0 - long_burn),
+            "alerts": alerts,
+            "status": firing[0] if firing else "ok",
+        }
+
+    body["objectives"] = objectives
+    body["windows"] = {
+        window: {"seconds": seconds, "fetchedAt": windows[window][2] if window in windows else None}
+        for window, seconds, _ in SLO_WINDOWS
     }
+    body["dependencies"] = _dependency_states("cloudwatch")
+    return body
 
 
-def _build_latency_response() -> Dict[str, Any]:
+def _probe_targets() -> List[Dict[str, Any]]:
+    """
+    Probe targets from PROBE_TARGETS, or the default site target.
+    The first target is the primary one reported in the top-level fields.
+    """
+    raw = os.environ.get("PROBE_TARGETS", "")
+    if not raw:
+        entries: List[Dict[str, Any]] = [{"host": HOSTNAME, "port": PORT, "path": REQUEST_PATH}]
+    else:
+        entries = json.loads(raw)
+        if not isinstance(entries, list) or not entries:
+            raise ValueError("PROBE_TARGETS must be a non-empty JSON list")
+
+    targets = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("host"):
+            raise ValueError(f"Probe target needs a host: {entry!r}")
+        path = entry.get("path", "/")
+        targets.append({
+            "name": entry.get("name") or (entry["host"] if path == "/" else f"{entry['host']}{path}"),
+            "host": entry["host"],
+            "port": int(entry.get("port", 443)),
+            "path": path,
+            "expectStatus": int(entry.get("expectStatus", 200)),
+            "timeoutSeconds": float(entry.get("timeoutSeconds", PROBE_TIMEOUT_SECONDS)),
+        })
+    return targets
+
+
+def _sample_target(target: Dict[str, Any], requested: int, deadline: float) -> List[Dict[str, Any]]:
+    """Sequential samples against one target, each bounded by its own timeout and the deadline."""
+    samples: List[Dict[str, Any]] = []
+    for _ in range(requested):
+        remaining = deadline - time.monotonic()
+        if samples and remaining <= 0:
+            break
+        samples.append(_measure_site(
+            host=target["host"],
+            port=target["port"],
+            path=target["path"],
+            timeout=max(0.1, min(target["timeoutSeconds"], remaining)),
+        ))
+    return samples
+
+
+def _summarize_cdn(ok_samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    CloudFront view of a target's samples: cache results and edge POPs seen,
+    body size and throughput, and median TTFB split by cache result so a
+    slow origin miss shows apart from a slow edge.
+    """
+    results: Dict[str, int] = {}
+    ttfb_by_cache: Dict[str, List[float]] = {}
+    pops: List[str] = []
+    for sample in ok_samples:
+        cache = sample.get("cache")
+        if cache:
+            results[cache] = results.get(cache, 0) + 1
+            if sample.get("ttfbMs") is not None:
+                ttfb_by_cache.setdefault(cache, []).append(sample["ttfbMs"])
+        if sample.get("edgePop") and sample["edgePop"] not in pops:
+            pops.append(sample["edgePop"])
+
+    throughput = sorted(s["bytesPerSecond"] for s in ok_samples if s.get("bytesPerSecond") is not None)
+    latest = ok_samples[-1] if ok_samples else {}
+    return {
+        "cache": latest.get("cache"),
+        "cacheResults": results,
+        "edgePops": pops,
+        "responseBytes": latest.get("responseBytes"),
+        "bodyComplete": latest.get("bodyComplete"),
+        "bytesPerSecond": _percentile(throughput, 50) if throughput else None,
+        "ttfbMsByCache": {cache: _percentile(sorted(values), 50) for cache, values in ttfb_by_cache.items()},
+    }
+
+
+def _summarize_target(target: Dict[str, Any], samples: Any) -> Dict[str, Any]:
+    """Per-phase summary and status for one target's samples (or its fan-out failure)."""
+    failure = samples if isinstance(samples, dict) else {}
+    samples = samples if isinstance(samples, list) else []
+
+    ok_samples = [sample for sample in samples if sample["ok"]]
+    if ok_samples:
+        latest = ok_samples[-1]
+    elif samples:
+        latest = samples[-1]
+    else:
+        latest = {"statusCode": 503, "statusReason": failure.get("error", ""), "peerIp": ""}
+
+    return {
+        "name": target["name"],
+        "host": target["host"],
+        "port": target["port"],
+        "path": target["path"],
+        "expectStatus": target["expectStatus"],
+        "samplesTaken": len(samples),
+        "samplesFailed": len(samples) - len(ok_samples),
+        "phases": {
+            phase: _summarize_samples([sample[phase] for sample in ok_samples if sample.get(phase) is not None])
+            for phase in PROBE_PHASES
+        },
+        "cdn": _summarize_cdn(ok_samples),
+        "statusCode": latest["statusCode"],
+        "statusReason": latest["statusReason"],
+        "peerIp": latest["peerIp"],
+        "measurementOk": bool(ok_samples),
+        "statusOk": bool(ok_samples) and latest["statusCode"] == target["expectStatus"],
+        "timedOut": bool(failure.get("timedOut")),
+    }
+
+
+def _build_latency_response(
+    query: Optional[Dict[str, str]] = None,
+    context=None,
+    extras: Tuple[str, ...] = ("edges", "warmPath"),
+    record: Optional[bool] = None,
+) -> Dict[str, Any]:
     """
     Build latency response using only real measurements from this Lambda's region.
 
-    A single TLS + TTFB measurement is taken against chris-nelson.dev and returned
-    alongside the AWS region the function is running in. No synthetic regional data.
+    Every configured target gets up to ?samples= sequential probes, each
+    split into DNS, TCP connect, TLS handshake and TTFB phases and
+    summarized per phase; targets are probed in parallel, each with its own
+    socket timeout, and sampling stops early near the invocation deadline.
+    The primary target's numbers stay in the top-level fields, and all
+    targets are listed under "targets".
+
+    Samples also feed per-phase LatencySketches kept in the warm container,
+    reported under "recent" as p50/p90/p99 over the last one to two
+    SKETCH_WINDOW_SECONDS; ?sketch=true adds the serialized sketches so
+    several containers' views can be merged.
+
+    For the primary target, every resolved edge address is also probed once
+    under "edges", and unless ?mode=cold "warmPath" reports resumed-handshake
+    and keep-alive TTFB next to the cold numbers. Probes missing from
+    `extras` are skipped. No synthetic regional data.
+
+    `record` stores the samples in the PROBE_STORE rollups. By default only
+    the scheduled snapshot refresh records them, so read requests never
+    wait on the store; without a snapshot every build records.
     """
-    tls_ms, ttfb_ms, status_code, reason, peer_ip = _measure_site()
+    query = query or {}
+    requested = _requested_samples(query)
+    mode = query.get("mode", "")
+    deadline = _deadline_from_context(context)
+
+    try:
+        targets = _probe_targets()
+    except (TypeError, ValueError) as exc:
+        return {"version": API_VERSION, "generatedAt": _iso_now(), **_permanent_error(f"Invalid PROBE_TARGETS: {exc}")}
+    primary = targets[0]
+
+    tasks: Dict[str, Callable[[], Any]] = {
+        f"target:{i}": (lambda t=target: _sample_target(t, requested, deadline))
+        for i, target in enumerate(targets)
+    }
+    extra_timeout = max(0.1, min(primary["timeoutSeconds"], deadline - time.monotonic()))
+    if "edges" in extras:
+        tasks["edges"] = lambda: _probe_edges(
+            host=primary["host"], port=primary["port"], path=primary["path"], timeout=extra_timeout
+        )
+    if mode != "cold" and "warmPath" in extras:
+        tasks["warmPath"] = lambda: _measure_warm_path(
+            host=primary["host"], port=primary["port"], path=primary["path"], timeout=extra_timeout
+        )
+    outcome = _fan_out(tasks, deadline)
+
+    summaries = [_summarize_target(target, outcome[f"target:{i}"]) for i, target in enumerate(targets)]
+    include_sketches = query.get("sketch") == "true"
+    for i, target in enumerate(targets):
+        if isinstance(outcome[f"target:{i}"], list):
+            _record_sketch_samples(target["name"], outcome[f"target:{i}"])
+        summaries[i]["recent"] = _recent_latency(target["name"], include_sketches)
+
+    if record is None:
+        record = not STATUS_SNAPSHOT
+    stored = False
+    if record:
+        try:
+            stored = _store_probe_outcomes(targets, outcome, deadline)
+        except Exception:  # noqa: BLE001
+            # History is best effort; never fail a live probe over it
+            stored = False
+
+    first = summaries[0]
+
+    def median(phase: str) -> float:
+        summary = first["phases"][phase]
+        return summary["median"] if summary else 0.0
 
     return {
         "version": API_VERSION,
         "generatedAt": _iso_now(),
         "lambdaRegion": os.environ.get("AWS_REGION", ""),
-        "targetHost": HOSTNAME,
-        "targetPort": PORT,
-        "sslHandshakeMs": tls_ms,
-        "timeToFirstByteMs": ttfb_ms,
-        "statusCode": status_code,
-        "statusReason": reason,
-        "peerIp": peer_ip,
-        "measurementOk": status_code != 503 and tls_ms > 0 and ttfb_ms > 0,
+        "targetHost": primary["host"],
+        "targetPort": primary["port"],
+        "samplesRequested": requested,
+        "samplesTaken": first["samplesTaken"],
+        "samplesFailed": first["samplesFailed"],
+        "phases": first["phases"],
+        "recent": first["recent"],
+        "cdn": first["cdn"],
+        # Connect + handshake, kept for clients that read the original single-sample fields
+        "sslHandshakeMs": median("tcpConnectMs") + median("tlsHandshakeMs"),
+        "timeToFirstByteMs": median("ttfbMs"),
+        "statusCode": first["statusCode"],
+        "statusReason": first["statusReason"],
+        "peerIp": first["peerIp"],
+        "measurementOk": first["measurementOk"],
+        "targets": summaries,
+        "allTargetsOk": all(summary["statusOk"] for summary in summaries),
+        "edges": outcome.get("edges"),
+        "warmPath": outcome.get("warmPath"),
+        "stored": stored,
+    }
+
+
+# Route 53 status text, e.g. "Failure: HTTP Status Code 503, Service Unavailable"
+_HTTP_STATUS_CODE_RE = re.compile(r"HTTP Status Code\s+(\d+)")
+
+
+def _health_checks() -> List[Tuple[str, str]]:
+    """
+    (name, health check id) pairs to report: ROUTE53_HEALTH_CHECK_ID first,
+    named "site", then every entry of ROUTE53_HEALTH_CHECK_IDS. An entry is
+    either a bare id (used as its own name) or name=id. Duplicates are dropped.
+    """
+    checks: List[Tuple[str, str]] = []
+    if ROUTE53_HEALTH_CHECK_ID:
+        checks.append(("site", ROUTE53_HEALTH_CHECK_ID))
+    for entry in ROUTE53_HEALTH_CHECK_IDS.split(","):
+        name, _, check_id = entry.strip().rpartition("=")
+        check_id = check_id.strip()
+        if check_id and all(check_id != known for _, known in checks):
+            checks.append((name.strip() or check_id, check_id))
+    return checks
+
+
+def _health_region(obs: Dict[str, Any]) -> Dict[str, Any]:
+    """One checker region's observation as reported by the API."""
+    region_code = obs.get("Region")
+    report = obs.get("StatusReport", {}) or {}
+    status_text = report.get("Status", "") or ""
+    checked_time = report.get("CheckedTime")
+
+    # Try to extract an HTTP status code from the message, if present
+    match = _HTTP_STATUS_CODE_RE.search(status_text)
+
+    return {
+        "regionCode": region_code,
+        "regionName": _region_name_from_code(region_code or ""),
+        "ip": obs.get("IPAddress", ""),
+        # Map Route 53 status text to a simple HEALTHY or UNHEALTHY
+        "status": "HEALTHY" if status_text.startswith("Success") else "UNHEALTHY",
+        "httpStatusCode": int(match.group(1)) if match else None,
+        "message": status_text,
+        "checkedTime": checked_time.isoformat() if hasattr(checked_time, "isoformat") else None,
     }
 
 
-def _build_health_response() -> Dict[str, Any]:
+def _health_quorum(regions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Healthy checker regions over total, whether a strict majority is healthy,
+    and the worst region: unhealthy before healthy, then the oldest report.
+    """
+    healthy = sum(1 for region in regions if region["status"] == "HEALTHY")
+    worst = min(
+        regions,
+        key=lambda region: (region["status"] == "HEALTHY", region.get("checkedTime") or ""),
+        default=None,
+    )
+    return {
+        "healthy": healthy,
+        "total": len(regions),
+        "quorum": bool(regions) and healthy * 2 > len(regions),
+        "worstRegion": worst,
+    }
+
+
+def _fetch_health_check(name: str, check_id: str) -> Dict[str, Any]:
+    """Status of one Route 53 health check with its per-check quorum."""
+    try:
+        with _timed("route53"):
+            resp = _guarded("route53", lambda: _route53().get_health_check_status(HealthCheckId=check_id))
+        observations = resp.get("HealthCheckObservations", [])
+    except Exception as exc:  # noqa: BLE001
+        return {
+            "name": name,
+            "id": check_id,
+            "regions": [],
+            "error": f"Error calling Route 53 get_health_check_status: {exc}",
+        }
+
+    regions = [_health_region(obs) for obs in observations]
+    return {"name": name, "id": check_id, "regions": regions, **_health_quorum(regions)}
+
+
+def _build_health_response(waf: Optional[Dict[str, Any]] = None, context=None) -> Dict[str, Any]:
     """
     Build health response by calling Route 53 GetHealthCheckStatus.
 
     This lets the page show exactly the same per region messages you see
     in the AWS console, including DNS resolution failures and HTTP errors.
+    A precomputed WAF status can be passed in to share it with other builders.
+
+    Every configured health check is fetched concurrently under the
+    invocation deadline; `quorum` sums all checks. The top-level `regions`
+    are those of the first check. With more than one check, each is listed
+    under `checks` with its own quorum, and the first entry leaves out the
+    regions it would repeat.
     """
     now = _iso_now()
-    waf = get_waf_status()
+    if waf is None:
+        waf = get_waf_status()
 
-    if not ROUTE53_HEALTH_CHECK_ID:
+    checks_config = _health_checks()
+    if not checks_config:
         return {
             "generatedAt": now,
             "regions": [],
-            "error": "ROUTE53_HEALTH_CHECK_ID environment variable is not set on the Lambda function",
+            **_permanent_error("ROUTE53_HEALTH_CHECK_ID environment variable is not set on the Lambda function"),
             "waf": waf,
         }
 
+    if len(checks_config) == 1:
+        checks = [_fetch_health_check(*checks_config[0])]
+    else:
+        results = _fan_out(
+            {check_id: (lambda n=name, c=check_id: _fetch_health_check(n, c)) for name, check_id in checks_config},
+            _deadline_from_context(context),
+        )
+        checks = [dict(results[check_id], name=name, id=check_id) for name, check_id in checks_config]
+        for check in checks:
+            check.setdefault("regions", [])
+
+    body: Dict[str, Any] = {
+        "version": API_VERSION,
+        "generatedAt": now,
+        "regions": checks[0]["regions"],
+    }
+    if len(checks) > 1:
+        first = {key: value for key, value in checks[0].items() if key != "regions"}
+        body["checks"] = [first] + checks[1:]
+
+    reporting = [check for check in checks if not check.get("error")]
+    if not reporting:
+        body["error"] = checks[0]["error"]
+    else:
+        regions = [dict(region, check=check["name"]) for check in reporting for region in check["regions"]]
+        overall = _health_quorum(regions)
+        overall["checksInQuorum"] = sum(1 for check in reporting if check["quorum"])
+        overall["checksTotal"] = len(checks)
+        body["quorum"] = overall
+    body["dependencies"] = _dependency_states("route53")
+    body["waf"] = waf
+    return body
+
+
+# Per-region fields in ?format=compact columns, and which of them are strings
+# served through the shared lookup table
+COMPACT_REGION_FIELDS = ("regionCode", "regionName", "ip", "status", "httpStatusCode", "message", "checkedTime")
+COMPACT_STRING_FIELDS = ("regionCode", "regionName", "ip", "status", "message")
+
+
+def _epoch_seconds(timestamp: Optional[str]) -> Optional[int]:
+    """ISO 8601 timestamp -> integer epoch seconds (None passes through)."""
+    if not timestamp:
+        return None
     try:
-        resp = route53.get_health_check_status(HealthCheckId=ROUTE53_HEALTH_CHECK_ID)
-        observations = resp.get("HealthCheckObservations", [])
-    except Exception as exc:  # noqa: BLE001
-        return {
-            "version": API_VERSION,
-            "generatedAt": now,
-            "regions": [],
-            "error": f"Error calling Route 53 get_health_check_status: {exc}",
-            "waf": waf,
-        }
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except ValueError:
+        return None
 
-    regions: List[Dict[str, Any]] = []
 
-    for obs in observations:
-        region_code = obs.get("Region")
-        ip = obs.get("IPAddress", "")
-        report = obs.get("StatusReport", {}) or {}
-        status_text = report.get("Status", "") or ""
-        checked_time = report.get("CheckedTime")
+def _compact_health(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ?format=compact for /status/health-checkers: every region list becomes
+    parallel arrays, repeated strings (region names, status messages, ...)
+    are stored once in a top-level "strings" table and referenced by index,
+    timestamps are epoch seconds, and each worstRegion is an index into its
+    check's arrays.
+    """
+    strings: List[str] = []
+    positions: Dict[str, int] = {}
+
+    def ref(value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        if value not in positions:
+            positions[value] = len(strings)
+            strings.append(value)
+        return positions[value]
+
+    def columns(regions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        compact: Dict[str, Any] = {"count": len(regions)}
+        for field in COMPACT_REGION_FIELDS:
+            values = [region.get(field) for region in regions]
+            if field in COMPACT_STRING_FIELDS:
+                values = [ref(value) for value in values]
+            elif field == "checkedTime":
+                values = [_epoch_seconds(value) for value in values]
+            compact[field] = values
+        return compact
+
+    def worst_index(regions: List[Dict[str, Any]], worst: Optional[Dict[str, Any]]) -> Optional[int]:
+        if worst is None:
+            return None
+        plain = {key: value for key, value in worst.items() if key != "check"}
+        return regions.index(plain) if plain in regions else None
+
+    def regions_of(check: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # The first check's regions are the top-level ones and are not repeated
+        return check["regions"] if "regions" in check else body.get("regions", [])
+
+    compact = dict(body, format="compact", generatedAt=_epoch_seconds(body.get("generatedAt")))
+    compact["regions"] = columns(body.get("regions", []))
+    if "checks" in body:
+        checks = []
+        for check in body["checks"]:
+            entry = dict(check)
+            if "regions" in check:
+                entry["regions"] = columns(check["regions"])
+            if "worstRegion" in check:
+                entry["worstRegion"] = worst_index(regions_of(check), check["worstRegion"])
+            checks.append(entry)
+        compact["checks"] = checks
+    if body.get("quorum"):
+        worst = body["quorum"].get("worstRegion")
+        worst_ref = None
+        if worst is not None:
+            name = worst.get("check")
+            if "checks" in body:
+                check = next((c for c in body["checks"] if c["name"] == name), None)
+            else:
+                # A single check is the body itself
+                check = body
+            if check is not None:
+                worst_ref = {"check": name, "index": worst_index(regions_of(check), worst)}
+        compact["quorum"] = dict(body["quorum"], worstRegion=worst_ref)
+    compact["strings"] = strings
+    return compact
+
+
+def _format_body(route: Optional[str], body: Dict[str, Any], query: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Apply an opt-in ?format= to a route's body (the default shape is
+    unchanged), then stamp routes that support ?since= with a versionToken.
+    """
+    if route == "health-checkers" and query.get("format") == "compact":
+        body = _compact_health(body)
+    if route in DELTA_ROUTES:
+        body = dict(body, versionToken=_version_token(body))
+    return body
 
-        # Map Route 53 status text to a simple HEALTHY or UNHEALTHY
-        if status_text.startswith("Success"):
-            overall = "HEALTHY"
-        else:
-            overall = "UNHEALTHY"
 
-        # Try to extract an HTTP status code from the message, if present
-        http_code = None
-        m = re.search(r"HTTP Status Code\s+(\d+)", status_text)
-        if m:
-            try:
-                http_code = int(m.group(1))
-            except ValueError:
-                http_code = None
-
-        regions.append(
-            {
-                "regionCode": region_code,
-                "regionName": _region_name_from_code(region_code or ""),
-                "ip": ip,
-                "status": overall,
-                "httpStatusCode": http_code,
-                "message": status_text,
-                "checkedTime": checked_time.isoformat()
-                if hasattr(checked_time, "isoformat")
-                else None,
-            }
+# ?since= deltas for DELTA_ROUTES: bodies are remembered per route and query
+# by versionToken, and a client holding a known token gets only what changed.
+
+
+def _without_volatile(value: Any) -> Any:
+    """A body with DELTA_VOLATILE_KEYS dropped at every depth."""
+    if isinstance(value, dict):
+        return {key: _without_volatile(item) for key, item in value.items() if key not in DELTA_VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_without_volatile(item) for item in value]
+    return value
+
+
+def _latest_checked_time(value: Any) -> Any:
+    """Newest checkedTime anywhere in a body (ISO strings, or epoch seconds in compact columns)."""
+    found: List[Any] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for key, item in node.items():
+                if key == "checkedTime":
+                    found.extend(v for v in (item if isinstance(item, list) else [item]) if v is not None)
+                else:
+                    walk(item)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(value)
+    return max(found) if found else None
+
+
+def _version_token(body: Dict[str, Any]) -> str:
+    """Token naming a body's data: the ETag digest of the body without volatile keys."""
+    return _etag_for(_without_volatile(body))[3:-1]
+
+
+def _keyed_for_diff(value: Any) -> Any:
+    """
+    Turn lists of regions (by regionCode) and of checks (by name) into
+    dicts, so a delta can name single entries instead of resending the list.
+    """
+    if isinstance(value, dict):
+        return {key: _keyed_for_diff(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        for key in ("regionCode", "name"):
+            ids = [item.get(key) for item in value]
+            if all(isinstance(i, str) for i in ids) and len(set(ids)) == len(ids):
+                return {i: _keyed_for_diff(item) for i, item in zip(ids, value)}
+    return value
+
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any], path: Tuple[str, ...] = ()) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    (changed, removed) between two keyed bodies: `changed` mirrors the body
+    with only new or different leaves, `removed` lists dotted paths of keys
+    that disappeared.
+    """
+    changed: Dict[str, Any] = {}
+    removed: List[str] = []
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_changed, sub_removed = _diff(old[key], value, path + (key,))
+            if sub_changed:
+                changed[key] = sub_changed
+            removed.extend(sub_removed)
+        elif value != old[key]:
+            changed[key] = value
+    removed.extend(".".join(path + (key,)) for key in old if key not in new)
+    return changed, removed
+
+
+# Recent bodies per delta route and query, by versionToken, kept in the warm container
+_delta_history: "OrderedDict[str, OrderedDict[str, Dict[str, Any]]]" = OrderedDict()
+
+
+def _remember_version(route: str, query: Dict[str, str], body: Dict[str, Any]) -> None:
+    """Keep the last DELTA_HISTORY_VERSIONS bodies a client may hold as ?since=."""
+    key = _cache_key(route, query)
+    versions = _delta_history.setdefault(key, OrderedDict())
+    _delta_history.move_to_end(key)
+    versions[body["versionToken"]] = body
+    versions.move_to_end(body["versionToken"])
+    while len(versions) > DELTA_HISTORY_VERSIONS:
+        versions.popitem(last=False)
+    while len(_delta_history) > DELTA_HISTORY_KEYS:
+        _delta_history.popitem(last=False)
+
+
+def _delta_body(route: str, query: Dict[str, str], since: str, current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reply to ?since=<token>: "unchanged" when the client is current, only
+    the changed regions/fields when its version is still known here, and
+    the full body marked "resync" when the token is unknown to this container.
+    """
+    token = current["versionToken"]
+    reply: Dict[str, Any] = {"version": API_VERSION, "generatedAt": current.get("generatedAt")}
+    checked = _latest_checked_time(current)
+    if checked is not None:
+        reply["checkedTime"] = checked
+    if since == token:
+        return dict(reply, versionToken=token, since=since, unchanged=True)
+
+    previous = _delta_history.get(_cache_key(route, query), {}).get(since)
+    if previous is None:
+        return dict(current, resync=True)
+
+    changed, removed = _diff(
+        _keyed_for_diff(_without_volatile(previous)), _keyed_for_diff(_without_volatile(current))
+    )
+    changed.pop("versionToken", None)
+    return dict(reply, versionToken=token, since=since, delta=True, changed=changed, removed=removed)
+
+
+# /status/all section names, in response order
+ALL_SECTIONS = ("latency", "health", "metrics")
+METRIC_SUBSECTIONS = ("cloudfront", "waf", "lambda")
+LATENCY_EXTRAS = ("edges", "warmPath")
+
+
+def _csv_param(query: Dict[str, str], name: str) -> List[str]:
+    """Split a comma-separated query parameter into trimmed, non-empty items."""
+    return [item.strip() for item in (query.get(name) or "").split(",") if item.strip()]
+
+
+def _select_fields(body: Dict[str, Any], paths: List[List[str]]) -> Dict[str, Any]:
+    """Project a body down to the given dotted-path fields."""
+    if not paths or any(not path for path in paths):
+        return body
+
+    selected: Dict[str, Any] = {}
+    for key in dict.fromkeys(path[0] for path in paths):
+        if key not in body:
+            continue
+        rest = [path[1:] for path in paths if path[0] == key]
+        value = body[key]
+        selected[key] = _select_fields(value, rest) if isinstance(value, dict) else value
+    return selected
+
+
+def _build_all_response(query: Optional[Dict[str, str]] = None, context=None) -> Dict[str, Any]:
+    """
+    Build several status sections in one invocation.
+
+    ?sections= picks from latency, health and metrics (default: all), and
+    ?fields= takes dotted paths such as metrics.cloudfront.error5xxRate or
+    latency.phases. Sections, metric subsections and latency probes that no
+    requested field needs are not computed at all. The WAF status is read
+    once and shared, and the sections run concurrently under one deadline.
+    """
+    query = query or {}
+    sections = [name for name in _csv_param(query, "sections") if name in ALL_SECTIONS] or list(ALL_SECTIONS)
+    fields = [path.split(".") for path in _csv_param(query, "fields")]
+    roots = {path[0] for path in fields}
+    if roots:
+        sections = [name for name in sections if name in roots]
+
+    def wanted(section: str, options: Tuple[str, ...]) -> Optional[List[str]]:
+        # Sub-parts of a section the requested fields need; None means all of it.
+        paths = [path for path in fields if path[0] == section]
+        if not paths or any(len(path) == 1 for path in paths):
+            return None
+        return [path[1] for path in paths if path[1] in options]
+
+    waf = get_waf_status()
+    tasks: Dict[str, Callable[[], Any]] = {}
+    if "latency" in sections:
+        extras = wanted("latency", LATENCY_EXTRAS)
+        tasks["latency"] = lambda: _build_latency_response(
+            query, context, LATENCY_EXTRAS if extras is None else tuple(extras)
         )
+    if "health" in sections:
+        tasks["health"] = lambda: _build_health_response(waf, context)
+    if "metrics" in sections:
+        tasks["metrics"] = lambda: _build_metrics_response(context, waf, wanted("metrics", METRIC_SUBSECTIONS))
+
+    results = _fan_out(tasks, _deadline_from_context(context), _section_fan_out_executor())
+
+    selected: Dict[str, Any] = {"waf": waf}
+    for name in sections:
+        section_body = results[name]
+        if isinstance(section_body, dict):
+            # The shared WAF status is reported once at the top level
+            section_body = {k: v for k, v in section_body.items() if k not in ("waf", "version")}
+        selected[name] = section_body
+    if fields:
+        selected = _select_fields(selected, fields)
 
     return {
         "version": API_VERSION,
-        "generatedAt": now,
-        "regions": regions,
-        "waf": waf,
+        "generatedAt": _iso_now(),
+        "sections": sections,
+        **selected,
+    }
+
+
+def _build_alarm_response() -> Dict[str, Any]:
+    """The /status alarm summary, built here so the snapshot can carry it."""
+    if not ALARM_NAME:
+        return {"status": "UNKNOWN", "reason": "ALARM_NAME is not set", "updated": None}
+    try:
+        resp = _guarded("cloudwatch", lambda: _cloudwatch().describe_alarms(AlarmNames=[ALARM_NAME]))
+    except Exception as exc:  # noqa: BLE001
+        return {"status": "UNKNOWN", "error": f"Error calling CloudWatch DescribeAlarms: {exc}", "updated": None}
+
+    alarms = resp.get("MetricAlarms", [])
+    if not alarms:
+        return {"status": "UNKNOWN", "reason": "Alarm not found", "updated": None}
+    updated = alarms[0].get("StateUpdatedTimestamp")
+    return {
+        "status": alarms[0].get("StateValue", "UNKNOWN"),
+        "reason": alarms[0].get("StateReason", ""),
+        "updated": updated.isoformat() if hasattr(updated, "isoformat") else None,
+    }
+
+
+class DirectorySnapshotStore:
+    """Snapshot kept as a JSON file in a local directory, for tests and local runs."""
+
+    def __init__(self, path: str):
+        self._path = os.path.join(path, "status-snapshot.json")
+
+    def read(self, if_none_match: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+        tag = str(os.stat(self._path).st_mtime_ns)
+        if tag == if_none_match:
+            return None
+        with open(self._path, "rb") as fh:
+            return json.loads(fh.read()), tag
+
+    def write(self, snapshot: Dict[str, Any]) -> str:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(json.dumps(snapshot).encode("utf-8"))
+        # Readers never see a half-written snapshot
+        os.replace(tmp, self._path)
+        return str(os.stat(self._path).st_mtime_ns)
+
+
+class S3SnapshotStore:
+    """
+    Snapshot kept as one S3 object. Reads are conditional on the last ETag,
+    so polling for a newer snapshot costs no body transfer when nothing changed.
+    """
+
+    def __init__(self, bucket: str, key: str, client=None):
+        self._bucket = bucket
+        self._key = key
+        self._client = client or _client("s3")
+
+    def read(self, if_none_match: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+        request = {"Bucket": self._bucket, "Key": self._key}
+        if if_none_match:
+            request["IfNoneMatch"] = if_none_match
+        try:
+            resp = self._client.get_object(**request)
+        except Exception as exc:
+            response = getattr(exc, "response", None)
+            if isinstance(response, dict) and response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None
+            raise
+        return json.loads(resp["Body"].read()), resp.get("ETag", "")
+
+    def write(self, snapshot: Dict[str, Any]) -> str:
+        resp = self._client.put_object(
+            Bucket=self._bucket,
+            Key=self._key,
+            Body=json.dumps(snapshot).encode("utf-8"),
+            ContentType="application/json",
+        )
+        return resp.get("ETag", "")
+
+
+_snapshot_store_instance: Optional[Any] = None
+# Latest snapshot seen by this container, its store tag, and rendered bodies per section
+_snapshot_state: Dict[str, Any] = {"checkedAt": None, "snapshot": None, "tag": None, "rendered": {}}
+
+
+def _snapshot_store():
+    """
+    Return the configured snapshot store, created once per container, or
+    None when STATUS_SNAPSHOT is unset.
+    """
+    global _snapshot_store_instance
+    if _snapshot_store_instance is None and STATUS_SNAPSHOT:
+        kind, _, target = STATUS_SNAPSHOT.partition(":")
+        if kind == "s3":
+            bucket, _, key = target.partition("/")
+            _snapshot_store_instance = S3SnapshotStore(bucket, key or "status-snapshot.json")
+        elif kind == "dir":
+            _snapshot_store_instance = DirectorySnapshotStore(target)
+        else:
+            raise ValueError(f"Unsupported STATUS_SNAPSHOT backend: {kind}")
+    return _snapshot_store_instance
+
+
+def _current_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    The newest snapshot this container knows of, re-checking the store at
+    most every SNAPSHOT_RELOAD_SECONDS. A missing or unreadable snapshot
+    keeps the previous one, and None means routes are served live.
+    """
+    store = _snapshot_store()
+    if store is None:
+        return None
+
+    now = time.monotonic()
+    checked = _snapshot_state["checkedAt"]
+    if checked is None or now - checked >= SNAPSHOT_RELOAD_SECONDS:
+        _snapshot_state["checkedAt"] = now
+        try:
+            with _timed("snapshot"):
+                loaded = store.read(_snapshot_state["tag"])
+        except Exception:  # noqa: BLE001
+            loaded = None
+        if loaded is not None and loaded[0].get("format") == SNAPSHOT_FORMAT:
+            _snapshot_state.update(snapshot=loaded[0], tag=loaded[1], rendered={})
+    return _snapshot_state["snapshot"]
+
+
+def _snapshot_response(route: str, query: Dict[str, str]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Serve a read route from the snapshot as (rendered body, cache info),
+    or None when it has to be built live: requests with query parameters
+    other than ?format=, no snapshot, or a section older than
+    SNAPSHOT_MAX_AGE_SECONDS.
+    """
+    section = SNAPSHOT_ROUTES.get(route)
+    if section is None or any(key != "format" for key in query):
+        return None
+    snapshot = _current_snapshot()
+    if snapshot is None or section not in snapshot.get("bodies", {}):
+        return None
+
+    age = max(0.0, time.time() - snapshot["sectionsGeneratedAt"][section])
+    if age > SNAPSHOT_MAX_AGE_SECONDS:
+        return None
+
+    memo_key = (section, query.get("format", ""))
+    rendered = _snapshot_state["rendered"].get(memo_key)
+    if rendered is None:
+        body = dict(_format_body(route, snapshot["bodies"][section], query), snapshot={
+            "version": snapshot["version"],
+            "generatedAt": snapshot["generatedAt"],
+        })
+        rendered = _snapshot_state["rendered"][memo_key] = _render(body)
+
+    info = _cache_info(hit=True, age=age)
+    info["snapshot"] = True
+    return rendered, info
+
+
+def _refresh_snapshot(context=None) -> Dict[str, Any]:
+    """
+    Scheduled refresh: build the latency, health, metrics and alarm bodies
+    concurrently and write them as one snapshot. A section whose rebuild
+    hit an upstream failure keeps its previous good body (and its age),
+    so one failing dependency doesn't blank the page. A failed write
+    publishes nothing and reports which sections had been built.
+    """
+    store = _snapshot_store()
+    if store is None:
+        return {"refreshed": False, "error": "STATUS_SNAPSHOT environment variable is not set"}
+
+    previous = _current_snapshot() or {}
+    waf = get_waf_status()
+    results = _fan_out(
+        {
+            "latency": lambda: _build_latency_response({}, context, record=True),
+            "health": lambda: _build_health_response(waf, context),
+            "metrics": lambda: _build_metrics_response(context, waf),
+            "alarm": _build_alarm_response,
+        },
+        _deadline_from_context(context),
+        _section_fan_out_executor(),
+    )
+
+    generated = time.time()
+    bodies: Dict[str, Any] = {}
+    generated_at: Dict[str, float] = {}
+    carried_over: List[str] = []
+    for name, body in results.items():
+        old = previous.get("bodies", {}).get(name)
+        if _is_upstream_failure(body) and old is not None and not _is_upstream_failure(old):
+            bodies[name] = old
+            generated_at[name] = previous["sectionsGeneratedAt"][name]
+            carried_over.append(name)
+        else:
+            bodies[name] = body
+            generated_at[name] = generated
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "version": int(generated * 1000),
+        "generatedAt": datetime.fromtimestamp(generated, timezone.utc).isoformat(),
+        "sectionsGeneratedAt": generated_at,
+        "bodies": bodies,
+    }
+    try:
+        tag = _guarded("snapshot", lambda: store.write(snapshot))
+    except Exception as exc:  # noqa: BLE001
+        # Nothing was published; readers keep the previous snapshot
+        return {
+            "refreshed": False,
+            "error": f"Error writing status snapshot: {exc}",
+            "built": [name for name in bodies if name not in carried_over],
+            "carriedOver": carried_over,
+        }
+    # This container can serve the new snapshot without reading it back
+    _snapshot_state.update(checkedAt=time.monotonic(), snapshot=snapshot, tag=tag, rendered={})
+
+    return {
+        "refreshed": True,
+        "version": snapshot["version"],
+        "generatedAt": snapshot["generatedAt"],
+        "carriedOver": carried_over,
     }
 
 
@@ -467,39 +3050,371 @@ def _get_path(event: Dict[str, Any]) -> str:
     )
 
 
+def _get_query(event: Dict[str, Any]) -> Dict[str, str]:
+    """Return query string parameters for both v1 and v2 event shapes."""
+    return event.get("queryStringParameters") or {}
+
+
+def _get_header(event: Dict[str, Any], name: str) -> str:
+    """Case-insensitive request header lookup (v2 lowercases names, v1 does not)."""
+    wanted = name.lower()
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == wanted:
+            return value or ""
+    return ""
+
+
+# Body keys that change on every build without the data changing
+VOLATILE_BODY_KEYS = ("generatedAt",)
+
+
+def _etag_for(body: Dict[str, Any]) -> str:
+    """
+    Weak validator over the body's data, ignoring volatile keys, so an
+    unchanged answer keeps its ETag across cache hits and rebuilds.
+    """
+    stable = {k: v for k, v in body.items() if k not in VOLATILE_BODY_KEYS}
+    digest = hashlib.sha256(
+        json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _cache_control(route: Optional[str], body: Dict[str, Any], info: Dict[str, Any]) -> str:
+    """
+    Cache-Control for a response, derived from the route's cache policy.
+
+    Fresh bodies may be reused for the rest of their TTL and then served
+    stale while the edge revalidates; stale or failed bodies must not be
+    reused without revalidation.
+    """
+    policy = CACHE_POLICIES.get(route or "")
+    if policy is None:
+        return "no-store"
+
+    ttl, stale_for, _ = policy
+    if info.get("snapshot"):
+        # Snapshot bodies stay current until the next scheduled refresh
+        ttl = SNAPSHOT_INTERVAL_SECONDS
+    if info.get("stale"):
+        return "no-cache"
+    if not info.get("hit") and _is_upstream_failure(body):
+        return "no-store"
+
+    max_age = max(0, int(ttl - info.get("ageSeconds", 0.0)))
+    return (
+        f"public, max-age={max_age}, "
+        f"stale-while-revalidate={int(ttl)}, stale-if-error={int(stale_for)}"
+    )
+
+
+_fast_json = None
+
+
+def _dumps(body: Dict[str, Any]) -> bytes:
+    """
+    Serialize a response body to UTF-8 JSON bytes, using orjson when it is
+    installed and falling back to the stdlib json module.
+    """
+    global _fast_json
+    if _fast_json is None:
+        try:
+            import orjson
+
+            _fast_json = orjson
+        except ImportError:
+            _fast_json = False
+    if _fast_json:
+        return _fast_json.dumps(body, default=str)
+    return json.dumps(body, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _render(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Serialize a body once: its JSON payload, its ETag, and a memo of
+    compressed variants filled in per content coding on first request.
+    """
+    with _timed("serialize"):
+        return {"body": body, "payload": _dumps(body), "etag": _etag_for(body), "encoded": {}}
+
+
+def _brotli():
+    """The optional brotli module, or None when it is not installed."""
+    try:
+        import brotli
+
+        return brotli
+    except ImportError:
+        return None
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding, honouring q-values; None means identity."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if _brotli() is not None else ["gzip"]
+    best = max(candidates, key=lambda c: accepted.get(c, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def _encoded_payload(rendered: Dict[str, Any], accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """
+    Payload bytes for this request and the content coding applied, if any.
+    Compressed variants are memoized on the rendered entry, so cache hits
+    neither re-serialize nor re-compress.
+    """
+    payload = rendered["payload"]
+    if len(payload) < COMPRESSION_MIN_BYTES:
+        return payload, None
+
+    encoding = _choose_encoding(accept_encoding)
+    if encoding is None:
+        return payload, None
+
+    encoded = rendered["encoded"].get(encoding)
+    if encoded is None:
+        if encoding == "br":
+            encoded = _brotli().compress(payload, quality=BROTLI_QUALITY)
+        else:
+            encoded = gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+        rendered["encoded"][encoding] = encoded
+    return encoded, encoding
+
+
+# route -> OrderedDict(cache key -> (stored at monotonic seconds, rendered body)), LRU ordered
+_response_cache: Dict[str, "OrderedDict[str, Tuple[float, Dict[str, Any]]]"] = {}
+
+
+def _cache_key(route: str, query: Dict[str, str]) -> str:
+    """Stable cache key from the route and its sorted query parameters."""
+    pairs = "&".join(f"{k}={query[k]}" for k in sorted(query))
+    return f"{route}?{pairs}"
+
+
+# Best-effort latency extras whose errors never make a body an upstream failure
+OPTIONAL_PROBE_SECTIONS = ("edges", "warmPath")
+
+
+def _permanent_error(message: str) -> Dict[str, Any]:
+    """
+    Error fields for a missing setting or bad parameter. Retrying won't
+    change the answer, so it is cached like a good body.
+    """
+    return {"error": message, "retryable": False}
+
+
+def _is_upstream_failure(body: Dict[str, Any]) -> bool:
+    """
+    True when a freshly built body reflects a failed dependency call, so a
+    recent good answer is more useful to the caller than the error.
+    Permanent errors and the optional latency extras don't count.
+    """
+    if body.get("retryable") is False:
+        return False
+    if body.get("error") or body.get("measurementOk") is False:
+        return True
+    return any(
+        isinstance(value, dict) and _is_upstream_failure(value)
+        for key, value in body.items()
+        if key not in OPTIONAL_PROBE_SECTIONS
+    )
+
+
+def _cache_info(hit: bool, age: float, stale: bool = False) -> Dict[str, Any]:
+    """How a response was served from the warm-container cache."""
+    return {"hit": hit, "stale": stale, "ageSeconds": round(age, 3)}
+
+
+def _cached_response(
+    route: str,
+    query: Dict[str, str],
+    build: Callable[[], Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Serve a route from the warm-container cache, rebuilding it when expired.
+    Returns (rendered body, cache info).
+
+    Lambda freezes the container once a response is returned, so there is no
+    background revalidation: an expired entry is rebuilt inline, and if the
+    rebuild hits an upstream failure the previous body is served instead
+    for up to the route's stale window. Entries hold the rendered bytes, so
+    hits are never re-serialized.
+    """
+    policy = CACHE_POLICIES.get(route)
+    if policy is None:
+        return _render(build()), _cache_info(hit=False, age=0.0)
+
+    ttl, stale_for, max_entries = policy
+    bucket = _response_cache.setdefault(route, OrderedDict())
+    key = _cache_key(route, query)
+    now = time.monotonic()
+
+    entry = bucket.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        bucket.move_to_end(key)
+        return entry[1], _cache_info(hit=True, age=now - entry[0])
+
+    body = build()
+    now = time.monotonic()
+
+    if _is_upstream_failure(body):
+        if entry is not None and now - entry[0] < ttl + stale_for:
+            return entry[1], _cache_info(hit=True, age=now - entry[0], stale=True)
+        return _render(body), _cache_info(hit=False, age=0.0)
+
+    rendered = _render(body)
+    bucket[key] = (now, rendered)
+    bucket.move_to_end(key)
+    while len(bucket) > max_entries:
+        bucket.popitem(last=False)
+
+    return rendered, _cache_info(hit=False, age=0.0)
+
+
+def _route_for_path(path: str) -> Optional[str]:
+    """Map a request path onto one of the logical route names."""
+    for route in ("all", "latency", "latency/history", "health-checkers", "metrics", "metrics/history", "slo"):
+        if path.endswith(f"/status/{route}"):
+            return route
+    return None
+
+
 def lambda_handler(event, context):
     """
-    Single Lambda entrypoint that handles three logical endpoints:
+    Single Lambda entrypoint that handles these logical endpoints:
 
     - GET /status/latency
+    - GET /status/latency/history
     - GET /status/health-checkers
     - GET /status/metrics
+    - GET /status/metrics/history
+    - GET /status/all
+    - GET /status/slo
+
+    Scheduled invocations (EventBridge "Scheduled Event", or {"refresh": true})
+    rebuild the status snapshot instead of answering a route.
     """
-    path = _get_path(event)
+    if event.get("detail-type") == "Scheduled Event" or event.get("refresh") is True:
+        return _refresh_snapshot(context)
+
+    _reset_stage_timings()
+    started = time.perf_counter()
+
+    with _timed("route"):
+        path = _get_path(event)
+        query = dict(_get_query(event))
+        route = _route_for_path(path)
+        # ?since= selects a delta of the full body, so it is not part of the cache key
+        since = query.pop("since", None) if route in DELTA_ROUTES else None
+
+    builders: Dict[str, Callable[[], Dict[str, Any]]] = {
+        "latency": lambda: _build_latency_response(query, context),
+        "health-checkers": lambda: _format_body("health-checkers", _build_health_response(context=context), query),
+        "metrics": lambda: _format_body("metrics", _build_metrics_response(context), query),
+        "metrics/history": lambda: _build_metrics_history_response(query, context),
+        "latency/history": lambda: _build_latency_history_response(query),
+        "all": lambda: _build_all_response(query, context),
+        "slo": lambda: _build_slo_response(context),
+    }
 
-    if path.endswith("/status/latency"):
-        body = _build_latency_response()
-        status_code = 200
-    elif path.endswith("/status/health-checkers"):
-        body = _build_health_response()
-        status_code = 200
-    elif path.endswith("/status/metrics"):
-        body = _build_metrics_response(context)
+    if route is not None:
+        with _timed("build"):
+            served = _snapshot_response(route, query)
+            rendered, info = served or _cached_response(route, query, builders[route])
+            if route in DELTA_ROUTES and "versionToken" in rendered["body"]:
+                _remember_version(route, query, rendered["body"])
+                if since:
+                    rendered = _render(_delta_body(route, query, since, rendered["body"]))
         status_code = 200
     else:
-        body = {
+        rendered = _render({
             "message": "Not found",
             "path": path,
-        }
+        })
+        info = _cache_info(hit=False, age=0.0)
         status_code = 404
 
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "https://chris-nelson.dev",
-            "Access-Control-Allow-Headers": "*",
-            "Access-Control-Allow-Methods": "GET, OPTIONS",
-        },
-        "body": json.dumps(body),
+    headers = {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "https://chris-nelson.dev",
+        "Access-Control-Allow-Headers": "*",
+        "Access-Control-Allow-Methods": "GET, OPTIONS",
+        "Access-Control-Expose-Headers": "ETag, Age, X-Cache, X-Circuit-Breakers, Server-Timing",
+        "Timing-Allow-Origin": "https://chris-nelson.dev",
+        "Cache-Control": _cache_control(route, rendered["body"], info),
+        "Vary": "Accept-Encoding",
     }
+
+    if info.get("snapshot"):
+        cache_status = "Snapshot"
+    else:
+        cache_status = "Stale" if info["stale"] else ("Hit" if info["hit"] else "Miss")
+    if route is not None:
+        headers["Age"] = str(int(info["ageSeconds"]))
+        headers["X-Cache"] = cache_status
+
+    # Live breaker state, so a stale body served during an outage says why
+    with _breakers_lock:
+        breakers = list(_breakers.items())
+    tripped = [f"{name}={breaker.state}" for name, breaker in breakers if breaker.state != "closed"]
+    if tripped:
+        headers["X-Circuit-Breakers"] = ", ".join(tripped)
+
+    def finish(response: Dict[str, Any]) -> Dict[str, Any]:
+        total_ms = (time.perf_counter() - started) * 1000.0
+        stages = _stage_snapshot()
+        headers["Server-Timing"] = _server_timing(stages, total_ms)
+        if METRICS_NAMESPACE:
+            print(json.dumps(_emf_record(route, stages, total_ms, response["statusCode"], cache_status)))
+        return response
+
+    if status_code == 200:
+        headers["ETag"] = rendered["etag"]
+        if _etag_matches(_get_header(event, "If-None-Match"), rendered["etag"]):
+            return finish({"statusCode": 304, "headers": headers, "body": ""})
+
+    with _timed("compress"):
+        payload, encoding = _encoded_payload(rendered, _get_header(event, "Accept-Encoding"))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        return finish({
+            "statusCode": status_code,
+            "headers": headers,
+            "body": base64.b64encode(payload).decode("ascii"),
+            "isBase64Encoded": True,
+        })
+
+    return finish({
+        "statusCode": status_code,
+        "headers": headers,
+        "body": payload.decode("utf-8"),
+        "isBase64Encoded": False,
+    })
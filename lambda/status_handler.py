@@ -1,14 +1,125 @@
 import json
 import os
-import boto3
+import time
 from datetime import datetime
 
-cloudwatch = boto3.client("cloudwatch")
 ALARM_NAME = os.environ["ALARM_NAME"]
+# Snapshot written by the status API's scheduled refresh ("s3:bucket/key" or
+# "dir:/path"); its "alarm" section is served instead of calling CloudWatch
+STATUS_SNAPSHOT = os.environ.get("STATUS_SNAPSHOT", "")
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_RELOAD_SECONDS = 10
+SNAPSHOT_MAX_AGE_SECONDS = 300
+# botocore client tuning, shared with status_api_handler: fail fast inside
+# the function timeout and retry throttling with standard backoff
+AWS_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("AWS_CONNECT_TIMEOUT_SECONDS", "2"))
+AWS_READ_TIMEOUT_SECONDS = float(os.environ.get("AWS_READ_TIMEOUT_SECONDS", "5"))
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+
+_cloudwatch_client = None
+_s3_client = None
+# Latest snapshot alarm section: (checked at, body, generated at epoch, S3 ETag)
+_snapshot = {"checkedAt": None, "body": None, "generatedAt": None, "etag": None}
+
+
+def _client_config():
+    from botocore.config import Config
+
+    return Config(
+        connect_timeout=AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=AWS_READ_TIMEOUT_SECONDS,
+        retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "standard"},
+        tcp_keepalive=True,
+    )
+
+
+def _cloudwatch():
+    # Created on first use and kept for warm invocations; boto3 is imported
+    # here so the module itself loads without it.
+    global _cloudwatch_client
+    if _cloudwatch_client is None:
+        import boto3
+
+        _cloudwatch_client = boto3.client("cloudwatch", config=_client_config())
+    return _cloudwatch_client
+
+
+def _s3():
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client("s3", config=_client_config())
+    return _s3_client
+
+
+def _read_snapshot(etag):
+    # Returns (snapshot, etag), or None when the S3 object is unchanged
+    kind, _, target = STATUS_SNAPSHOT.partition(":")
+    if kind == "dir":
+        with open(os.path.join(target, "status-snapshot.json"), "rb") as fh:
+            return json.loads(fh.read()), None
+    if kind != "s3":
+        raise ValueError(f"Unsupported STATUS_SNAPSHOT backend: {kind}")
+
+    bucket, _, key = target.partition("/")
+    request = {"Bucket": bucket, "Key": key or "status-snapshot.json"}
+    if etag:
+        request["IfNoneMatch"] = etag
+    try:
+        resp = _s3().get_object(**request)
+    except Exception as exc:
+        code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+        if code in ("304", "NotModified"):
+            return None
+        raise
+    return json.loads(resp["Body"].read()), resp.get("ETag")
+
+
+def _snapshot_alarm():
+    """
+    The alarm body from the status snapshot and its age in seconds, or None
+    when there is no usable snapshot and CloudWatch must be asked directly.
+    """
+    if not STATUS_SNAPSHOT:
+        return None
+
+    now = time.monotonic()
+    if _snapshot["checkedAt"] is None or now - _snapshot["checkedAt"] >= SNAPSHOT_RELOAD_SECONDS:
+        _snapshot["checkedAt"] = now
+        try:
+            loaded = _read_snapshot(_snapshot["etag"])
+        except Exception:  # noqa: BLE001
+            loaded = None
+        if loaded is not None:
+            snapshot, etag = loaded
+            body = snapshot.get("bodies", {}).get("alarm")
+            if snapshot.get("format") == SNAPSHOT_FORMAT and body is not None:
+                _snapshot.update(body=body, generatedAt=snapshot["sectionsGeneratedAt"]["alarm"], etag=etag)
+
+    if _snapshot["body"] is None:
+        return None
+    age = max(0.0, time.time() - _snapshot["generatedAt"])
+    if age > SNAPSHOT_MAX_AGE_SECONDS:
+        return None
+    return _snapshot["body"], age
 
 
 def lambda_handler(event, context):
-    resp = cloudwatch.describe_alarms(AlarmNames=[ALARM_NAME])
+    served = _snapshot_alarm()
+    if served is not None:
+        body, age = served
+        return {
+            "statusCode": 200,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*",
+                "Age": str(int(age)),
+            },
+            "body": json.dumps(body),
+        }
+
+    resp = _cloudwatch().describe_alarms(AlarmNames=[ALARM_NAME])
     alarms = resp.get("MetricAlarms", [])
 
     if not alarms:
@@ -73,6 +73,13 @@ resource "aws_apigatewayv2_route" "status_latency_route" {
   target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
 }
 
+# Route: GET /status/latency/history (stored probe rollups)
+resource "aws_apigatewayv2_route" "status_latency_history_route" {
+  api_id    = aws_apigatewayv2_api.status_api.id
+  route_key = "GET /status/latency/history"
+  target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
+}
+
 resource "aws_apigatewayv2_route" "status_health_route" {
   api_id    = aws_apigatewayv2_api.status_api.id
   route_key = "GET /status/health-checkers"
@@ -86,6 +93,27 @@ resource "aws_apigatewayv2_route" "status_metrics_route" {
   target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
 }
 
+# Route: GET /status/metrics/history (downsampled metric time series)
+resource "aws_apigatewayv2_route" "status_metrics_history_route" {
+  api_id    = aws_apigatewayv2_api.status_api.id
+  route_key = "GET /status/metrics/history"
+  target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
+}
+
+# Route: GET /status/all (latency + health + metrics in one invocation)
+resource "aws_apigatewayv2_route" "status_all_route" {
+  api_id    = aws_apigatewayv2_api.status_api.id
+  route_key = "GET /status/all"
+  target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
+}
+
+# Route: GET /status/slo (error-budget burn rates)
+resource "aws_apigatewayv2_route" "status_slo_route" {
+  api_id    = aws_apigatewayv2_api.status_api.id
+  route_key = "GET /status/slo"
+  target    = "integrations/${aws_apigatewayv2_integration.status_api_status_lambda.id}"
+}
+
 resource "aws_lambda_permission" "status_api_allow_invoke" {
   statement_id  = "AllowAPIGatewayInvokeStatusApiNew"
   action        = "lambda:InvokeFunction"
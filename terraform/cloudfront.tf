@@ -105,3 +105,15 @@ resource "aws_cloudfront_distribution" "site" {
     Name = "CloudFront for ${var.root_domain}"
   }
 }
+
+# Additional CloudFront metrics (incl. OriginLatency) for /status/metrics percentiles
+resource "aws_cloudfront_monitoring_subscription" "site" {
+  count           = var.enable_cloudfront_additional_metrics ? 1 : 0
+  distribution_id = aws_cloudfront_distribution.site.id
+
+  monitoring_subscription {
+    realtime_metrics_subscription_config {
+      realtime_metrics_subscription_status = "Enabled"
+    }
+  }
+}
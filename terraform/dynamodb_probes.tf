@@ -0,0 +1,27 @@
+############################################################
+# Probe-result rollups for the status API
+# - 1m/1h/1d latency rollups written by /status/latency
+# - TTL on expiresAt enforces bounded retention
+############################################################
+
+resource "aws_dynamodb_table" "probe_rollups" {
+  name         = "chris-nelson-dev-probe-rollups"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "series"
+  range_key    = "bucket"
+
+  attribute {
+    name = "series"
+    type = "S"
+  }
+
+  attribute {
+    name = "bucket"
+    type = "N"
+  }
+
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+}
@@ -31,6 +31,11 @@ resource "aws_iam_role_policy" "status_lambda_policy" {
         Action   = ["cloudwatch:DescribeAlarms"],
         Resource = "*"
       },
+      {
+        Effect   = "Allow",
+        Action   = ["s3:GetObject"],
+        Resource = "${aws_s3_bucket.status_snapshot.arn}/*"
+      },
       {
         Effect = "Allow",
         Action = [
@@ -83,10 +88,51 @@ resource "aws_iam_role_policy" "status_api_lambda_cloudwatch" {
         Effect = "Allow",
         Action = [
           "cloudwatch:GetMetricData",
-          "cloudwatch:ListMetrics"
+          "cloudwatch:ListMetrics",
+          "cloudwatch:DescribeAlarms"
         ],
         Resource = "*"
       }
     ]
   })
 }
+
+# Inline policy: read/write probe rollups
+resource "aws_iam_role_policy" "status_api_lambda_probe_rollups" {
+  name = "status-api-lambda-probe-rollups"
+  role = aws_iam_role.status_api_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Effect = "Allow",
+        Action = [
+          "dynamodb:UpdateItem",
+          "dynamodb:Query"
+        ],
+        Resource = aws_dynamodb_table.probe_rollups.arn
+      }
+    ]
+  })
+}
+
+# Inline policy: read/write the precomputed status snapshot
+resource "aws_iam_role_policy" "status_api_lambda_snapshot" {
+  name = "status-api-lambda-status-snapshot"
+  role = aws_iam_role.status_api_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Effect = "Allow",
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ],
+        Resource = "${aws_s3_bucket.status_snapshot.arn}/*"
+      }
+    ]
+  })
+}
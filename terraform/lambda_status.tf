@@ -24,7 +24,8 @@ resource "aws_lambda_function" "status" {
 
   environment {
     variables = {
-      ALARM_NAME = aws_cloudwatch_metric_alarm.site_health_alarm.alarm_name
+      ALARM_NAME      = aws_cloudwatch_metric_alarm.site_health_alarm.alarm_name
+      STATUS_SNAPSHOT = local.status_snapshot_location
     }
   }
 }
@@ -52,12 +53,17 @@ resource "aws_lambda_function" "status_api" {
   environment {
     variables = {
       ROUTE53_HEALTH_CHECK_ID  = aws_route53_health_check.site_https.id
+      ROUTE53_HEALTH_CHECK_IDS = join(",", [for name, id in var.extra_route53_health_checks : "${name}=${id}"])
       WAF_ENABLED              = var.enable_waf ? "true" : "false"
       WAF_BLOCK_COUNTRIES      = join(",", var.waf_block_countries)
       CF_DISTRIBUTION_ID       = aws_cloudfront_distribution.site.id
       WAF_WEB_ACL_METRIC_NAME  = var.create_waf ? aws_wafv2_web_acl.site[0].visibility_config[0].metric_name : ""
       WAF_REGION               = "Global"
       STATUS_API_FUNCTION_NAME = "chris-nelson-status-api"
+      PROBE_STORE              = "dynamodb:${aws_dynamodb_table.probe_rollups.name}"
+      PROBE_TARGETS            = jsonencode(var.probe_targets)
+      STATUS_SNAPSHOT          = local.status_snapshot_location
+      ALARM_NAME               = aws_cloudwatch_metric_alarm.site_health_alarm.alarm_name
     }
   }
 }
@@ -0,0 +1,71 @@
+############################################################
+# Precomputed status snapshot
+# - Versioned S3 object rebuilt every minute by the status API
+# - EventBridge schedule invokes the status API in refresh mode
+# - Both status Lambdas serve read routes from the snapshot
+############################################################
+
+resource "aws_s3_bucket" "status_snapshot" {
+  bucket        = "chris-nelson-dev-status-snapshot"
+  force_destroy = true
+
+  tags = {
+    Name = "Status API Snapshot Bucket"
+  }
+}
+
+resource "aws_s3_bucket_versioning" "status_snapshot" {
+  bucket = aws_s3_bucket.status_snapshot.id
+
+  versioning_configuration {
+    status = "Enabled"
+  }
+}
+
+# Keep a day of previous snapshots for debugging, then expire them
+resource "aws_s3_bucket_lifecycle_configuration" "status_snapshot" {
+  bucket = aws_s3_bucket.status_snapshot.id
+
+  rule {
+    id     = "expire-old-snapshots"
+    status = "Enabled"
+
+    filter {}
+
+    noncurrent_version_expiration {
+      noncurrent_days = 1
+    }
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "status_snapshot" {
+  bucket = aws_s3_bucket.status_snapshot.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_cloudwatch_event_rule" "status_snapshot_refresh" {
+  name                = "chris-nelson-dev-status-snapshot-refresh"
+  description         = "Rebuilds the status snapshot served by the status Lambdas"
+  schedule_expression = "rate(1 minute)"
+}
+
+resource "aws_cloudwatch_event_target" "status_snapshot_refresh" {
+  rule = aws_cloudwatch_event_rule.status_snapshot_refresh.name
+  arn  = aws_lambda_function.status_api.arn
+}
+
+resource "aws_lambda_permission" "status_snapshot_refresh" {
+  statement_id  = "AllowEventBridgeSnapshotRefresh"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.status_api.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.status_snapshot_refresh.arn
+}
+
+locals {
+  status_snapshot_location = "s3:${aws_s3_bucket.status_snapshot.bucket}/status-snapshot.json"
+}
@@ -66,3 +66,29 @@ variable "waf_block_countries" {
   default     = []
 }
 
+variable "probe_targets" {
+  description = "Targets probed by /status/latency; the first is the primary target"
+  type = list(object({
+    name         = string
+    host         = string
+    port         = optional(number, 443)
+    path         = optional(string, "/")
+    expectStatus = optional(number, 200)
+  }))
+  default = [
+    { name = "site", host = "chris-nelson.dev" },
+    { name = "www", host = "www.chris-nelson.dev" },
+  ]
+}
+
+variable "extra_route53_health_checks" {
+  description = "Additional Route 53 health checks reported by /status/health-checkers, as name => health check id"
+  type        = map(string)
+  default     = {}
+}
+
+variable "enable_cloudfront_additional_metrics" {
+  description = "Opt in to CloudFront additional metrics (billed per distribution) so OriginLatency percentiles are available; when off they are reported as null"
+  type        = bool
+  default     = false
+}
@@ -0,0 +1,21 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Shared fixtures: a local self-signed HTTPS origin the latency probes can target.
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bench"))
+
+
+@pytest.fixture(scope="session")
+def tls_origin(tmp_path_factory):
+  """Serve HTTPS on localhost and yield (host, port, client SSLContext trusting it)."""
+  if shutil.which("openssl") is None:
+    pytest.skip("openssl is required to mint the test certificate")
+
+  from fakes import TLSOrigin
+
+  with TLSOrigin(tmp_path_factory.mktemp("tls-origin")) as origin:
+    yield origin.host, origin.port, origin.client_context
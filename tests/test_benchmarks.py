@@ -0,0 +1,80 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Smoke test for bench/run_benchmarks.py so the offline suite keeps working as handlers change.
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bench"))
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl is required for the local TLS origin")
+def test_benchmark_suite_runs_offline_and_flags_drift(monkeypatch):
+  import run_benchmarks
+
+  import os
+
+  # setenv (unlike delenv of an absent key) is undone at teardown, and the
+  # run itself must hand the caller's values back
+  for key in run_benchmarks.BENCH_ENV:
+    monkeypatch.setenv(key, "from-caller")
+
+  report = run_benchmarks.build_report(iterations=1, cold_start_repeat=0)
+  assert all(os.environ[key] == "from-caller" for key in run_benchmarks.BENCH_ENV)
+
+  assert set(report["routes"]) == {f"{module} {route}" for module, route, _ in run_benchmarks.CASES}
+  latency = report["routes"]["status_api_handler /status/latency"]
+  assert latency["uncachedMedianMs"] > latency["cachedMedianMs"]
+  assert latency["peakAllocBytes"] > 0
+
+  assert run_benchmarks.compare(report, report, 0.3) == []
+  slower = {"routes": {name: {k: v / 2 for k, v in numbers.items()} for name, numbers in report["routes"].items()}}
+  assert run_benchmarks.compare(report, slower, 0.3)
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl is required for the local TLS origin")
+def test_local_server_and_load_generator_round_trip(monkeypatch):
+  import asyncio
+  import gzip
+  import json
+  import os
+
+  import load_test
+  import local_server
+  import run_benchmarks
+
+  for key in run_benchmarks.BENCH_ENV:
+    monkeypatch.setenv(key, "from-caller")
+
+  event = local_server.build_event("GET", "/status/all?sections=health&fields=a&fields=b", {"accept": "*/*"}, "192.0.2.9")
+  assert event["rawPath"] == "/status/all"
+  assert event["queryStringParameters"] == {"sections": "health", "fields": "a,b"}
+  assert event["requestContext"]["http"]["sourceIp"] == "192.0.2.9"
+  assert local_server.handler_for("/prod/status") == "status_handler"
+  assert local_server.handler_for("/status/metrics") == "status_api_handler"
+
+  async def scenario():
+    server = await local_server.LocalServer(containers=2).start()
+    try:
+      reader, writer = await asyncio.open_connection(server.host, server.port)
+      status, headers, body = await load_test._get(reader, writer, server.host, "/status/health-checkers")
+      writer.close()
+      level = await load_test.run_level(
+        server.host, server.port, ["/status/health-checkers", "/status"], concurrency=3, requests=12
+      )
+    finally:
+      await server.close()
+    return status, headers, body, level
+
+  status, headers, body, level = asyncio.run(scenario())
+
+  assert status == 200
+  assert headers["content-encoding"] in ("br", "gzip")
+  if headers["content-encoding"] == "gzip":
+    assert "regions" in json.loads(gzip.decompress(body))
+  assert level["requests"] == 12
+  assert level["statusCodes"] == {"200": 12}
+  assert level["throughputRps"] > 0
+  assert set(level["routes"]) == {"/status/health-checkers", "/status"}
+  assert all(os.environ[key] == "from-caller" for key in run_benchmarks.BENCH_ENV)
@@ -36,3 +36,965 @@ def test_waf_status_messages(monkeypatch):
   disabled = status_api.get_waf_status()
   assert disabled["enabled"] is False
   assert disabled["blocked_countries"] == []
+
+
+class _FakeCloudWatch:
+  # Serves canned GetMetricData pages and records every request.
+
+  def __init__(self, pages):
+    self.pages = list(pages)
+    self.calls = []
+
+  def get_metric_data(self, **kwargs):
+    self.calls.append(kwargs)
+    return self.pages.pop(0)
+
+
+def test_metrics_sections_share_one_paginated_batch(monkeypatch):
+  from datetime import datetime, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "CF_DISTRIBUTION_ID", "E123")
+  monkeypatch.setattr(status_api, "WAF_WEB_ACL_METRIC_NAME", "siteAcl")
+  monkeypatch.setattr(status_api, "STATUS_API_FUNCTION_NAME", "status-api")
+
+  ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  fake = _FakeCloudWatch([
+    {
+      "MetricDataResults": [
+        {"Id": "cloudfront_cf4xx", "Timestamps": [ts], "Values": [1.5], "StatusCode": "Complete"},
+        {"Id": "waf_wafallow", "Timestamps": [ts], "Values": [10.0], "StatusCode": "Complete"},
+      ],
+      "NextToken": "page-2",
+    },
+    {
+      "MetricDataResults": [
+        {"Id": "cloudfront_cf5xx", "Timestamps": [ts], "Values": [0.5], "StatusCode": "Complete"},
+        {"Id": "cloudfront_cfsuccess", "Timestamps": [ts], "Values": [98.0], "StatusCode": "Complete"},
+        {"Id": "cloudfront_cforiginp99", "Timestamps": [ts], "Values": [210.0], "StatusCode": "Complete"},
+        {
+          "Id": "lambda_lambdainv",
+          "Timestamps": [],
+          "Values": [],
+          "StatusCode": "Forbidden",
+          "Messages": [{"Code": "Forbidden", "Value": "denied"}],
+        },
+      ],
+    },
+  ])
+  monkeypatch.setattr(status_api, "_cloudwatch", lambda: fake)
+
+  body = status_api._build_metrics_response(None)
+
+  assert len(fake.calls) == 2
+  assert fake.calls[1]["NextToken"] == "page-2"
+  queries = {query["Id"]: query for query in fake.calls[0]["MetricDataQueries"]}
+  assert len(queries) == 16
+  assert queries["cloudfront_cfsuccess"]["Expression"] == "100 - (cloudfront_cf4xx + cloudfront_cf5xx)"
+  assert queries["lambda_lambdaok"]["Expression"] == "100 * (lambda_lambdainv - lambda_lambdaerr) / lambda_lambdainv"
+  assert queries["lambda_lambdamsp90"]["MetricStat"]["Stat"] == "p90"
+  assert body["cloudfront"]["error4xxRate"] == 1.5
+  assert body["cloudfront"]["success2xxRate"] == 98.0
+  assert body["cloudfront"]["originLatencyMs"] == {"p50": None, "p90": None, "p99": 210.0}
+  assert body["waf"]["allowedRequests"] == 10.0
+  assert "lambdainv: Forbidden" in body["lambda"]["error"]
+
+
+def test_response_cache_ttl_and_stale_on_failure(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+  clock = [1000.0]
+  monkeypatch.setattr(status_api.time, "monotonic", lambda: clock[0])
+
+  bodies = [{"value": 1}, {"error": "route53 down"}]
+  build = lambda: bodies.pop(0)
+
+  first, info = status_api._cached_response("health-checkers", {}, build)
+  assert info == {"hit": False, "stale": False, "ageSeconds": 0.0}
+
+  clock[0] += 10
+  second, info = status_api._cached_response("health-checkers", {}, build)
+  assert second["body"]["value"] == 1
+  assert second["payload"] is first["payload"]
+  assert info["hit"] is True
+  assert info["ageSeconds"] == 10.0
+
+  # Past the TTL the rebuild fails, so the old body is served as stale.
+  clock[0] += 60
+  third, info = status_api._cached_response("health-checkers", {}, build)
+  assert third["body"]["value"] == 1
+  assert info["stale"] is True
+
+
+def test_config_errors_and_probe_extras_are_cached_normally(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "CF_DISTRIBUTION_ID", "")
+
+  unconfigured = {"cloudfront": status_api._build_cloudfront_metrics(None)}
+  assert not status_api._is_upstream_failure(unconfigured)
+  assert status_api._cache_control("metrics", unconfigured, {}).startswith("public, max-age=")
+
+  with_extras = {
+    "measurementOk": True,
+    "edges": {"error": "DNS lookup failed"},
+    "warmPath": {"error": "reset by peer"},
+  }
+  assert not status_api._is_upstream_failure(with_extras)
+
+  # Real dependency failures, top level or in a section, still aren't cached.
+  assert status_api._is_upstream_failure({"measurementOk": False})
+  assert status_api._is_upstream_failure({"lambda": {"error": "Throttling"}})
+  assert status_api._cache_control("metrics", {"error": "route53 down"}, {}) == "no-store"
+
+
+class _FakeContext:
+  function_name = "status-api"
+
+  def __init__(self, remaining_ms):
+    self.remaining_ms = remaining_ms
+
+  def get_remaining_time_in_millis(self):
+    return self.remaining_ms
+
+
+def test_fan_out_runs_concurrently_and_reports_timeouts(monkeypatch):
+  import time
+
+  status_api = _load_status_api(monkeypatch)
+
+  deadline = status_api._deadline_from_context(_FakeContext(1300))
+  started = time.monotonic()
+  results = status_api._fan_out(
+    {
+      "fast_a": lambda: time.sleep(0.05) or "a",
+      "fast_b": lambda: time.sleep(0.05) or "b",
+      "slow": lambda: time.sleep(1.0),
+      "broken": lambda: 1 / 0,
+    },
+    deadline,
+  )
+  elapsed = time.monotonic() - started
+
+  assert results["fast_a"] == "a"
+  assert results["fast_b"] == "b"
+  assert results["slow"]["timedOut"] is True
+  assert "broken failed" in results["broken"]["error"]
+  assert elapsed < 0.6
+
+
+def test_latency_probe_summarizes_each_phase(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+
+  ttfbs = iter([30.0, 10.0, 20.0, 40.0, 50.0])
+
+  def fake_measure(**kwargs):
+    return {
+      "dnsMs": 1.0,
+      "tcpConnectMs": 2.0,
+      "tlsHandshakeMs": 3.0,
+      "ttfbMs": next(ttfbs),
+      "statusCode": 200,
+      "statusReason": "OK",
+      "peerIp": "192.0.2.1",
+      "ok": True,
+    }
+
+  monkeypatch.setattr(status_api, "_measure_site", fake_measure)
+  monkeypatch.setattr(status_api, "_probe_edges", lambda **kwargs: {"addresses": []})
+  monkeypatch.setattr(status_api, "_measure_warm_path", lambda **kwargs: {"ok": True})
+  body = status_api._build_latency_response({"samples": "5"}, _FakeContext(9000))
+
+  ttfb = body["phases"]["ttfbMs"]
+  assert body["samplesTaken"] == 5
+  assert (ttfb["min"], ttfb["median"], ttfb["max"]) == (10.0, 30.0, 50.0)
+  assert ttfb["p90"] == 46.0
+  assert ttfb["jitter"] == 15.0
+  assert body["sslHandshakeMs"] == 5.0
+  assert body["measurementOk"] is True
+  assert body["recent"]["phases"]["ttfbMs"]["count"] == 5
+  assert body["recent"]["phases"]["dnsMs"]["p99"] == 1.0
+
+  assert status_api._requested_samples({"samples": "500"}) == status_api.MAX_PROBE_SAMPLES
+  assert status_api._requested_samples({"samples": "nope"}) == status_api.DEFAULT_PROBE_SAMPLES
+
+
+def test_edge_probe_covers_every_address_concurrently(monkeypatch):
+  import asyncio
+  import socket
+
+  status_api = _load_status_api(monkeypatch)
+
+  def fake_getaddrinfo(host, port, *args, **kwargs):
+    return [
+      (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port)),
+      (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.2", port)),
+      (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.2", port)),
+      (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", port, 0, 0)),
+    ]
+
+  latencies = {"192.0.2.1": 30.0, "192.0.2.2": 10.0, "2001:db8::1": 20.0}
+
+  async def fake_probe(host, port, path, family, sockaddr, timeout):
+    await asyncio.sleep(0.2)
+    ms = latencies[sockaddr[0]]
+    return {
+      "ip": sockaddr[0],
+      "family": "IPv6" if family == socket.AF_INET6 else "IPv4",
+      "tcpConnectMs": ms,
+      "tlsHandshakeMs": ms,
+      "ttfbMs": ms,
+      "ok": True,
+    }
+
+  monkeypatch.setattr(status_api.socket, "getaddrinfo", fake_getaddrinfo)
+  monkeypatch.setattr(status_api, "_probe_address", fake_probe)
+
+  edges = status_api._probe_edges(host="example.test")
+
+  assert edges["probed"] == 3
+  assert {a["family"] for a in edges["addresses"]} == {"IPv4", "IPv6"}
+  assert edges["fastest"] == "192.0.2.2"
+  assert edges["slowest"] == "192.0.2.1"
+  assert edges["wallMs"] < 450
+
+
+def test_warm_path_reuses_connection_and_session(monkeypatch, tls_origin):
+  host, port, client_ctx = tls_origin
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "_ssl_context", client_ctx)
+
+  cold = status_api._measure_site(host=host, port=port, path="/")
+  assert cold["ok"] is True
+  assert cold["statusCode"] == 200
+
+  warm = status_api._measure_warm_path(host=host, port=port, path="/")
+  assert warm["ok"] is True, warm
+  assert warm["requestsOnConnection"] == status_api.KEEPALIVE_REQUESTS
+  assert warm["reusedConnectionTtfbMs"]["median"] > 0
+  assert warm["sessionReused"] is True
+
+
+def test_lttb_keeps_endpoints_and_peaks(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+
+  series = [(float(i), 0.0) for i in range(100)]
+  series[37] = (37.0, 50.0)
+  sampled = status_api._downsample_lttb(series, 10)
+
+  assert len(sampled) == 10
+  assert sampled[0] == series[0]
+  assert sampled[-1] == series[-1]
+  assert (37.0, 50.0) in sampled
+
+
+def test_metrics_history_is_columnar_and_downsampled(monkeypatch):
+  from datetime import datetime, timedelta, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "CF_DISTRIBUTION_ID", "E123")
+  monkeypatch.setattr(status_api, "STATUS_API_FUNCTION_NAME", "")
+
+  base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  stamps = [base + timedelta(minutes=i) for i in range(60)]
+  fake = _FakeCloudWatch([
+    {
+      "MetricDataResults": [
+        {"Id": "cloudfront_cf4xx", "Timestamps": list(reversed(stamps)), "Values": [float(i) for i in range(60)]},
+        {"Id": "cloudfront_cf5xx", "Timestamps": [], "Values": []},
+      ],
+    },
+  ])
+  monkeypatch.setattr(status_api, "_cloudwatch", lambda: fake)
+
+  body = status_api._build_metrics_history_response({"windowMinutes": "60", "points": "20"}, None)
+
+  cf4 = body["series"]["cloudfront"]["error4xxRate"]
+  assert fake.calls[0]["MetricDataQueries"][0]["MetricStat"]["Period"] == 60
+  assert len(cf4["timestamps"]) == len(cf4["values"]) == 20
+  assert cf4["timestamps"][0] == int(base.timestamp())
+  assert cf4["timestamps"] == sorted(cf4["timestamps"])
+  assert cf4["rawPoints"] == 60
+  assert body["series"]["cloudfront"]["error5xxRate"]["values"] == []
+  assert "error" in body["series"]["lambda"]
+
+
+def _probe_sample(ttfb_ms, ok=True):
+  return {"dnsMs": 1.0, "tcpConnectMs": 5.0, "tlsHandshakeMs": 10.0, "ttfbMs": ttfb_ms, "ok": ok}
+
+
+def test_probe_rollups_answer_trends_without_raw_samples(monkeypatch):
+  import time
+
+  status_api = _load_status_api(monkeypatch)
+  store = status_api.SQLiteProbeStore(":memory:")
+  now = time.time()
+
+  for minutes_ago in range(0, 120, 10):
+    samples = [_probe_sample(100.0 + i) for i in range(9)] + [_probe_sample(1000.0), _probe_sample(0, ok=False)]
+    status_api._record_probe_samples(store, "example.test", samples, now=now - minutes_ago * 60)
+
+  history = status_api._query_probe_history(store, "example.test", 180, "ttfbMs", now=now)
+
+  assert history["resolution"] == "1m"
+  assert history["probes"] == 12 * 11
+  assert history["failures"] == 12
+  assert len(history["timestamps"]) == 12
+  assert history["summary"]["count"] == 12 * 10
+  assert abs(history["summary"]["p50"] - 104.0) / 104.0 < 0.05
+  assert abs(history["summary"]["p99"] - 1000.0) / 1000.0 < 0.05
+
+  # Daily rollups hold the same data in far fewer rows.
+  assert len(store.query("example.test#1d", 0, int(now))) <= 2
+
+  assert store.compact(int(now) + 3 * 86400) > 0
+  assert store.query("example.test#1m", 0, int(now)) == []
+
+
+def test_probe_rollups_are_recorded_off_the_read_path(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+  store = status_api.SQLiteProbeStore(":memory:")
+  monkeypatch.setattr(status_api, "_probe_store", lambda: store)
+  monkeypatch.setattr(status_api, "_measure_site", lambda **kwargs: dict(
+    _probe_sample(20.0), statusCode=200, statusReason="OK", peerIp="192.0.2.1"
+  ))
+  monkeypatch.setattr(status_api, "_probe_edges", lambda **kwargs: {"addresses": []})
+  monkeypatch.setattr(status_api, "_measure_warm_path", lambda **kwargs: {"ok": True})
+  monkeypatch.setattr(status_api, "STATUS_SNAPSHOT", "dir:/unused")
+
+  # With a snapshot configured, read requests leave recording to the scheduled refresh
+  assert status_api._build_latency_response({"samples": "1"}, _FakeContext(9000))["stored"] is False
+  assert store.query("chris-nelson.dev#1m", 0, 2 ** 40) == []
+
+  status_api._reset_stage_timings()
+  assert status_api._build_latency_response({"samples": "1"}, _FakeContext(9000), record=True)["stored"] is True
+  assert len(store.query("chris-nelson.dev#1m", 0, 2 ** 40)) == 1
+  assert status_api._stage_snapshot()["rollups"][1] == 1
+
+  # A failing store trips its breaker instead of slowing every refresh
+  monkeypatch.setattr(status_api, "_record_probe_samples", lambda *args: (_ for _ in ()).throw(OSError("throttled")))
+  for _ in range(status_api.BREAKER_FAILURE_THRESHOLD):
+    assert status_api._build_latency_response({"samples": "1"}, _FakeContext(9000), record=True)["stored"] is False
+  assert status_api._breaker("rollups").state == "open"
+
+
+def test_dynamodb_probe_store_applies_deltas_with_add(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+
+  class FakeDynamo:
+    def __init__(self):
+      self.updates = []
+
+    def update_item(self, **kwargs):
+      self.updates.append(kwargs)
+
+  client = FakeDynamo()
+  store = status_api.DynamoDBProbeStore("probe-rollups", client=client)
+  status_api._record_probe_samples(store, "example.test", [_probe_sample(50.0)], now=7200.0)
+
+  assert [u["Key"]["series"]["S"] for u in client.updates] == [
+    "example.test#1m", "example.test#1h", "example.test#1d",
+  ]
+  update = client.updates[1]
+  assert update["Key"]["bucket"]["N"] == "7200"
+  assert " ADD " in update["UpdateExpression"]
+  assert "n_ttfbMs" in update["ExpressionAttributeNames"].values()
+
+
+def test_handler_sends_validators_and_answers_304(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+  generated = iter(["2024-01-01T00:00:00", "2024-01-01T00:01:00"])
+  monkeypatch.setattr(
+    status_api,
+    "_build_health_response",
+    lambda **kwargs: {"generatedAt": next(generated), "regions": [{"status": "HEALTHY"}]},
+  )
+  event = {"rawPath": "/prod/status/health-checkers", "headers": {}}
+
+  first = status_api.lambda_handler(event, None)
+  etag = first["headers"]["ETag"]
+  assert first["statusCode"] == 200
+  assert first["headers"]["Cache-Control"].startswith("public, max-age=30")
+
+  # Same data after a rebuild keeps the validator.
+  status_api._response_cache.clear()
+  event["headers"] = {"If-None-Match": etag}
+  second = status_api.lambda_handler(event, None)
+  assert second["statusCode"] == 304
+  assert second["body"] == ""
+  assert second["headers"]["ETag"] == etag
+
+  missing = status_api.lambda_handler({"rawPath": "/nope"}, None)
+  assert missing["headers"]["Cache-Control"] == "no-store"
+  assert "ETag" not in missing["headers"]
+
+
+def test_large_responses_are_compressed_once_and_base64_encoded(monkeypatch):
+  import base64
+  import gzip
+  import json
+
+  status_api = _load_status_api(monkeypatch)
+  regions = [{"regionCode": f"region-{i}", "message": "Success: HTTP Status Code 200, OK"} for i in range(50)]
+  monkeypatch.setattr(status_api, "_build_health_response", lambda **kwargs: {"regions": regions})
+  event = {"rawPath": "/status/health-checkers", "headers": {"accept-encoding": "br;q=0, gzip, deflate"}}
+
+  first = status_api.lambda_handler(event, None)
+  assert first["isBase64Encoded"] is True
+  assert first["headers"]["Content-Encoding"] == "gzip"
+  assert first["headers"]["X-Cache"] == "Miss"
+  assert json.loads(gzip.decompress(base64.b64decode(first["body"])))["regions"] == regions
+
+  second = status_api.lambda_handler(event, None)
+  assert second["body"] == first["body"]
+  assert second["headers"]["X-Cache"] == "Hit"
+
+  plain = status_api.lambda_handler({"rawPath": "/status/health-checkers"}, None)
+  assert plain["isBase64Encoded"] is False
+  assert "Content-Encoding" not in plain["headers"]
+  assert status_api._choose_encoding("identity, gzip;q=0") is None
+
+
+def test_all_route_builds_selected_sections_with_shared_waf(monkeypatch):
+  import json
+
+  status_api = _load_status_api(monkeypatch)
+  calls = {"waf": 0, "metrics": None}
+
+  def fake_waf():
+    calls["waf"] += 1
+    return {"enabled": False}
+
+  def fake_metrics(context, waf_status=None, only=None):
+    calls["metrics"] = only
+    assert waf_status == {"enabled": False}
+    return {"version": "v1", "cloudfront": {"error5xxRate": 0.1, "error4xxRate": 2.0}, "windowMinutes": 60}
+
+  def fail_latency(*args, **kwargs):
+    raise AssertionError("latency should not be built")
+
+  monkeypatch.setattr(status_api, "get_waf_status", fake_waf)
+  monkeypatch.setattr(status_api, "_build_metrics_response", fake_metrics)
+  monkeypatch.setattr(status_api, "_build_latency_response", fail_latency)
+  monkeypatch.setattr(status_api, "_build_health_response", lambda waf=None, context=None: {"regions": [], "waf": waf})
+
+  event = {
+    "rawPath": "/status/all",
+    "queryStringParameters": {"sections": "health,metrics", "fields": "health.regions,metrics.cloudfront.error5xxRate"},
+  }
+  body = json.loads(status_api.lambda_handler(event, None)["body"])
+
+  assert calls["waf"] == 1
+  assert calls["metrics"] == ["cloudfront"]
+  assert body["sections"] == ["health", "metrics"]
+  assert body["health"] == {"regions": []}
+  assert body["metrics"] == {"cloudfront": {"error5xxRate": 0.1}}
+  assert "waf" not in body
+
+
+def test_all_route_sections_do_not_starve_their_own_fan_outs(monkeypatch):
+  import time
+
+  status_api = _load_status_api(monkeypatch)
+  # A shared pool smaller than the section count would deadlock if the
+  # sections took its workers while waiting on their inner calls.
+  monkeypatch.setattr(status_api, "FAN_OUT_WORKERS", 2)
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+
+  def section(*args, **kwargs):
+    deadline = time.monotonic() + 2.0
+    return status_api._fan_out({"a": lambda: time.sleep(0.05) or 1, "b": lambda: 2}, deadline)
+
+  monkeypatch.setattr(status_api, "_build_latency_response", section)
+  monkeypatch.setattr(status_api, "_build_health_response", section)
+  monkeypatch.setattr(status_api, "_build_metrics_response", section)
+
+  started = time.monotonic()
+  body = status_api._build_all_response({}, _FakeContext(5000))
+
+  assert time.monotonic() - started < 1.0
+  for name in ("latency", "health", "metrics"):
+    assert body[name] == {"a": 1, "b": 2}
+
+
+def test_latency_probes_every_configured_target(monkeypatch, tls_origin):
+  import json
+
+  host, port, client_ctx = tls_origin
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "_ssl_context", client_ctx)
+  monkeypatch.setenv("PROBE_TARGETS", json.dumps([
+    {"name": "origin", "host": host, "port": port},
+    {"name": "expects-redirect", "host": host, "port": port, "path": "/old", "expectStatus": 301},
+    {"name": "closed", "host": "127.0.0.1", "port": 1, "timeoutSeconds": 0.5},
+  ]))
+
+  body = status_api._build_latency_response({"samples": "2"}, _FakeContext(9000), extras=())
+
+  by_name = {target["name"]: target for target in body["targets"]}
+  assert body["targetPort"] == port
+  assert body["measurementOk"] is True
+  assert by_name["origin"]["statusOk"] is True
+  assert by_name["origin"]["phases"]["ttfbMs"]["median"] > 0
+  assert by_name["expects-redirect"]["statusCode"] == 200
+  assert by_name["expects-redirect"]["statusOk"] is False
+  assert by_name["closed"]["measurementOk"] is False
+  assert body["allTargetsOk"] is False
+
+  monkeypatch.setenv("PROBE_TARGETS", "[{\"port\": 443}]")
+  assert "Invalid PROBE_TARGETS" in status_api._build_latency_response({}, None)["error"]
+
+
+def test_handler_reports_stage_timings_as_server_timing_and_emf(monkeypatch, capsys):
+  import json
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "METRICS_NAMESPACE", "Test/StatusApi")
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "check-1")
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+
+  class _FakeRoute53:
+    def get_health_check_status(self, HealthCheckId):
+      return {"HealthCheckObservations": []}
+
+  monkeypatch.setattr(status_api, "_route53", lambda: _FakeRoute53())
+
+  response = status_api.lambda_handler({"rawPath": "/status/health-checkers"}, None)
+  timing = response["headers"]["Server-Timing"]
+  assert "route53;dur=" in timing
+  assert "serialize;dur=" in timing
+  assert timing.split(", ")[-1].startswith("total;dur=")
+  assert "Server-Timing" in response["headers"]["Access-Control-Expose-Headers"]
+
+  record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+  directive = record["_aws"]["CloudWatchMetrics"][0]
+  assert directive["Dimensions"] == [["Route"]]
+  assert {"Name": "route53Ms", "Unit": "Milliseconds"} in directive["Metrics"]
+  assert record["Route"] == "health-checkers"
+  assert record["route53Calls"] == 1
+  assert record["Cache"] == "Miss"
+
+  # A cache hit makes no upstream call, so the stage disappears.
+  status_api.lambda_handler({"rawPath": "/status/health-checkers"}, None)
+  assert "route53Ms" not in json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+
+
+def test_timed_out_tasks_do_not_leak_stage_timings_into_the_next_invocation(monkeypatch):
+  import threading
+  import time
+
+  status_api = _load_status_api(monkeypatch)
+  finished = threading.Event()
+
+  def slow():
+    with status_api._timed("late"):
+      time.sleep(0.3)
+    finished.set()
+
+  status_api._reset_stage_timings()
+  results = status_api._fan_out(
+    {"slow": slow, "fast": lambda: status_api._record_stage("fast", 1.0)},
+    time.monotonic() + 0.05,
+  )
+  assert results["slow"]["timedOut"] is True
+  assert "fast" in status_api._stage_snapshot()
+
+  # The next invocation starts before the abandoned task finishes.
+  status_api._reset_stage_timings()
+  assert finished.wait(2.0)
+  assert status_api._stage_snapshot() == {}
+
+
+def test_health_checks_are_fetched_concurrently_with_quorum(monkeypatch):
+  import threading
+  from datetime import datetime, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "site-check")
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_IDS", "api=api-check, assets-check, site-check")
+  barrier = threading.Barrier(3, timeout=2)
+  checked = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+  def obs(region, status):
+    return {"Region": region, "IPAddress": "192.0.2.1", "StatusReport": {"Status": status, "CheckedTime": checked}}
+
+  class _FakeRoute53:
+    def get_health_check_status(self, HealthCheckId):
+      barrier.wait()  # only passes if all three checks are in flight at once
+      if HealthCheckId == "assets-check":
+        raise RuntimeError("throttled")
+      failing = "Failure: HTTP Status Code 503, Service Unavailable"
+      statuses = ["Success: HTTP Status Code 200, OK"] * 2 + [failing if HealthCheckId == "api-check" else "Success"]
+      return {"HealthCheckObservations": [obs(f"r{i}", text) for i, text in enumerate(statuses)]}
+
+  monkeypatch.setattr(status_api, "_route53", lambda: _FakeRoute53())
+
+  body = status_api._build_health_response({"enabled": False}, _FakeContext(5000))
+
+  assert [check["name"] for check in body["checks"]] == ["site", "api", "assets-check"]
+  site, api, assets = body["checks"]
+  # The first check's regions are only in the top-level list
+  assert "regions" not in site and len(body["regions"]) == 3
+  assert (site["healthy"], site["total"], site["quorum"]) == (3, 3, True)
+  assert api["healthy"] == 2 and api["worstRegion"]["httpStatusCode"] == 503
+  assert "throttled" in assets["error"]
+  assert body["quorum"]["healthy"] == 5
+  assert body["quorum"]["total"] == 6
+  assert body["quorum"]["checksInQuorum"] == 2
+  assert body["quorum"]["checksTotal"] == 3
+  assert body["quorum"]["worstRegion"]["check"] == "api"
+  assert "error" not in body
+
+
+def test_circuit_breaker_fails_fast_and_serves_last_good_body(monkeypatch):
+  import json
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "check-1")
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+  # Always rebuild, but keep the last good body for the stale window.
+  monkeypatch.setitem(status_api.CACHE_POLICIES, "health-checkers", (0.0, 300.0, 16))
+  clock = {"now": 0.0}
+  status_api._breakers["route53"] = status_api.CircuitBreaker("route53", clock=lambda: clock["now"])
+
+  class _Throttled(Exception):
+    response = {"Error": {"Code": "Throttling"}}
+
+  class _FakeRoute53:
+    def __init__(self):
+      self.calls = 0
+      self.fail = False
+
+    def get_health_check_status(self, HealthCheckId):
+      self.calls += 1
+      if self.fail:
+        raise _Throttled("Rate exceeded")
+      return {"HealthCheckObservations": []}
+
+  fake = _FakeRoute53()
+  monkeypatch.setattr(status_api, "_route53", lambda: fake)
+  event = {"rawPath": "/status/health-checkers"}
+
+  good = status_api.lambda_handler(event, None)
+  assert json.loads(good["body"])["dependencies"] == {"route53": {"state": "closed"}}
+
+  # One throttle opens the circuit; the last good body is served meanwhile.
+  fake.fail = True
+  first_stale = status_api.lambda_handler(event, None)
+  second_stale = status_api.lambda_handler(event, None)
+  assert fake.calls == 2
+  assert second_stale["body"] == first_stale["body"] == good["body"]
+  assert second_stale["headers"]["X-Cache"] == "Stale"
+  assert second_stale["headers"]["X-Circuit-Breakers"] == "route53=open"
+
+  failed = status_api._build_health_response()
+  assert "circuit is open" in failed["error"]
+  state = failed["dependencies"]["route53"]
+  assert state["lastError"] == "throttled: Rate exceeded"
+  assert status_api.BREAKER_BASE_COOLDOWN_SECONDS / 2 <= state["retryInSeconds"] <= status_api.BREAKER_BASE_COOLDOWN_SECONDS
+
+  # After the cooldown one trial call goes through; its failure doubles the cooldown.
+  clock["now"] = state["retryInSeconds"] + 0.1
+  assert "Rate exceeded" in status_api._build_health_response()["error"]
+  assert fake.calls == 3
+  assert status_api._breakers["route53"].snapshot()["retryInSeconds"] >= status_api.BREAKER_BASE_COOLDOWN_SECONDS
+
+  fake.fail = False
+  clock["now"] += status_api.BREAKER_BASE_COOLDOWN_SECONDS * 2
+  assert "error" not in status_api._build_health_response()
+  assert status_api._breakers["route53"].snapshot() == {"state": "closed"}
+
+
+def test_scheduled_refresh_writes_snapshot_served_by_read_routes(monkeypatch, tmp_path):
+  import json
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "STATUS_SNAPSHOT", f"dir:{tmp_path}")
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+  health = {"body": {"regions": [{"status": "HEALTHY"}]}}
+  monkeypatch.setattr(status_api, "_build_latency_response", lambda query, context, record=None: {"measurementOk": True})
+  monkeypatch.setattr(status_api, "_build_health_response", lambda waf=None, context=None: health["body"])
+  monkeypatch.setattr(status_api, "_build_metrics_response", lambda context, waf=None: {"cloudfront": {}})
+  monkeypatch.setattr(status_api, "_build_alarm_response", lambda: {"status": "OK"})
+
+  refreshed = status_api.lambda_handler({"detail-type": "Scheduled Event", "source": "aws.events"}, None)
+  assert refreshed["refreshed"] is True
+  snapshot = json.loads((tmp_path / "status-snapshot.json").read_text())
+  assert set(snapshot["bodies"]) == {"latency", "health", "metrics", "alarm"}
+
+  # A failed rebuild keeps the previous good section and its age.
+  health["body"] = {"regions": [], "error": "Route 53 down"}
+  assert status_api.lambda_handler({"refresh": True}, None)["carriedOver"] == ["health"]
+
+  def no_live_builds(*args, **kwargs):
+    raise AssertionError("read routes should be served from the snapshot")
+
+  monkeypatch.setattr(status_api, "_cached_response", no_live_builds)
+  status_api._snapshot_state.update(checkedAt=None, snapshot=None, tag=None, rendered={})
+  response = status_api.lambda_handler({"rawPath": "/status/health-checkers"}, None)
+  body = json.loads(response["body"])
+  assert body["regions"] == [{"status": "HEALTHY"}]
+  assert body["snapshot"]["version"] >= snapshot["version"]
+  assert response["headers"]["X-Cache"] == "Snapshot"
+  assert int(response["headers"]["Age"]) <= 1
+  assert response["headers"]["Cache-Control"].startswith("public, max-age=")
+
+  # Query variants and stale snapshots fall back to live builds.
+  monkeypatch.setattr(status_api, "SNAPSHOT_MAX_AGE_SECONDS", -1)
+  assert status_api._snapshot_response("health-checkers", {}) is None
+  assert status_api._snapshot_response("latency", {"samples": "5"}) is None
+
+
+def test_scheduled_refresh_reports_a_failed_snapshot_write(monkeypatch):
+  status_api = _load_status_api(monkeypatch)
+
+  class _BrokenStore:
+    def read(self, tag):
+      return None
+
+    def write(self, snapshot):
+      raise OSError("bucket unavailable")
+
+  monkeypatch.setattr(status_api, "_snapshot_store", lambda: _BrokenStore())
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+  monkeypatch.setattr(status_api, "_build_latency_response", lambda query, context, record=None: {"measurementOk": True})
+  monkeypatch.setattr(status_api, "_build_health_response", lambda waf=None, context=None: {"regions": []})
+  monkeypatch.setattr(status_api, "_build_metrics_response", lambda context, waf=None: {"cloudfront": {}})
+  monkeypatch.setattr(status_api, "_build_alarm_response", lambda: {"status": "OK"})
+
+  result = status_api.lambda_handler({"refresh": True}, None)
+  assert result["refreshed"] is False
+  assert "bucket unavailable" in result["error"]
+  assert sorted(result["built"]) == ["alarm", "health", "latency", "metrics"]
+  assert status_api._breakers["snapshot"].snapshot()["consecutiveFailures"] == 1
+  assert status_api._snapshot_state["snapshot"] is None
+
+
+def test_latency_sketch_is_accurate_mergeable_and_windowed(monkeypatch):
+  import json
+  import random
+
+  status_api = _load_status_api(monkeypatch)
+  rng = random.Random(7)
+  values = [rng.lognormvariate(3.5, 0.8) for _ in range(5000)]
+  exact = sorted(values)
+
+  left, right = status_api.LatencySketch(), status_api.LatencySketch()
+  for i, value in enumerate(values):
+    (left if i % 2 else right).add(value)
+  restored = status_api.LatencySketch.from_dict(json.loads(json.dumps(right.to_dict())))
+  merged = status_api.LatencySketch().merge(left).merge(restored)
+
+  assert merged.count == 5000
+  assert len(merged.counts) == status_api.LatencySketch.size
+  for q in (0.50, 0.90, 0.99):
+    assert abs(merged.quantile(q) - exact[int(q * 5000) - 1]) / exact[int(q * 5000) - 1] < 0.03
+  assert merged.quantile(1.0) == max(values)
+
+  # Percentiles cover the current and previous window only.
+  window = status_api.SKETCH_WINDOW_SECONDS
+  status_api._record_sketch_samples("site", [_probe_sample(10.0)], now=0)
+  status_api._record_sketch_samples("site", [_probe_sample(20.0), _probe_sample(99.0, ok=False)], now=window)
+  assert status_api._recent_latency("site")["phases"]["ttfbMs"]["count"] == 2
+  status_api._record_sketch_samples("site", [_probe_sample(30.0)], now=2 * window)
+  recent = status_api._recent_latency("site", include_sketches=True)
+  assert recent["phases"]["ttfbMs"]["count"] == 2
+  assert recent["phases"]["ttfbMs"]["p50"] == 20.0
+  assert recent["sketches"]["ttfbMs"]["count"] == 2
+
+
+def test_site_probe_reads_full_response_with_cdn_headers(monkeypatch, tls_origin):
+  host, port, client_ctx = tls_origin
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "_ssl_context", client_ctx)
+
+  hit = status_api._measure_site(host=host, port=port, path="/", timeout=2.0)
+  miss = status_api._measure_site(host=host, port=port, path="/chunked", timeout=2.0)
+
+  body_size = len(b"<html>" + b"status origin " * 512 + b"</html>")
+  for sample in (hit, miss):
+    assert sample["ok"] is True
+    assert sample["statusCode"] == 200
+    assert sample["edgePop"] == "LOCAL50-C1"
+    assert sample["responseBytes"] == body_size
+    assert sample["bodyComplete"] is True
+    assert sample["transferMs"] >= 0
+  assert (hit["cache"], miss["cache"]) == ("Hit", "Miss")
+
+  cdn = status_api._summarize_cdn([hit, miss])
+  assert cdn["cacheResults"] == {"Hit": 1, "Miss": 1}
+  assert cdn["edgePops"] == ["LOCAL50-C1"]
+  assert set(cdn["ttfbMsByCache"]) == {"Hit", "Miss"}
+
+
+def test_truncated_responses_are_not_reported_complete(monkeypatch):
+  import io
+
+  status_api = _load_status_api(monkeypatch)
+  head = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+
+  full = status_api._read_http_response(io.BytesIO(head + b"5\r\nhello\r\n0\r\n\r\n"))
+  assert (full["bodyBytes"], full["complete"]) == (5, True)
+
+  # EOF where the next chunk-size line (or the rest of a chunk) should be.
+  for cut in (b"5\r\nhello\r\n", b"5\r\nhel"):
+    truncated = status_api._read_http_response(io.BytesIO(head + cut))
+    assert truncated["complete"] is False
+
+  short = status_api._read_http_response(io.BytesIO(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nhello"))
+  assert (short["bodyBytes"], short["complete"]) == (5, False)
+
+
+def test_compact_health_format_uses_columns_and_a_string_table(monkeypatch):
+  import json
+  from datetime import datetime, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "check-1")
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+  checked = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+  class _FakeRoute53:
+    def get_health_check_status(self, HealthCheckId):
+      statuses = ["Success: HTTP Status Code 200, OK"] * 7 + ["Failure: HTTP Status Code 503, Service Unavailable"]
+      return {"HealthCheckObservations": [
+        {"Region": f"us-west-{i}", "IPAddress": "192.0.2.1", "StatusReport": {"Status": text, "CheckedTime": checked}}
+        for i, text in enumerate(statuses)
+      ]}
+
+  monkeypatch.setattr(status_api, "_route53", lambda: _FakeRoute53())
+
+  default = status_api.lambda_handler({"rawPath": "/status/health-checkers"}, None)
+  compact = status_api.lambda_handler(
+    {"rawPath": "/status/health-checkers", "queryStringParameters": {"format": "compact"}}, None
+  )
+  verbose, body = json.loads(default["body"]), json.loads(compact["body"])
+  assert "format" not in verbose and isinstance(verbose["regions"], list)
+  assert len(compact["body"]) < len(default["body"])
+
+  regions, strings = body["regions"], body["strings"]
+  assert body["format"] == "compact"
+  assert regions["count"] == 8
+  assert len(set(regions["message"])) == 2
+  assert regions["checkedTime"][0] == int(checked.timestamp())
+  first = {field: regions[field][0] for field in status_api.COMPACT_REGION_FIELDS}
+  for field in status_api.COMPACT_STRING_FIELDS:
+    first[field] = strings[first[field]]
+  first["checkedTime"] = checked.isoformat()
+  assert first == verbose["regions"][0]
+
+  # A single check is not repeated under "checks"
+  assert "checks" not in verbose and "checks" not in body
+  worst = body["quorum"]["worstRegion"]
+  assert worst["check"] == "site"
+  assert strings[regions["status"][worst["index"]]] == "UNHEALTHY"
+
+
+def test_since_token_returns_unchanged_delta_or_resync(monkeypatch):
+  import json
+  from datetime import datetime, timedelta, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "check-1")
+  monkeypatch.setattr(status_api, "get_waf_status", lambda: {"enabled": False})
+  monkeypatch.setitem(status_api.CACHE_POLICIES, "health-checkers", (0.0, 300.0, 16))
+  checked = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+  statuses = ["Success: HTTP Status Code 200, OK"] * 4
+
+  class _FakeRoute53:
+    def get_health_check_status(self, HealthCheckId):
+      return {"HealthCheckObservations": [
+        {"Region": f"us-west-{i}", "IPAddress": "192.0.2.1", "StatusReport": {"Status": text, "CheckedTime": checked[0]}}
+        for i, text in enumerate(statuses)
+      ]}
+
+  monkeypatch.setattr(status_api, "_route53", lambda: _FakeRoute53())
+
+  def get(since=None):
+    query = {"since": since} if since else None
+    response = status_api.lambda_handler({"rawPath": "/status/health-checkers", "queryStringParameters": query}, None)
+    return json.loads(response["body"])
+
+  full = get()
+  token = full["versionToken"]
+  assert isinstance(full["regions"], list) and len(full["regions"]) == 4
+
+  # Checkers reporting again with the same result is not a change
+  checked[0] += timedelta(seconds=30)
+  unchanged = get(token)
+  assert unchanged["unchanged"] is True and unchanged["versionToken"] == token
+  assert unchanged["checkedTime"] == checked[0].isoformat()
+  assert "regions" not in unchanged
+
+  checked[0] += timedelta(seconds=30)
+  statuses[2] = "Failure: HTTP Status Code 503, Service Unavailable"
+  delta = get(token)
+  assert delta["delta"] is True and delta["since"] == token
+  assert delta["versionToken"] != token
+  assert list(delta["changed"]["regions"]) == ["us-west-2"]
+  assert delta["changed"]["regions"]["us-west-2"]["status"] == "UNHEALTHY"
+  assert "checkedTime" not in delta["changed"]["regions"]["us-west-2"]
+  assert delta["checkedTime"] == checked[0].isoformat()
+  assert delta["removed"] == []
+
+  resync = get("not-a-token")
+  assert resync["resync"] is True and resync["versionToken"] == delta["versionToken"]
+  assert len(resync["regions"]) == 4
+
+
+def test_slo_burn_rates_come_from_one_batch_cached_per_window(monkeypatch):
+  import json
+  from datetime import datetime, timezone
+
+  status_api = _load_status_api(monkeypatch)
+  monkeypatch.setattr(status_api, "CF_DISTRIBUTION_ID", "E123")
+  monkeypatch.setattr(status_api, "ROUTE53_HEALTH_CHECK_ID", "check-1")
+  monkeypatch.setattr(status_api, "STATUS_API_FUNCTION_NAME", "status-api")
+  monkeypatch.setitem(status_api.CACHE_POLICIES, "slo", (0.0, 600.0, 4))
+  now = datetime.now(timezone.utc)
+  # The site is burning its availability budget fast; everything else is quiet
+  burning = {"slo_siteAvailabilityburn_5m": 30.0, "slo_siteAvailabilityburn_1h": 20.0}
+
+  class _BurnCloudWatch:
+    def __init__(self):
+      self.calls = []
+
+    def get_metric_data(self, **kwargs):
+      self.calls.append(kwargs)
+      return {"MetricDataResults": [
+        {"Id": q["Id"], "Timestamps": [now], "Values": [burning.get(q["Id"], 0.5)], "StatusCode": "Complete"}
+        for q in kwargs["MetricDataQueries"]
+      ]}
+
+  fake = _BurnCloudWatch()
+  monkeypatch.setattr(status_api, "_cloudwatch", lambda: fake)
+
+  response = status_api.lambda_handler({"rawPath": "/status/slo"}, _FakeContext(5000))
+  body = json.loads(response["body"])
+  assert response["statusCode"] == 200
+  assert len(fake.calls) == 1
+  request = fake.calls[0]
+  assert (request["EndTime"] - request["StartTime"]).total_seconds() == 3 * 24 * 3600
+  # Windows end a full ingestion lag ago on a minute boundary, so no bucket is partial
+  assert request["EndTime"].second == 0 and request["EndTime"].microsecond == 0
+  lag = (datetime.now(timezone.utc) - request["EndTime"]).total_seconds()
+  assert status_api.SLO_INGESTION_LAG_SECONDS <= lag < status_api.SLO_INGESTION_LAG_SECONDS + 120
+  expressions = {q["Id"]: q["Expression"] for q in request["MetricDataQueries"] if "Expression" in q}
+  assert expressions["slo_siteUptimebad_1h"] == "100 * (1 - slo_hc_1h)"
+  assert expressions["slo_apiLatencyburn_3d"] == "slo_apiLatencybad_3d / 1"
+  periods = {q["Id"]: q["MetricStat"]["Period"] for q in request["MetricDataQueries"] if "MetricStat" in q}
+  assert periods["slo_cf5xx_5m"] == 300 and periods["slo_inv_3d"] == 259200
+
+  site = body["objectives"]["siteAvailability"]
+  assert site["burnRate"] == {"5m": 30.0, "1h": 20.0, "6h": 0.5, "3d": 0.5}
+  assert site["status"] == "page"
+  assert site["budgetRemaining"] == 0.5
+  assert body["objectives"]["apiLatency"]["status"] == "ok"
+  assert set(body["objectives"]) == {"siteAvailability", "siteUptime", "apiAvailability", "apiLatency"}
+
+  # Only the expired 5m window is refetched, over a 5-minute span
+  expiry, results, fetched_at = status_api._slo_windows["5m"]
+  status_api._slo_windows["5m"] = (0.0, results, fetched_at)
+  status_api.lambda_handler({"rawPath": "/status/slo"}, _FakeContext(5000))
+  assert len(fake.calls) == 2
+  request = fake.calls[1]
+  assert (request["EndTime"] - request["StartTime"]).total_seconds() == 300
+  assert all(q["Id"].endswith("_5m") for q in request["MetricDataQueries"])
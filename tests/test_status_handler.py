@@ -38,3 +38,25 @@ def test_waf_enabled_with_blocks(monkeypatch):
   assert result["enabled"] is True
   assert result["blocked_countries"] == ["US", "DE"]
   assert "geo blocking" in result["message"]
+
+
+def test_alarm_served_from_status_snapshot(monkeypatch, tmp_path):
+  import json
+  import time
+
+  status_handler = _load_status_handler(monkeypatch)
+  monkeypatch.setattr(status_handler, "STATUS_SNAPSHOT", f"dir:{tmp_path}")
+  (tmp_path / "status-snapshot.json").write_text(json.dumps({
+    "format": 1,
+    "sectionsGeneratedAt": {"alarm": time.time() - 30},
+    "bodies": {"alarm": {"status": "OK", "reason": "healthy", "updated": None}},
+  }))
+
+  def no_cloudwatch():
+    raise AssertionError("CloudWatch should not be called")
+
+  monkeypatch.setattr(status_handler, "_cloudwatch", no_cloudwatch)
+
+  response = status_handler.lambda_handler({}, None)
+  assert json.loads(response["body"])["status"] == "OK"
+  assert 30 <= int(response["headers"]["Age"]) <= 31